@@ -5,6 +5,7 @@ logger = setup_logging()
 # Monkeypatch BaseSubprocessTransport.__del__ to handle closed event loops gracefully
 from asyncio import base_subprocess
 
+from browser_use.agent.image_preprocessing import ImagePreprocessing
 from browser_use.agent.prompts import SystemPrompt
 from browser_use.agent.service import Agent
 from browser_use.agent.views import ActionModel, ActionResult, AgentHistoryList
@@ -19,6 +20,7 @@ from browser_use.llm import (
 	ChatOllama,
 	ChatOpenAI,
 )
+from browser_use.pool import AgentPool, PoolTask
 
 _original_del = base_subprocess.BaseSubprocessTransport.__del__
 
@@ -44,6 +46,8 @@ base_subprocess.BaseSubprocessTransport.__del__ = _patched_del
 
 __all__ = [
 	'Agent',
+	'AgentPool',
+	'PoolTask',
 	'Browser',
 	'BrowserConfig',
 	'BrowserSession',
@@ -54,6 +58,7 @@ __all__ = [
 	'ActionResult',
 	'ActionModel',
 	'AgentHistoryList',
+	'ImagePreprocessing',
 	'BrowserContext',
 	'BrowserContextConfig',
 	# Chat models
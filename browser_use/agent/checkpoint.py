@@ -0,0 +1,146 @@
+"""
+Append-only per-step checkpoints of an Agent, so an interrupted run can be continued with Agent.resume_from_checkpoint().
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from browser_use.agent.views import AgentHistoryList, AgentOutput, AgentState
+from browser_use.filesystem.file_system import FileSystemState
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILENAME = 'checkpoint.jsonl'
+CHECKPOINT_VERSION = 1
+
+
+class AgentCheckpointStore:
+	"""
+	A directory with a checkpoint.jsonl file, plus the screenshots of the checkpointed steps under screenshots/.
+
+	One JSON record is appended and fsynced per finished step. A record only holds what changed since the previous
+	one (new history items, changed/deleted files). The agent + message manager state and the open tabs are small and
+	are stored whole. A record cut short by a crash mid-write is ignored on load, so the worst case is losing the
+	last step.
+
+	The records include the browser's cookies (so logged-in sessions survive a resume), treat the directory as a secret.
+	"""
+
+	def __init__(self, path: str | Path):
+		self.path = Path(path).expanduser()
+		self.file = self.path / CHECKPOINT_FILENAME
+		self.screenshots_dir = self.path / 'screenshots'
+
+		# what the previous record already covers, so the next one only has to hold the delta
+		self._history_length = 0
+		self._files: dict[str, dict[str, Any]] = {}
+
+	def exists(self) -> bool:
+		return self.file.exists()
+
+	def build_record(self, state: AgentState, browser_snapshot: dict[str, Any] | None) -> dict[str, Any]:
+		"""
+		Capture the state after a finished step. Call it on the event loop before the next step mutates the state,
+		the (slower) serialization of history items + screenshots happens later in write_record().
+		"""
+		files = state.file_system_state.files if state.file_system_state else {}
+		changed_files = {name: data for name, data in files.items() if self._files.get(name) != data}
+		deleted_files = [name for name in self._files if name not in files]
+		self._files = dict(files)
+
+		new_history_items = state.history.history[self._history_length :]
+		self._history_length = len(state.history.history)
+
+		return {
+			'version': CHECKPOINT_VERSION,
+			'created_at': time.time(),
+			'n_steps': state.n_steps,
+			# serialize_as_any so last_model_output keeps the fields of the dynamic ActionModel subclass
+			'state': state.model_dump(mode='json', exclude={'history', 'file_system_state'}, serialize_as_any=True),
+			'history': new_history_items,  # AgentHistory objects, serialized by write_record()
+			'file_system': {
+				'base_dir': state.file_system_state.base_dir if state.file_system_state else None,
+				'extracted_content_count': state.file_system_state.extracted_content_count if state.file_system_state else 0,
+				'changed_files': changed_files,
+				'deleted_files': deleted_files,
+			},
+			'browser': dict(browser_snapshot) if browser_snapshot else None,  # tab urls, focused tab, scroll positions, cookies
+		}
+
+	def write_record(self, record: dict[str, Any]) -> None:
+		"""Append a record from build_record() and fsync it (blocking, run it in a thread)"""
+		history = []
+		for item in record['history']:
+			item_data = item.model_dump()
+			if item.state.screenshot:
+				# reference the image by path instead of inlining its base64, the agent's own screenshots_dir may be a temp dir
+				item_data['state']['screenshot'] = {
+					'path': str(item.state.screenshot.save(self.screenshots_dir)),
+					'sha256': item.state.screenshot.sha256,
+					'media_type': item.state.screenshot.media_type,
+				}
+			history.append(item_data)
+
+		line = json.dumps({**record, 'history': history}, ensure_ascii=False)
+		self.path.mkdir(parents=True, exist_ok=True)
+		with open(self.file, 'a', encoding='utf-8') as f:
+			f.write(line + '\n')
+			f.flush()
+			os.fsync(f.fileno())
+
+	def load(self, output_model: type[AgentOutput]) -> tuple[AgentState, dict[str, Any] | None]:
+		"""
+		Fold all records into the AgentState after the last checkpointed step, returns it with the browser snapshot
+		(tab urls, focused tab, scroll positions, cookies) to restore. Primes the store to keep appending deltas.
+		"""
+		if not self.exists():
+			raise FileNotFoundError(f'No agent checkpoint found at {self.file}')
+
+		lines = self.file.read_text(encoding='utf-8').splitlines()
+		records = []
+		for i, line in enumerate(lines):
+			if not line.strip():
+				continue
+			try:
+				records.append(json.loads(line))
+			except json.JSONDecodeError:
+				if i < len(lines) - 1:
+					raise
+				logger.warning(f'⚠️ Dropping the last checkpoint in {self.file}, it was cut short (crash while writing?)')
+				# truncate it away, otherwise the next appended record would end up on the same corrupt line
+				self.file.write_text(''.join(f'{good_line}\n' for good_line in lines[:i] if good_line.strip()), encoding='utf-8')
+		if not records:
+			raise ValueError(f'Agent checkpoint {self.file} has no complete records')
+
+		history_items: list[dict[str, Any]] = []
+		files: dict[str, dict[str, Any]] = {}
+		for record in records:
+			if record.get('version') != CHECKPOINT_VERSION:
+				raise ValueError(f'Unsupported agent checkpoint version {record.get("version")} in {self.file}')
+			history_items.extend(record['history'])
+			files.update(record['file_system']['changed_files'])
+			for name in record['file_system']['deleted_files']:
+				files.pop(name, None)
+
+		last = records[-1]
+		state_data = dict(last['state'])
+		if state_data.get('last_model_output'):
+			state_data['last_model_output'] = output_model.model_validate(state_data['last_model_output'])
+		state = AgentState.model_validate(state_data)
+		state.history = AgentHistoryList.load_from_dict({'history': history_items}, output_model)
+		if last['file_system']['base_dir']:
+			state.file_system_state = FileSystemState(
+				files=files,
+				base_dir=last['file_system']['base_dir'],
+				extracted_content_count=last['file_system']['extracted_content_count'],
+			)
+
+		self._history_length = len(state.history.history)
+		self._files = dict(files)
+		return state, last['browser']
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import base64
 import io
 import logging
 import os
@@ -13,6 +12,8 @@ from browser_use.config import CONFIG
 if TYPE_CHECKING:
 	from PIL import Image, ImageFont
 
+	from browser_use.browser.views import Screenshot
+
 logger = logging.getLogger(__name__)
 
 
@@ -129,9 +130,8 @@ def create_history_gif(
 		if not item.state.screenshot:
 			continue
 
-		# Convert base64 screenshot to PIL Image
-		img_data = base64.b64decode(item.state.screenshot)
-		image = Image.open(io.BytesIO(img_data))
+		# Convert screenshot bytes to PIL Image
+		image = Image.open(io.BytesIO(item.state.screenshot.data))
 
 		if show_goals and item.model_output:
 			image = _add_overlay_to_image(
@@ -163,7 +163,7 @@ def create_history_gif(
 
 def _create_task_frame(
 	task: str,
-	first_screenshot: str,
+	first_screenshot: Screenshot,
 	title_font: ImageFont.FreeTypeFont,
 	regular_font: ImageFont.FreeTypeFont,
 	logo: Image.Image | None = None,
@@ -172,8 +172,7 @@ def _create_task_frame(
 	"""Create initial frame showing the task."""
 	from PIL import Image, ImageDraw, ImageFont
 
-	img_data = base64.b64decode(first_screenshot)
-	template = Image.open(io.BytesIO(img_data))
+	template = Image.open(io.BytesIO(first_screenshot.data))
 	image = Image.new('RGB', template.size, (0, 0, 0))
 	draw = ImageDraw.Draw(image)
 
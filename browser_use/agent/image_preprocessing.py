@@ -0,0 +1,118 @@
+"""
+Screenshot preprocessing before screenshots are sent to the LLM.
+
+Providers downscale images server-side before the model sees them, so sending screenshots at capture resolution only costs
+upload bandwidth (and image tokens where they are billed by size). ImagePreprocessing resizes screenshots to the size the
+LLM's provider actually uses, re-encodes them as JPEG/WebP, and can crop them to the region around the highlighted elements.
+The encoded variant is cached on the Screenshot, so a screenshot sent again as a previous screenshot (images_per_step > 1)
+is not re-encoded.
+"""
+
+from __future__ import annotations
+
+import io
+from typing import TYPE_CHECKING, Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from browser_use.browser.views import BrowserStateSummary, Screenshot
+from browser_use.llm.image_limits import PROVIDER_IMAGE_SIZE_LIMITS, ImageSizeLimit, resize_to_limit
+
+if TYPE_CHECKING:
+	from PIL import Image
+
+
+# (left, top, right, bottom) as fractions of the viewport, so it applies to screenshots at any device scale factor
+CropBox = tuple[float, float, float, float]
+
+
+class ImagePreprocessing(BaseModel):
+	"""How screenshots are resized and re-encoded before they are sent to the LLM, see Agent(image_preprocessing=...)"""
+
+	model_config = ConfigDict(frozen=True, extra='forbid')
+
+	format: Literal['png', 'jpeg', 'webp'] = 'jpeg'
+	quality: int = Field(default=80, ge=1, le=100)  # for jpeg and webp
+	size_limit: ImageSizeLimit | None = None  # None: the limit of the LLM's provider (no resizing for other providers)
+	crop_to_highlights: bool = False  # crop the current screenshot to the box around the highlighted elements
+	crop_padding: int = 64  # CSS pixels kept around the highlighted elements when cropping
+
+	def for_provider(self, provider: str) -> ImagePreprocessing:
+		"""These settings with size_limit filled in for the given LLM provider"""
+		if self.size_limit is not None:
+			return self
+		return self.model_copy(update={'size_limit': PROVIDER_IMAGE_SIZE_LIMITS.get(provider, ImageSizeLimit())})
+
+
+def get_highlights_crop_box(browser_state: BrowserStateSummary, padding: int = 0) -> CropBox | None:
+	"""The box around the highlighted elements in the viewport (+ padding CSS pixels), None if there is nothing to crop to"""
+	viewport = browser_state.element_tree.viewport_info
+	if not viewport or not viewport.width or not viewport.height:
+		return None
+
+	boxes = [
+		node.viewport_coordinates
+		for node in browser_state.selector_map.values()
+		if node.is_in_viewport
+		and node.viewport_coordinates
+		and node.viewport_coordinates.width
+		and node.viewport_coordinates.height
+	]
+	if not boxes:
+		return None
+
+	left = max(0, min(box.top_left.x for box in boxes) - padding)
+	top = max(0, min(box.top_left.y for box in boxes) - padding)
+	right = min(viewport.width, max(box.bottom_right.x for box in boxes) + padding)
+	bottom = min(viewport.height, max(box.bottom_right.y for box in boxes) + padding)
+	if right <= left or bottom <= top:
+		return None
+	return left / viewport.width, top / viewport.height, right / viewport.width, bottom / viewport.height
+
+
+def preprocess_screenshot(
+	screenshot: Screenshot, preprocessing: ImagePreprocessing, crop_box: CropBox | None = None
+) -> Screenshot:
+	"""
+	The variant of screenshot encoded according to preprocessing, encoded once and then cached on the screenshot.
+	crop_box is only applied when the variant is first encoded (the crop belongs to the page state the screenshot was taken in).
+	"""
+	return screenshot.get_variant(preprocessing, lambda screenshot: _encode(screenshot, preprocessing, crop_box))
+
+
+def preprocess_state_screenshot(browser_state: BrowserStateSummary, preprocessing: ImagePreprocessing) -> Screenshot | None:
+	"""The preprocessed variant of the current screenshot of browser_state, cropped to its highlights if configured"""
+	if browser_state.screenshot is None:
+		return None
+	crop_box = get_highlights_crop_box(browser_state, preprocessing.crop_padding) if preprocessing.crop_to_highlights else None
+	return preprocess_screenshot(browser_state.screenshot, preprocessing, crop_box)
+
+
+def _encode(screenshot: Screenshot, preprocessing: ImagePreprocessing, crop_box: CropBox | None) -> Screenshot:
+	try:
+		from PIL import Image
+	except ImportError:
+		raise ImportError(
+			'`pillow` not installed, it is needed for image_preprocessing. Please install using `pip install pillow`'
+		)
+
+	image: Image.Image = Image.open(io.BytesIO(screenshot.data))
+	original_size = image.size
+	if crop_box:
+		left, top, right, bottom = crop_box
+		width, height = image.size
+		image = image.crop((round(left * width), round(top * height), round(right * width), round(bottom * height)))
+
+	size = resize_to_limit(*image.size, preprocessing.size_limit or ImageSizeLimit())
+	if size != image.size:
+		image = image.resize(size, Image.Resampling.LANCZOS)
+
+	media_type = f'image/{preprocessing.format}'
+	if image.size == original_size and media_type == screenshot.media_type:
+		return screenshot  # nothing to do, don't re-encode the same image
+
+	if preprocessing.format == 'jpeg' and image.mode != 'RGB':
+		image = image.convert('RGB')
+	buffer = io.BytesIO()
+	image.save(buffer, format=preprocessing.format.upper(), quality=preprocessing.quality)
+	return Screenshot(data=buffer.getvalue(), media_type=media_type)
@@ -0,0 +1,100 @@
+"""
+Background compaction of the agent history into a rolling memory digest.
+
+Once the rendered history items grow past a token budget, the oldest items (including any earlier digest) are sent to
+a small summarizer model in a background task. When the summary comes back, those items are replaced by a single
+digest item. The step loop only ever checks whether a summary is ready, it never waits for one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from browser_use.agent.message_manager.views import HistoryItem
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.messages import SystemMessage, UserMessage
+from browser_use.tokens.estimator import TokenEstimator
+from browser_use.tracing import detach_spans
+
+logger = logging.getLogger(__name__)
+
+DIGEST_PREFIX = 'Memory digest of the earlier steps:'
+
+COMPACTION_PROMPT = """You compress the step history of a browser automation agent into a memory digest that replaces it.
+Keep every fact the agent may still need: visited URLs, data it extracted or wrote to files, progress on each part of the task, \
+what failed and should not be retried, credentials or inputs it used (keep <secret> placeholders as they are).
+Drop step-by-step narration and anything that no longer matters. Answer with the digest only, as short bullet points."""
+
+
+class HistoryCompactor:
+	"""
+	Keeps MessageManagerState.agent_history_items under token_budget by summarizing the oldest items with llm.
+
+	Call update() once per step before the state message is built: it swaps in a finished digest and starts a new
+	summarization if the history is over budget. The most recent items (up to half the budget) are always kept verbatim.
+	Items are counted with token_estimator, pass the message manager's so the budget is in the agent model's tokens.
+	"""
+
+	def __init__(
+		self, llm: BaseChatModel, token_budget: int = 8_000, min_items: int = 4, token_estimator: TokenEstimator | None = None
+	):
+		self.llm = llm
+		self.token_budget = token_budget
+		self.token_estimator = token_estimator or TokenEstimator()
+		self.min_items = min_items  # don't bother the summarizer for fewer items than this
+		self._pending: asyncio.Task[str] | None = None
+		self._pending_items: list[HistoryItem] = []
+
+	def update(self, items: list[HistoryItem]) -> None:
+		"""Apply a finished digest to items (in place) and start a new compaction if they're over budget"""
+		self._apply_finished(items)
+		if self._pending is None:
+			self._maybe_start(items)
+
+	def cancel(self) -> None:
+		if self._pending:
+			self._pending.cancel()
+		self._pending, self._pending_items = None, []
+
+	def _apply_finished(self, items: list[HistoryItem]) -> None:
+		task = self._pending
+		if task is None or not task.done():
+			return
+		compacted, self._pending, self._pending_items = self._pending_items, None, []
+		if task.cancelled():
+			return
+		if error := task.exception():
+			logger.warning(f'⚠️ History compaction failed, will retry next step: {type(error).__name__}: {error}')
+			return
+		if len(items) < len(compacted) or any(item is not compacted_item for item, compacted_item in zip(items, compacted)):
+			logger.debug('History changed while it was being compacted, discarding the digest')
+			return
+
+		items[: len(compacted)] = [HistoryItem(system_message=f'{DIGEST_PREFIX}\n{task.result().strip()}')]
+		logger.debug(f'Compacted {len(compacted)} history items into a memory digest')
+
+	def _estimate_tokens(self, text: str) -> int:
+		return round(self.token_estimator.count_text(text) * self.token_estimator.correction)
+
+	def _maybe_start(self, items: list[HistoryItem]) -> None:
+		rendered = [item.to_string() for item in items]
+		tokens = [self._estimate_tokens(text) for text in rendered]
+		if sum(tokens) <= self.token_budget:
+			return
+
+		# keep the newest items that fit in half the budget, compact everything before them
+		keep_tokens, keep_from = 0, len(items)
+		while keep_from > 0 and keep_tokens + tokens[keep_from - 1] <= self.token_budget // 2:
+			keep_from -= 1
+			keep_tokens += tokens[keep_from]
+		if keep_from < self.min_items:
+			return
+
+		self._pending_items = items[:keep_from]
+		self._pending = asyncio.create_task(self._summarize('\n'.join(rendered[:keep_from])), name='history_compaction')
+
+	async def _summarize(self, history: str) -> str:
+		detach_spans()  # outlives the step that started it
+		response = await self.llm.ainvoke([SystemMessage(content=COMPACTION_PROMPT), UserMessage(content=history)])
+		return response.completion
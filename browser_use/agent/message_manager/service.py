@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import json
 import logging
+from collections.abc import Iterator
 
+from browser_use.agent.image_preprocessing import ImagePreprocessing
 from browser_use.agent.message_manager.views import (
 	HistoryItem,
 )
@@ -23,10 +25,14 @@ from browser_use.llm.messages import (
 	SystemMessage,
 	UserMessage,
 )
+from browser_use.redaction import get_sensitive_data_redactor
+from browser_use.tokens.estimator import TokenEstimator
 from browser_use.utils import match_url_with_domain_pattern, time_execution_sync
 
 logger = logging.getLogger(__name__)
 
+MIN_ELEMENTS_TEXT_LENGTH = 2_000  # chars of interactive elements always kept when trimming to max_input_tokens
+
 
 # ========== Logging Helper Functions ==========
 # These functions are used ONLY for formatting debug log output.
@@ -108,6 +114,9 @@ class MessageManager:
 		sensitive_data: dict[str, str | dict[str, str]] | None = None,
 		max_history_items: int | None = None,
 		images_per_step: int = 1,
+		image_preprocessing: ImagePreprocessing | None = None,
+		token_estimator: TokenEstimator | None = None,
+		max_input_tokens: int | None = None,
 	):
 		self.task = task
 		self.state = state
@@ -118,6 +127,9 @@ class MessageManager:
 		self.use_thinking = use_thinking
 		self.max_history_items = max_history_items
 		self.images_per_step = images_per_step
+		self.image_preprocessing = image_preprocessing
+		self.token_estimator = token_estimator or TokenEstimator()
+		self.max_input_tokens = max_input_tokens  # per request, see _enforce_token_budget()
 
 		assert max_history_items is None or max_history_items > 5, 'max_history_items must be None or greater than 5'
 
@@ -126,6 +138,10 @@ class MessageManager:
 		self.message_context = message_context
 		self.sensitive_data = sensitive_data
 		self.last_input_messages = []
+		# the prompt the last state message was built from, to rebuild it smaller if the request is over max_input_tokens
+		self._state_prompt: tuple[AgentMessagePrompt, bool, BaseMessage] | None = None  # (prompt, use_vision, message)
+		# '\n'.join of the rendered history items, extended as items are appended: (items covered, last item covered, string)
+		self._joined_history: tuple[int, HistoryItem | None, str] = (0, None, '')
 		# Only initialize messages if state is empty
 		if len(self.state.history.messages) == 0:
 			self._init_messages()
@@ -133,22 +149,21 @@ class MessageManager:
 	@property
 	def agent_history_description(self) -> str:
 		"""Build agent history description from list of items, respecting max_history_items limit"""
-		if self.max_history_items is None:
-			# Include all items
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
+		return self._get_history_description(self.max_history_items)
 
+	def _get_history_description(self, max_items: int | None) -> str:
 		total_items = len(self.state.agent_history_items)
 
-		# If we have fewer items than the limit, just return all items
-		if total_items <= self.max_history_items:
-			return '\n'.join(item.to_string() for item in self.state.agent_history_items)
+		# If we have fewer items than the limit (or no limit), just return all items
+		if max_items is None or total_items <= max_items:
+			return self._join_history_items()
 
 		# We have more items than the limit, so we need to omit some
-		omitted_count = total_items - self.max_history_items
+		omitted_count = total_items - max_items
 
-		# Show first item + omitted message + most recent (max_history_items - 1) items
+		# Show first item + omitted message + most recent (max_items - 1) items
 		# The omitted message doesn't count against the limit, only real history items do
-		recent_items_count = self.max_history_items - 1  # -1 for first item
+		recent_items_count = max_items - 1  # -1 for first item
 
 		items_to_include = [
 			self.state.agent_history_items[0].to_string(),  # Keep first item (initialization)
@@ -159,6 +174,19 @@ class MessageManager:
 
 		return '\n'.join(items_to_include)
 
+	def _join_history_items(self) -> str:
+		"""'\n'.join of all history items, only the items added since the last call are rendered and appended"""
+		items = self.state.agent_history_items
+		covered, last_item, joined = self._joined_history
+		if covered > len(items) or (covered and items[covered - 1] is not last_item):
+			covered, joined = 0, ''  # the history was replaced, start over
+
+		new_items = '\n'.join(item.to_string() for item in items[covered:])
+		if new_items:
+			joined = f'{joined}\n{new_items}' if joined else new_items
+		self._joined_history = (len(items), items[-1] if items else None, joined)
+		return joined
+
 	def _init_messages(self) -> None:
 		"""Initialize the message history with system message, context, task, and other initial messages"""
 		self._add_message_with_type(self.system_prompt)
@@ -331,7 +359,7 @@ The file system actions do not change the browser state, so I can also click on
 
 		# otherwise add state message and result to next message (which will not stay in memory)
 		assert browser_state_summary
-		state_message = AgentMessagePrompt(
+		state_prompt = AgentMessagePrompt(
 			browser_state_summary=browser_state_summary,
 			file_system=self.file_system,
 			agent_history_description=self.agent_history_description,
@@ -343,9 +371,12 @@ The file system actions do not change the browser state, so I can also click on
 			sensitive_data=self.sensitive_data_description,
 			available_file_paths=self.available_file_paths,
 			screenshots=screenshots,
-		).get_user_message(use_vision)
+			image_preprocessing=self.image_preprocessing,
+		)
+		state_message = state_prompt.get_user_message(use_vision)
 
 		self._add_message_with_type(state_message)
+		self._state_prompt = (state_prompt, use_vision, state_message)
 
 	def add_plan(self, plan: str | None, position: int | None = None) -> None:
 		if not plan:
@@ -397,9 +428,70 @@ The file system actions do not change the browser state, so I can also click on
 
 		# Log message history for debugging
 		logger.debug(self._log_history_lines())
+		estimated_tokens = self.token_estimator.estimate(self.state.history.messages)  # annotates each message
+		if self.max_input_tokens and estimated_tokens > self.max_input_tokens:
+			self._enforce_token_budget(estimated_tokens)
 		self.last_input_messages = list(self.state.history.messages)
 		return self.last_input_messages
 
+	def _enforce_token_budget(self, estimated_tokens: int) -> None:
+		"""
+		Rebuild the last state message smaller until the request fits in max_input_tokens, dropping the lowest-priority parts
+		first: previous screenshots (oldest first), then the tail of the interactive elements text, then older history items.
+		"""
+		assert self.max_input_tokens
+		messages = self.state.history.messages
+		state_index = next((i for i, m in enumerate(messages) if self._state_prompt and m is self._state_prompt[2]), None)
+		if self._state_prompt is None or state_index is None:
+			logger.warning(f'⚠️ Request is ~{estimated_tokens} tokens, over max_input_tokens={self.max_input_tokens}')
+			return
+		prompt, use_vision, state_message = self._state_prompt
+		other_tokens = estimated_tokens - self.token_estimator.estimate([state_message])
+
+		def trims() -> Iterator[str]:
+			"""Shrink the prompt one step at a time, yielding what was trimmed"""
+			while len(prompt.screenshots) > 1:
+				prompt.screenshots.pop(0)
+				yield 'previous screenshots'
+
+			elements_text = prompt.browser_state.element_tree.clickable_elements_to_string(
+				include_attributes=prompt.include_attributes
+			)
+			prompt.max_clickable_elements_length = min(prompt.max_clickable_elements_length, len(elements_text))
+			while prompt.max_clickable_elements_length > MIN_ELEMENTS_TEXT_LENGTH:
+				excess_tokens = (estimated_tokens - self.max_input_tokens) / self.token_estimator.correction
+				excess_chars = max(int(excess_tokens * self.token_estimator.bytes_per_token * 1.1), 1_000)
+				prompt.max_clickable_elements_length = max(
+					MIN_ELEMENTS_TEXT_LENGTH, prompt.max_clickable_elements_length - excess_chars
+				)
+				yield 'interactive elements'
+
+			history_items = min(
+				len(self.state.agent_history_items), self.max_history_items or len(self.state.agent_history_items)
+			)
+			while history_items > 2:
+				history_items = max(2, history_items // 2)  # always keep the first and the most recent item
+				prompt.agent_history_description = self._get_history_description(history_items)
+				yield 'history'
+
+		trimmed = []
+		for part in trims():
+			state_message = prompt.get_user_message(use_vision)
+			if self.sensitive_data:
+				state_message = self._filter_sensitive_data(state_message)
+			estimated_tokens = other_tokens + self.token_estimator.estimate([state_message])
+			trimmed.append(part)
+			if estimated_tokens <= self.max_input_tokens:
+				break
+
+		messages[state_index] = state_message
+		self._state_prompt = (prompt, use_vision, state_message)
+		logger.debug(f'Trimmed the state message to ~{estimated_tokens} tokens: {", ".join(dict.fromkeys(trimmed))}')
+		if estimated_tokens > self.max_input_tokens:
+			logger.warning(
+				f'⚠️ Request is ~{estimated_tokens} tokens even after trimming, over max_input_tokens={self.max_input_tokens}'
+			)
+
 	def _add_message_with_type(
 		self,
 		message: BaseMessage,
@@ -419,41 +511,16 @@ The file system actions do not change the browser state, so I can also click on
 	def _filter_sensitive_data(self, message: BaseMessage) -> BaseMessage:
 		"""Filter out sensitive data from the message"""
 
-		def replace_sensitive(value: str) -> str:
-			if not self.sensitive_data:
-				return value
-
-			# Collect all sensitive values, immediately converting old format to new format
-			sensitive_values: dict[str, str] = {}
-
-			# Process all sensitive data entries
-			for key_or_domain, content in self.sensitive_data.items():
-				if isinstance(content, dict):
-					# Already in new format: {domain: {key: value}}
-					for key, val in content.items():
-						if val:  # Skip empty values
-							sensitive_values[key] = val
-				elif content:  # Old format: {key: value} - convert to new format internally
-					# We treat this as if it was {'http*://*': {key_or_domain: content}}
-					sensitive_values[key_or_domain] = content
-
-			# If there are no valid sensitive data entries, just return the original value
-			if not sensitive_values:
-				logger.warning('No valid entries found in sensitive_data dictionary')
-				return value
-
-			# Replace all valid sensitive data values with their placeholder tags
-			for key, val in sensitive_values.items():
-				value = value.replace(val, f'<secret>{key}</secret>')
-
-			return value
+		if not self.sensitive_data:
+			return message
+		redactor = get_sensitive_data_redactor(self.sensitive_data)
 
 		if isinstance(message.content, str):
-			message.content = replace_sensitive(message.content)
+			message.content = redactor.redact(message.content)
 		elif isinstance(message.content, list):
 			for i, item in enumerate(message.content):
 				if isinstance(item, ContentPartTextParam):
-					item.text = replace_sensitive(item.text)
+					item.text = redactor.redact(item.text)
 					message.content[i] = item
 		return message
 
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from browser_use.llm.messages import (
 	BaseMessage,
@@ -26,13 +26,20 @@ class HistoryItem(BaseModel):
 
 	model_config = ConfigDict(arbitrary_types_allowed=True)
 
+	_rendered: str | None = PrivateAttr(default=None)
+
 	def model_post_init(self, __context) -> None:
 		"""Validate that error and system_message are not both provided"""
 		if self.error is not None and self.system_message is not None:
 			raise ValueError('Cannot have both error and system_message at the same time')
 
 	def to_string(self) -> str:
-		"""Get string representation of the history item"""
+		"""Get string representation of the history item (rendered once, items don't change after they're added)"""
+		if self._rendered is None:
+			self._rendered = self._render()
+		return self._rendered
+
+	def _render(self) -> str:
 		step_str = f'step_{self.step_number}' if self.step_number is not None else 'step_unknown'
 
 		if self.error:
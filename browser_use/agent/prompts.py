@@ -2,6 +2,8 @@ import importlib.resources
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
+from browser_use.agent.image_preprocessing import ImagePreprocessing, preprocess_screenshot, preprocess_state_screenshot
+from browser_use.browser.views import Screenshot
 from browser_use.llm.messages import ContentPartImageParam, ContentPartTextParam, ImageURL, SystemMessage, UserMessage
 
 if TYPE_CHECKING:
@@ -79,7 +81,8 @@ class AgentMessagePrompt:
 		max_clickable_elements_length: int = 40000,
 		sensitive_data: str | None = None,
 		available_file_paths: list[str] | None = None,
-		screenshots: list[str] | None = None,
+		screenshots: list[Screenshot | str] | None = None,
+		image_preprocessing: ImagePreprocessing | None = None,
 	):
 		self.browser_state: 'BrowserStateSummary' = browser_state_summary
 		self.file_system: 'FileSystem | None' = file_system
@@ -92,38 +95,38 @@ class AgentMessagePrompt:
 		self.max_clickable_elements_length: int = max_clickable_elements_length
 		self.sensitive_data: str | None = sensitive_data
 		self.available_file_paths: list[str] | None = available_file_paths
-		self.screenshots = screenshots or []
+		self.screenshots = [Screenshot.validate(screenshot) for screenshot in screenshots or []]
+		self.image_preprocessing = image_preprocessing
 		assert self.browser_state
 
-	def _deduplicate_screenshots(self, screenshots: list[str]) -> list[str]:
+	def _deduplicate_screenshots(self, screenshots: list[Screenshot]) -> list[Screenshot]:
 		"""
 		Remove consecutive duplicate screenshots, keeping only the most recent of each.
+		Screenshots count as duplicates if they look the same give or take rendering noise (see Screenshot.is_near_duplicate).
 
 		Args:
-			screenshots: List of base64-encoded screenshot strings in chronological order (oldest first)
+			screenshots: List of screenshots in chronological order (oldest first)
 
 		Returns:
 			List of screenshots with consecutive duplicates removed, maintaining chronological order
 		"""
-		if not screenshots:
-			return []
-
-		if len(screenshots) == 1:
-			return screenshots
-
-		# Keep track of unique screenshots by comparing each with the next one
-		unique_screenshots = []
-
-		for i in range(len(screenshots)):
-			# Always keep the last screenshot
-			if i == len(screenshots) - 1:
-				unique_screenshots.append(screenshots[i])
-			# Only keep screenshot if it's different from the next one
-			elif screenshots[i] != screenshots[i + 1]:
-				unique_screenshots.append(screenshots[i])
-
+		unique_screenshots: list[Screenshot] = []
+		for screenshot in screenshots:
+			# compare with the last one kept, so a slow drift of tiny changes can't chain into dropping a real change
+			if unique_screenshots and screenshot.is_near_duplicate(unique_screenshots[-1]):
+				unique_screenshots[-1] = screenshot
+			else:
+				unique_screenshots.append(screenshot)
 		return unique_screenshots
 
+	def _preprocess_screenshot(self, screenshot: Screenshot) -> Screenshot:
+		"""The screenshot as it is sent to the LLM (resized / re-encoded / cropped if image_preprocessing is set)"""
+		if self.image_preprocessing is None:
+			return screenshot
+		if screenshot is self.browser_state.screenshot:
+			return preprocess_state_screenshot(self.browser_state, self.image_preprocessing) or screenshot
+		return preprocess_screenshot(screenshot, self.image_preprocessing)
+
 	def _get_browser_state_description(self) -> str:
 		elements_text = self.browser_state.element_tree.clickable_elements_to_string(include_attributes=self.include_attributes)
 
@@ -249,11 +252,12 @@ Interactive elements from top layer of the current page inside the viewport{trun
 				content_parts.append(ContentPartTextParam(text=label))
 
 				# Add the screenshot
+				image = self._preprocess_screenshot(screenshot)
 				content_parts.append(
 					ContentPartImageParam(
 						image_url=ImageURL(
-							url=f'data:image/png;base64,{screenshot}',
-							media_type='image/png',
+							url=image.data_url,
+							media_type=image.media_type,
 						),
 					)
 				)
@@ -1,19 +1,23 @@
 import asyncio
+import contextvars
 import gc
 import inspect
 import json
 import logging
 import os
 import re
+import shutil
 import sys
 import tempfile
 import time
+import weakref
 from collections.abc import Awaitable, Callable
 from pathlib import Path
 from typing import Any, Generic, TypeVar
 
 from dotenv import load_dotenv
 
+from browser_use.agent.checkpoint import AgentCheckpointStore
 from browser_use.agent.cloud_events import (
 	CreateAgentOutputFileEvent,
 	CreateAgentSessionEvent,
@@ -24,6 +28,7 @@ from browser_use.agent.cloud_events import (
 from browser_use.dom.views import DEFAULT_INCLUDE_ATTRIBUTES
 from browser_use.llm.base import BaseChatModel
 from browser_use.llm.messages import BaseMessage, UserMessage
+from browser_use.tokens.estimator import get_token_estimator
 from browser_use.tokens.service import TokenCost
 
 load_dotenv()
@@ -34,6 +39,8 @@ from pydantic import ValidationError
 from uuid_extensions import uuid7str
 
 from browser_use.agent.gif import create_history_gif
+from browser_use.agent.image_preprocessing import ImagePreprocessing, preprocess_state_screenshot
+from browser_use.agent.message_manager.compaction import HistoryCompactor
 from browser_use.agent.message_manager.service import (
 	MessageManager,
 )
@@ -41,6 +48,7 @@ from browser_use.agent.message_manager.utils import (
 	save_conversation,
 )
 from browser_use.agent.prompts import PlannerPrompt, SystemPrompt
+from browser_use.agent.streaming import StreamingActionParser
 from browser_use.agent.views import (
 	ActionResult,
 	AgentError,
@@ -70,6 +78,7 @@ from browser_use.filesystem.file_system import FileSystem
 from browser_use.sync import CloudSync
 from browser_use.telemetry.service import ProductTelemetry
 from browser_use.telemetry.views import AgentTelemetryEvent
+from browser_use.tracing import detach_spans, record_spans, trace_span
 from browser_use.utils import (
 	_log_pretty_path,
 	get_browser_use_version,
@@ -157,10 +166,18 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		max_actions_per_step: int = 10,
 		use_thinking: bool = True,
 		max_history_items: int = 40,
+		history_compaction_llm: BaseChatModel | None = None,
+		history_compaction_budget: int = 8_000,
 		images_per_step: int = 1,
+		image_preprocessing: ImagePreprocessing | None = None,
+		max_input_tokens: int | None = None,
+		screenshots_dir: str | Path | None = None,
+		stream_actions: bool = False,
+		checkpoint_path: str | Path | None = None,
 		page_extraction_llm: BaseChatModel | None = None,
 		planner_llm: BaseChatModel | None = None,
 		planner_interval: int = 1,  # Run planner every N steps
+		concurrent_planner: bool = False,
 		is_planner_reasoning: bool = False,
 		extend_planner_system_message: str | None = None,
 		injected_agent_state: AgentState | None = None,
@@ -226,10 +243,18 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			max_actions_per_step=max_actions_per_step,
 			use_thinking=use_thinking,
 			max_history_items=max_history_items,
+			history_compaction_llm=history_compaction_llm,
+			history_compaction_budget=history_compaction_budget,
 			images_per_step=images_per_step,
+			image_preprocessing=image_preprocessing.for_provider(llm.provider) if image_preprocessing else None,
+			max_input_tokens=max_input_tokens,
+			screenshots_dir=screenshots_dir,
+			stream_actions=stream_actions,
+			checkpoint_path=checkpoint_path,
 			page_extraction_llm=page_extraction_llm,
 			planner_llm=planner_llm,
 			planner_interval=planner_interval,
+			concurrent_planner=concurrent_planner,
 			is_planner_reasoning=is_planner_reasoning,
 			extend_planner_system_message=extend_planner_system_message,
 			calculate_cost=calculate_cost,
@@ -241,12 +266,19 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self.token_cost_service.register_llm(page_extraction_llm)
 		if self.settings.planner_llm:
 			self.token_cost_service.register_llm(self.settings.planner_llm)
+		if self.settings.history_compaction_llm:
+			self.token_cost_service.register_llm(self.settings.history_compaction_llm)
 
 		# Initialize state
 		self.state = injected_agent_state or AgentState()
 
 		# Initialize file system
 		self._set_file_system(file_system_path)
+		self.screenshots_dir = Path(
+			self.settings.screenshots_dir or os.path.join(tempfile.gettempdir(), f'browser_use_agent_{self.id}_screenshots')
+		)
+		self._screenshots_dir_finalizer: weakref.finalize | None = None
+		self._checkpoint_store = AgentCheckpointStore(self.settings.checkpoint_path) if self.settings.checkpoint_path else None
 
 		# Action setup
 		self._setup_action_models()
@@ -311,7 +343,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			sensitive_data=sensitive_data,
 			max_history_items=self.settings.max_history_items,
 			images_per_step=self.settings.images_per_step,
+			image_preprocessing=self.settings.image_preprocessing,
+			token_estimator=get_token_estimator(self.llm.provider),
+			max_input_tokens=self.settings.max_input_tokens,
 		)
+		self._calibrated_usage_entries = 0  # usage entries of token_cost_service already used to calibrate the estimator
 
 		if isinstance(browser, BrowserSession):
 			browser_session = browser_session or browser
@@ -446,6 +482,22 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self._external_pause_event = asyncio.Event()
 		self._external_pause_event.set()
 
+		# bookkeeping for the last finished step that runs in the background while the next step captures the page
+		self._pending_step_bookkeeping: asyncio.Task | None = None
+		# planner run started by an earlier step with concurrent_planner=True, its plan goes into the first step after it finishes
+		self._pending_plan: asyncio.Task[str | None] | None = None
+		# results of actions that were executed from a streamed response before the LLM call failed, reported by the failed step
+		self._interrupted_stream_results: list[ActionResult] = []
+		self._history_compactor = (
+			HistoryCompactor(
+				self.settings.history_compaction_llm,
+				token_budget=self.settings.history_compaction_budget,
+				token_estimator=self._message_manager.token_estimator,
+			)
+			if self.settings.history_compaction_llm
+			else None
+		)
+
 	@property
 	def logger(self) -> logging.Logger:
 		"""Get instance-specific logger with task ID in the name"""
@@ -619,202 +671,295 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 	@time_execution_async('--step')
 	async def step(self, step_info: AgentStepInfo | None = None) -> None:
 		"""Execute one step of the task"""
-		browser_state_summary = None
-		model_output = None
-		result: list[ActionResult] = []
-		step_start_time = time.time()
+		with record_spans('step', step=self.state.n_steps) as step_span:
+			browser_state_summary = None
+			model_output = None
+			result: list[ActionResult] = []
+			step_start_time = time.time()
 
-		try:
-			assert self.browser_session is not None, 'BrowserSession is not set up'
-			browser_state_summary = await self.browser_session.get_state_summary(cache_clickable_elements_hashes=True)
-			current_page = await self.browser_session.get_current_page()
+			try:
+				assert self.browser_session is not None, 'BrowserSession is not set up'
+				# between steps is the only safe point to restart a browser that outgrew browser_profile.memory_budget_mb
+				await self.browser_session.recycle_if_over_memory_budget()
+				browser_state_summary = await self.browser_session.get_state_summary(cache_clickable_elements_hashes=True)
+				current_page = await self.browser_session.get_current_page()
 
-			self._log_step_context(current_page, browser_state_summary)
+				# the previous step's events must be out before this step's messages/events are built
+				await self._wait_for_step_bookkeeping()
 
-			await self._raise_if_stopped_or_paused()
+				self._log_step_context(current_page, browser_state_summary)
 
-			# Update action models with page-specific actions
-			await self._update_action_models_for_page(current_page)
+				await self._raise_if_stopped_or_paused()
 
-			# Get page-specific filtered actions
-			page_filtered_actions = self.controller.registry.get_prompt_description(current_page)
+				# Update action models with page-specific actions
+				await self._update_action_models_for_page(current_page)
 
-			# If there are page-specific actions, add them as a special message for this step only
-			if page_filtered_actions:
-				page_action_message = f'For this page, these additional actions are available:\n{page_filtered_actions}'
-				self._message_manager._add_message_with_type(UserMessage(content=page_action_message))
+				# Get page-specific filtered actions
+				page_filtered_actions = self.controller.registry.get_prompt_description(current_page)
 
-			self._message_manager.add_state_message(
-				browser_state_summary=browser_state_summary,
-				model_output=self.state.last_model_output,
-				result=self.state.last_result,
-				step_info=step_info,
-				use_vision=self.settings.use_vision,
-				page_filtered_actions=page_filtered_actions if page_filtered_actions else None,
-				sensitive_data=self.sensitive_data,
-				agent_history_list=self.state.history,  # Pass AgentHistoryList for screenshots
-			)
+				# If there are page-specific actions, add them as a special message for this step only
+				if page_filtered_actions:
+					page_action_message = f'For this page, these additional actions are available:\n{page_filtered_actions}'
+					self._message_manager._add_message_with_type(UserMessage(content=page_action_message))
 
-			# Run planner at specified intervals if planner is configured
-			if self.settings.planner_llm and self.state.n_steps % self.settings.planner_interval == 0:
-				plan = await self._run_planner()
-				# add plan before last state message
-				self._message_manager.add_plan(plan, position=-1)
+				# swap in a finished history digest / start summarizing old history items, never waits for the summarizer
+				if self._history_compactor:
+					self._history_compactor.update(self._message_manager.state.agent_history_items)
 
-			if step_info and step_info.is_last_step():
-				# Add last step warning if needed
-				msg = 'Now comes your last step. Use only the "done" action now. No other actions - so here your action sequence must have length 1.'
-				msg += '\nIf the task is not yet fully finished as requested by the user, set success in "done" to false! E.g. if not all steps are fully completed.'
-				msg += '\nIf the task is fully finished, set success in "done" to true.'
-				msg += '\nInclude everything you found out for the ultimate task in the done text.'
-				self.logger.info('Last step finishing up')
-				self._message_manager._add_message_with_type(UserMessage(content=msg))
-				self.AgentOutput = self.DoneAgentOutput
-
-			input_messages = self._message_manager.get_messages()
-
-			try:
-				model_output = await self.get_next_action(input_messages)
 				if (
-					not model_output.action
-					or not isinstance(model_output.action, list)
-					or all(action.model_dump() == {} for action in model_output.action)
+					self.settings.use_vision
+					and browser_state_summary.screenshot
+					and (self.settings.images_per_step > 1 or self.settings.image_preprocessing)
 				):
-					self.logger.warning('Model returned empty action. Retrying...')
-
-					clarification_message = UserMessage(
-						content='You forgot to return an action. Please respond only with a valid JSON action according to the expected format.'
+					# decoding / re-encoding the screenshot takes tens of ms, keep it off the event loop
+					with trace_span('screenshot_processing'):
+						await asyncio.to_thread(self._process_screenshot, browser_state_summary)
+
+				with trace_span('prompt_build'):
+					self._message_manager.add_state_message(
+						browser_state_summary=browser_state_summary,
+						model_output=self.state.last_model_output,
+						result=self.state.last_result,
+						step_info=step_info,
+						use_vision=self.settings.use_vision,
+						page_filtered_actions=page_filtered_actions if page_filtered_actions else None,
+						sensitive_data=self.sensitive_data,
+						agent_history_list=self.state.history,  # Pass AgentHistoryList for screenshots
 					)
 
-					retry_messages = input_messages + [clarification_message]
-					model_output = await self.get_next_action(retry_messages)
-
-					if not model_output.action or all(action.model_dump() == {} for action in model_output.action):
-						self.logger.warning('Model still returned empty after retry. Inserting safe noop action.')
-						action_instance = self.ActionModel()
-						setattr(
-							action_instance,
-							'done',
-							{
-								'success': False,
-								'text': 'No next action returned by LLM!',
-							},
+				# Run planner at specified intervals if planner is configured
+				if self.settings.planner_llm and self.settings.concurrent_planner:
+					self._add_finished_plan()
+					if self.state.n_steps % self.settings.planner_interval == 0:
+						await self._start_concurrent_planner()
+				elif self.settings.planner_llm and self.state.n_steps % self.settings.planner_interval == 0:
+					plan = await self._run_planner()
+					# add plan before last state message
+					self._message_manager.add_plan(plan, position=-1)
+
+				if step_info and step_info.is_last_step():
+					# Add last step warning if needed
+					msg = 'Now comes your last step. Use only the "done" action now. No other actions - so here your action sequence must have length 1.'
+					msg += '\nIf the task is not yet fully finished as requested by the user, set success in "done" to false! E.g. if not all steps are fully completed.'
+					msg += '\nIf the task is fully finished, set success in "done" to true.'
+					msg += '\nInclude everything you found out for the ultimate task in the done text.'
+					self.logger.info('Last step finishing up')
+					self._message_manager._add_message_with_type(UserMessage(content=msg))
+					self.AgentOutput = self.DoneAgentOutput
+
+				input_messages = self._message_manager.get_messages()
+				executed_results: list[ActionResult] = []  # actions already executed while the response was streaming
+
+				try:
+					if self.settings.stream_actions:
+						model_output, executed_results = await self.get_next_action_streaming(input_messages)
+					else:
+						model_output = await self.get_next_action(input_messages)
+					if (
+						not model_output.action
+						or not isinstance(model_output.action, list)
+						or all(action.model_dump() == {} for action in model_output.action)
+					):
+						self.logger.warning('Model returned empty action. Retrying...')
+
+						clarification_message = UserMessage(
+							content='You forgot to return an action. Please respond only with a valid JSON action according to the expected format.'
 						)
-						model_output.action = [action_instance]
 
-				# Check again for paused/stopped state after getting model output
-				await self._raise_if_stopped_or_paused()
+						retry_messages = input_messages + [clarification_message]
+						model_output = await self.get_next_action(retry_messages)
+						executed_results = []
+
+						if not model_output.action or all(action.model_dump() == {} for action in model_output.action):
+							self.logger.warning('Model still returned empty after retry. Inserting safe noop action.')
+							action_instance = self.ActionModel()
+							setattr(
+								action_instance,
+								'done',
+								{
+									'success': False,
+									'text': 'No next action returned by LLM!',
+								},
+							)
+							model_output.action = [action_instance]
 
-				self.state.n_steps += 1
+					# Check again for paused/stopped state after getting model output
+					await self._raise_if_stopped_or_paused()
 
-				if self.register_new_step_callback:
-					if inspect.iscoroutinefunction(self.register_new_step_callback):
-						await self.register_new_step_callback(browser_state_summary, model_output, self.state.n_steps)
-					else:
-						self.register_new_step_callback(browser_state_summary, model_output, self.state.n_steps)
-				if self.settings.save_conversation_path:
-					# Treat save_conversation_path as a directory (consistent with other recording paths)
-					conversation_dir = Path(self.settings.save_conversation_path)
-					conversation_filename = f'conversation_{self.id}_{self.state.n_steps}.txt'
-					target = conversation_dir / conversation_filename
-					await save_conversation(
-						input_messages,
-						model_output,
-						target,
-						self.settings.save_conversation_path_encoding,
-					)
+					self.state.n_steps += 1
+					self._calibrate_token_estimator()
 
-				self._message_manager._remove_last_state_message()  # we dont want the whole state in the chat history
+					if self.register_new_step_callback:
+						if inspect.iscoroutinefunction(self.register_new_step_callback):
+							await self.register_new_step_callback(browser_state_summary, model_output, self.state.n_steps)
+						else:
+							self.register_new_step_callback(browser_state_summary, model_output, self.state.n_steps)
+					if self.settings.save_conversation_path:
+						# Treat save_conversation_path as a directory (consistent with other recording paths)
+						conversation_dir = Path(self.settings.save_conversation_path)
+						conversation_filename = f'conversation_{self.id}_{self.state.n_steps}.txt'
+						target = conversation_dir / conversation_filename
+						await save_conversation(
+							input_messages,
+							model_output,
+							target,
+							self.settings.save_conversation_path_encoding,
+						)
 
-				# check again if Ctrl+C was pressed before we commit the output to history
-				await self._raise_if_stopped_or_paused()
+					self._message_manager._remove_last_state_message()  # we dont want the whole state in the chat history
 
-			except asyncio.CancelledError:
-				# Task was cancelled due to Ctrl+C
-				self._message_manager._remove_last_state_message()
-				raise InterruptedError('Model query cancelled by user')
-			except InterruptedError:
-				# Agent was paused during get_next_action
-				self._message_manager._remove_last_state_message()
-				raise  # Re-raise to be caught by the outer try/except
-			except Exception as e:
-				# model call failed, remove last state message from history
-				self._message_manager._remove_last_state_message()
-				raise e
+					# check again if Ctrl+C was pressed before we commit the output to history
+					await self._raise_if_stopped_or_paused()
 
-			result: list[ActionResult] = await self.multi_act(model_output.action)
+				except asyncio.CancelledError:
+					# Task was cancelled due to Ctrl+C
+					self._message_manager._remove_last_state_message()
+					raise InterruptedError('Model query cancelled by user')
+				except InterruptedError:
+					# Agent was paused during get_next_action
+					self._message_manager._remove_last_state_message()
+					raise  # Re-raise to be caught by the outer try/except
+				except Exception as e:
+					# model call failed, remove last state message from history
+					self._message_manager._remove_last_state_message()
+					raise e
 
-			self.state.last_result = result
-			self.state.last_model_output = model_output
+				result: list[ActionResult] = await self.multi_act(model_output.action, executed_results=executed_results)
 
-			# Check for new downloads after executing actions
-			if self.has_downloads_path:
-				try:
-					current_downloads = self.browser_session.downloaded_files
-					if current_downloads != self._last_known_downloads:
-						self._update_available_file_paths(current_downloads)
-						self._last_known_downloads = current_downloads
-				except Exception as e:
-					self.logger.debug(f'📁 Failed to check for new downloads: {type(e).__name__}: {e}')
+				self.state.last_result = result
+				self.state.last_model_output = model_output
 
-			if len(result) > 0 and result[-1].is_done:
-				self.logger.info(f'📄 Result: {result[-1].extracted_content}')
-				if result[-1].attachments:
-					self.logger.info('📎 Click links below to access the attachments:')
-					for file_path in result[-1].attachments:
-						self.logger.info(f'👉 {file_path}')
+				# Check for new downloads after executing actions
+				if self.has_downloads_path:
+					try:
+						current_downloads = self.browser_session.downloaded_files
+						if current_downloads != self._last_known_downloads:
+							self._update_available_file_paths(current_downloads)
+							self._last_known_downloads = current_downloads
+					except Exception as e:
+						self.logger.debug(f'📁 Failed to check for new downloads: {type(e).__name__}: {e}')
 
-			self.state.consecutive_failures = 0
+				if len(result) > 0 and result[-1].is_done:
+					self.logger.info(f'📄 Result: {result[-1].extracted_content}')
+					if result[-1].attachments:
+						self.logger.info('📎 Click links below to access the attachments:')
+						for file_path in result[-1].attachments:
+							self.logger.info(f'👉 {file_path}')
 
-		except InterruptedError:
-			# self.logger.debug('Agent paused')
-			self.state.last_result = [
-				ActionResult(
-					error='The agent was paused mid-step - the last action might need to be repeated',
-					include_in_memory=True,
-				)
-			]
-			return
-		except asyncio.CancelledError:
-			# Directly handle the case where the step is cancelled at a higher level
-			# self.logger.debug('Task cancelled - agent was paused with Ctrl+C')
-			self.state.last_result = [ActionResult(error='The agent was paused with Ctrl+C', include_in_memory=True)]
-			raise InterruptedError('Step cancelled by user')
-		except Exception as e:
-			result = await self._handle_step_error(e)
-			self.state.last_result = result
+				self.state.consecutive_failures = 0
 
-		finally:
-			step_end_time = time.time()
-			if not result:
+			except InterruptedError:
+				# self.logger.debug('Agent paused')
+				self.state.last_result = [
+					*self._take_interrupted_stream_results(),
+					ActionResult(
+						error='The agent was paused mid-step - the last action might need to be repeated',
+						include_in_memory=True,
+					),
+				]
 				return
+			except asyncio.CancelledError:
+				# Directly handle the case where the step is cancelled at a higher level
+				# self.logger.debug('Task cancelled - agent was paused with Ctrl+C')
+				self.state.last_result = [
+					*self._take_interrupted_stream_results(),
+					ActionResult(error='The agent was paused with Ctrl+C', include_in_memory=True),
+				]
+				raise InterruptedError('Step cancelled by user')
+			except Exception as e:
+				# an action that already ran from the streamed response is part of this step, even though the LLM call failed
+				result = [*self._take_interrupted_stream_results(), *await self._handle_step_error(e)]
+				self.state.last_result = result
 
-			if browser_state_summary:
-				metadata = StepMetadata(
-					step_number=self.state.n_steps,
-					step_start_time=step_start_time,
-					step_end_time=step_end_time,
-				)
-				self._make_history_item(model_output, browser_state_summary, result, metadata)
+			finally:
+				step_end_time = time.time()
+				if not result:
+					return
+
+				if browser_state_summary:
+					metadata = StepMetadata(
+						step_number=self.state.n_steps,
+						step_start_time=step_start_time,
+						step_end_time=step_end_time,
+						spans=[step_span],
+					)
+					self._make_history_item(model_output, browser_state_summary, result, metadata)
+
+				# Log step completion summary
+				self._log_step_completion_summary(step_start_time, result)
+
+				# Save file system state after step completion
+				self.save_file_system_state()
+
+				checkpoint = None
+				if self._checkpoint_store:
+					checkpoint = self._checkpoint_store.build_record(self.state, self.browser_session._recovery_snapshot)
 
-			# Log step completion summary
-			self._log_step_completion_summary(step_start_time, result)
+				# spill old screenshots, write the checkpoint + emit the step event in the background, so the next step can start right away
+				self._schedule_step_bookkeeping(model_output, result, browser_state_summary, checkpoint)
 
-			# Save file system state after step completion
-			self.save_file_system_state()
+	def _schedule_step_bookkeeping(
+		self,
+		model_output: AgentOutput | None,
+		result: list[ActionResult],
+		browser_state_summary: BrowserStateSummary | None,
+		checkpoint: dict[str, Any] | None = None,
+	) -> None:
+		"""Chain the bookkeeping for a finished step after the previous one, so events + checkpoints are always written in step order"""
+		self._pending_step_bookkeeping = asyncio.create_task(
+			self._finish_step_bookkeeping(
+				self._pending_step_bookkeeping, model_output, result, browser_state_summary, checkpoint
+			),
+			name=f'step_bookkeeping_{self.id[-4:]}_{self.state.n_steps}',
+		)
+
+	async def _finish_step_bookkeeping(
+		self,
+		previous_bookkeeping: asyncio.Task | None,
+		model_output: AgentOutput | None,
+		result: list[ActionResult],
+		browser_state_summary: BrowserStateSummary | None,
+		checkpoint: dict[str, Any] | None = None,
+	) -> None:
+		# this task runs in a copy of the step's context, don't let its work show up in the (finished) step's spans
+		detach_spans()
+		if previous_bookkeeping:
+			await asyncio.gather(previous_bookkeeping, return_exceptions=True)
 
-			# Emit both step created and executed events
-			if browser_state_summary and model_output:
-				# Extract key step data for the event
-				actions_data = []
-				if model_output.action:
-					for action in model_output.action:
-						action_dict = action.model_dump() if hasattr(action, 'model_dump') else {}
-						actions_data.append(action_dict)
+		# writing screenshots to disk and base64-encoding them for the event are the slow parts, keep them off the event loop
+		await asyncio.to_thread(self._spill_old_screenshots)
 
-				# Emit CreateAgentStepEvent
-				step_event = CreateAgentStepEvent.from_agent_step(self, model_output, result, actions_data, browser_state_summary)
-				self.eventbus.dispatch(step_event)
+		if checkpoint and self._checkpoint_store:
+			try:
+				await asyncio.to_thread(self._checkpoint_store.write_record, checkpoint)
+			except Exception as e:
+				self.logger.warning(f'⚠️ Failed to write checkpoint to {self._checkpoint_store.file}: {type(e).__name__}: {e}')
+
+		# Emit both step created and executed events
+		if browser_state_summary and model_output:
+			# Extract key step data for the event
+			actions_data = []
+			if model_output.action:
+				for action in model_output.action:
+					action_dict = action.model_dump() if hasattr(action, 'model_dump') else {}
+					actions_data.append(action_dict)
+
+			if browser_state_summary.screenshot:
+				await asyncio.to_thread(lambda: browser_state_summary.screenshot.data_url)  # memoized on the Screenshot
+
+			# Emit CreateAgentStepEvent
+			step_event = CreateAgentStepEvent.from_agent_step(self, model_output, result, actions_data, browser_state_summary)
+			self.eventbus.dispatch(step_event)
+
+	async def _wait_for_step_bookkeeping(self) -> None:
+		"""Wait for the background bookkeeping of all previous steps to finish"""
+		pending_bookkeeping, self._pending_step_bookkeeping = self._pending_step_bookkeeping, None
+		if pending_bookkeeping is None:
+			return
+		try:
+			await pending_bookkeeping
+		except Exception as e:
+			self.logger.warning(f'⚠️ Failed to finish bookkeeping for the previous step: {type(e).__name__}: {e}')
 
 	@time_execution_async('--handle_step_error (agent)')
 	async def _handle_step_error(self, error: Exception) -> list[ActionResult]:
@@ -903,6 +1048,61 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 		self.state.history.history.append(history_item)
 
+	def _calibrate_token_estimator(self) -> None:
+		"""Let the local token estimator learn from the prompt tokens billed for the requests since the last call"""
+		usage_history = self.token_cost_service.usage_history
+		new_entries = usage_history[self._calibrated_usage_entries :]
+		self._calibrated_usage_entries = len(usage_history)
+		for entry in new_entries:
+			# cancelled requests only carry the estimate itself, there is no billed count to learn from
+			if entry.model == self.llm.model and entry.estimated_prompt_tokens and not entry.cancelled:
+				self._message_manager.token_estimator.calibrate(entry.estimated_prompt_tokens, entry.usage.prompt_tokens)
+
+	def _process_screenshot(self, browser_state_summary: BrowserStateSummary) -> None:
+		"""Compute what the state message needs from the current screenshot ahead of time (cached on the screenshot)"""
+		assert browser_state_summary.screenshot is not None
+		if self.settings.images_per_step > 1:
+			browser_state_summary.screenshot.fingerprint  # to drop previous screenshots that are near-duplicates of it
+		if self.settings.image_preprocessing:
+			preprocess_state_screenshot(browser_state_summary, self.settings.image_preprocessing)
+
+	def _spill_old_screenshots(self) -> None:
+		"""Move screenshots that are no longer sent to the LLM out of memory into self.screenshots_dir"""
+		self._delete_default_screenshots_dir_with_history()
+		# the last images_per_step screenshots are still needed in memory for the next state message
+		for item in reversed(self.state.history.history[: -self.settings.images_per_step]):
+			if not item.state.screenshot:
+				continue
+			if item.state.screenshot.is_spilled:
+				break  # everything before this was already spilled on a previous step
+			try:
+				item.state.screenshot.spill(self.screenshots_dir)
+			except Exception as e:
+				self.logger.debug(f'Failed to spill screenshot to {self.screenshots_dir}: {type(e).__name__}: {e}')
+				break
+
+	def _delete_default_screenshots_dir_with_history(self) -> None:
+		"""The per-agent temp dir is only needed as long as the history referencing its screenshots, delete it with the history"""
+		if self.settings.screenshots_dir:
+			return
+		finalizer = self._screenshots_dir_finalizer
+		if finalizer is not None and finalizer.alive and finalizer.peek()[0] is self.state.history:  # type: ignore[index]
+			return
+		if finalizer is not None:
+			finalizer.detach()  # e.g. resume_from_checkpoint() replaced the history, the dir now belongs to the new one
+		self._screenshots_dir_finalizer = weakref.finalize(
+			self.state.history, shutil.rmtree, str(self.screenshots_dir), ignore_errors=True
+		)
+
+	def delete_spilled_screenshots(self) -> None:
+		"""
+		Delete the per-agent temp dir the screenshots of past steps were spilled to, instead of waiting for the history to be
+		garbage collected (or the process to exit). Spilled screenshots in the history can't be read afterwards.
+		Screenshots spilled to a screenshots_dir passed to the Agent are never deleted.
+		"""
+		if self._screenshots_dir_finalizer is not None:
+			self._screenshots_dir_finalizer()
+
 	THINK_TAGS = re.compile(r'<think>.*?</think>', re.DOTALL)
 	STRAY_CLOSE_TAG = re.compile(r'.*?</think>', re.DOTALL)
 
@@ -918,7 +1118,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 	async def get_next_action(self, input_messages: list[BaseMessage]) -> AgentOutput:
 		"""Get next action from LLM based on current state"""
 
-		response = await self.llm.ainvoke(input_messages, output_format=self.AgentOutput)
+		with trace_span('llm_call', model=self.llm.model, messages=len(input_messages)):
+			response = await self.llm.ainvoke(input_messages, output_format=self.AgentOutput)
 		parsed = response.completion
 
 		# cut the number of actions to max_actions_per_step if needed
@@ -931,6 +1132,97 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self._log_next_action_summary(parsed)
 		return parsed
 
+	@time_execution_async('--get_next_action_streaming')
+	async def get_next_action_streaming(self, input_messages: list[BaseMessage]) -> tuple[AgentOutput, list[ActionResult]]:
+		"""
+		Like get_next_action(), but streams the response and executes the first action as soon as its JSON is complete,
+		while the LLM is still generating the rest. Returns the parsed output + the results of the already executed actions.
+		"""
+		parser = StreamingActionParser(self.AgentOutput)
+		early_action: ActionModel | None = None
+		early_action_task: asyncio.Task[ActionResult] | None = None
+		response = None
+
+		# the early action runs alongside the LLM call, its span goes next to the llm_call span instead of inside it
+		step_context = contextvars.copy_context()
+		try:
+			with trace_span('llm_call', model=self.llm.model, messages=len(input_messages), streaming=True):
+				async for chunk in self.llm.astream(input_messages, output_format=self.AgentOutput):
+					if chunk.completion is not None:
+						response = chunk.completion
+					elif early_action_task is None:
+						completed_actions = parser.feed(chunk.delta)
+						if completed_actions:
+							early_action = completed_actions[0]
+							early_action_task = asyncio.create_task(
+								self._execute_streamed_action(early_action), context=step_context
+							)
+		except BaseException:
+			if early_action_task is not None:
+				# the action is already running in the browser, let it finish before the step is failed and keep its result,
+				# so the next step knows it happened
+				(early_result,) = await asyncio.gather(early_action_task, return_exceptions=True)
+				if isinstance(early_result, ActionResult):
+					self._interrupted_stream_results = [early_result]
+			raise
+
+		assert response is not None, f'{self.llm.name}.astream() finished without a completion'
+		parsed: AgentOutput = response.completion
+
+		executed_results: list[ActionResult] = []
+		if early_action_task is not None and early_action is not None:
+			executed_results = [await early_action_task]
+			if parsed.action and parsed.action[0].model_dump(exclude_unset=True) != early_action.model_dump(exclude_unset=True):
+				self.logger.warning('⚠️ Streamed first action differs from the final response, keeping the executed one')
+			parsed.action = [early_action, *parsed.action[1:]]
+
+		# cut the number of actions to max_actions_per_step if needed
+		if len(parsed.action) > self.settings.max_actions_per_step:
+			parsed.action = parsed.action[: self.settings.max_actions_per_step]
+
+		if not (hasattr(self.state, 'paused') and (self.state.paused or self.state.stopped)):
+			log_response(parsed, self.controller.registry.registry, self.logger)
+
+		self._log_next_action_summary(parsed)
+		return parsed, executed_results
+
+	def _take_interrupted_stream_results(self) -> list[ActionResult]:
+		results, self._interrupted_stream_results = self._interrupted_stream_results, []
+		return results
+
+	async def _execute_streamed_action(self, action: ActionModel) -> ActionResult:
+		"""Execute the first action of a response that is still streaming, mirrors the first iteration of multi_act()"""
+		assert self.browser_session is not None, 'BrowserSession is not set up'
+		await self._raise_if_stopped_or_paused()
+		await self.browser_session.remove_highlights()
+
+		action_data = action.model_dump(exclude_unset=True)
+		action_name = next(iter(action_data.keys())) if action_data else 'unknown'
+		with trace_span('action', action=action_name, index=0):
+			result = await self.controller.act(
+				action=action,
+				browser_session=self.browser_session,
+				file_system=self.file_system,
+				page_extraction_llm=self.settings.page_extraction_llm,
+				sensitive_data=self.sensitive_data,
+				available_file_paths=self.settings.available_file_paths,
+				context=self.context,
+			)
+
+		self.logger.info(f'☑️ Executed streamed action 1: {action_name}({getattr(action, action_name, "")})')
+		if not (result.is_done or result.error):
+			with trace_span('wait_between_actions'):
+				await self._wait_between_actions()
+		return result
+
+	async def _wait_between_actions(self) -> None:
+		"""Let the page react to the last action, at most browser_profile.wait_between_actions"""
+		assert self.browser_session is not None, 'BrowserSession is not set up'
+		if self.browser_profile.adaptive_settle:
+			await self.browser_session.wait_for_page_settle(max_wait=self.browser_profile.wait_between_actions)
+		else:
+			await asyncio.sleep(self.browser_profile.wait_between_actions)
+
 	def _log_agent_run(self) -> None:
 		"""Log the agent run"""
 		self.logger.info(f'🚀 Starting task: {self.task}')
@@ -1232,6 +1524,16 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			# to match backend requirements for CREATE events to be fired when entities are created,
 			# not when they are completed
 
+			# make sure the last step's CreateAgentStepEvent is dispatched before the task update
+			await self._wait_for_step_bookkeeping()
+
+			# a plan that's still being generated has no step left to go into
+			if self._pending_plan:
+				self._pending_plan.cancel()
+				self._pending_plan = None
+			if self._history_compactor:
+				self._history_compactor.cancel()
+
 			# Emit UpdateAgentTaskEvent at the END of run() with final task state
 			self.eventbus.dispatch(UpdateAgentTaskEvent.from_agent(self))
 
@@ -1270,17 +1572,27 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		self,
 		actions: list[ActionModel],
 		check_for_new_elements: bool = True,
+		executed_results: list[ActionResult] | None = None,
 	) -> list[ActionResult]:
-		"""Execute multiple actions"""
-		results = []
+		"""
+		Execute multiple actions.
+		executed_results are the results of the first actions that were already executed while the LLM response was streaming.
+		"""
+		results = list(executed_results or [])
+		if results and (results[-1].is_done or results[-1].error or len(results) >= len(actions)):
+			return results
 
 		assert self.browser_session is not None, 'BrowserSession is not set up'
 		cached_selector_map = await self.browser_session.get_selector_map()
 		cached_path_hashes = {e.hash.branch_path_hash for e in cached_selector_map.values()}
 
-		await self.browser_session.remove_highlights()
+		if not results:
+			await self.browser_session.remove_highlights()
 
 		for i, action in enumerate(actions):
+			if i < len(results):
+				continue  # already executed
+
 			# DO NOT ALLOW TO CALL `done` AS A SINGLE ACTION
 			if i > 0 and action.model_dump(exclude_unset=True).get('done') is not None:
 				msg = f'Done action is allowed only as a single action - stopped after action {i} / {len(actions)}.'
@@ -1325,27 +1637,30 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			try:
 				await self._raise_if_stopped_or_paused()
 
-				result = await self.controller.act(
-					action=action,
-					browser_session=self.browser_session,
-					file_system=self.file_system,
-					page_extraction_llm=self.settings.page_extraction_llm,
-					sensitive_data=self.sensitive_data,
-					available_file_paths=self.settings.available_file_paths,
-					context=self.context,
-				)
-
-				results.append(result)
-
 				# Get action name from the action model
 				action_data = action.model_dump(exclude_unset=True)
 				action_name = next(iter(action_data.keys())) if action_data else 'unknown'
+
+				with trace_span('action', action=action_name, index=i):
+					result = await self.controller.act(
+						action=action,
+						browser_session=self.browser_session,
+						file_system=self.file_system,
+						page_extraction_llm=self.settings.page_extraction_llm,
+						sensitive_data=self.sensitive_data,
+						available_file_paths=self.settings.available_file_paths,
+						context=self.context,
+					)
+
+				results.append(result)
+
 				action_params = getattr(action, action_name, '')
 				self.logger.info(f'☑️ Executed action {i + 1}/{len(actions)}: {action_name}({action_params})')
 				if results[-1].is_done or results[-1].error or i == len(actions) - 1:
 					break
 
-				await asyncio.sleep(self.browser_profile.wait_between_actions)
+				with trace_span('wait_between_actions'):
+					await self._wait_between_actions()
 				# hash all elements. if it is a subset of cached_state its fine - else break (new elements on page)
 
 			except asyncio.CancelledError:
@@ -1376,6 +1691,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		max_retries: int = 3,
 		skip_failures: bool = True,
 		delay_between_actions: float = 2.0,
+		turbo: bool = False,
+		screenshots: bool = False,
 	) -> list[ActionResult]:
 		"""
 		Rerun a saved history of actions with error handling and retry logic.
@@ -1384,7 +1701,11 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		                history: The history to replay
 		                max_retries: Maximum number of retries per action
 		                skip_failures: Whether to skip failed actions or stop execution
-		                delay_between_actions: Delay between actions in seconds
+		                delay_between_actions: Delay between actions in seconds (ignored in turbo mode)
+		                turbo: Replay known-good flows fast: wait for the network to go quiet instead of fixed delays,
+		                        and resolve recorded elements with one lightweight DOM probe per step (no screenshots)
+		                screenshots: In turbo mode, save a screenshot after each step to screenshots_dir (as an attachment of the step's last result),
+		                        pass screenshots_dir to the Agent to keep them after its history is gone
 
 		Returns:
 		                List of action results
@@ -1410,9 +1731,13 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 				continue
 
 			retry_count = 0
+			executed_results: list[ActionResult] = []  # turbo retries continue after the actions that already succeeded
 			while retry_count < max_retries:
 				try:
-					result = await self._execute_history_step(history_item, delay_between_actions)
+					if turbo:
+						result = await self._execute_history_step_turbo(history_item, screenshots, executed_results)
+					else:
+						result = await self._execute_history_step(history_item, delay_between_actions)
 					results.extend(result)
 					break
 
@@ -1421,12 +1746,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 					if retry_count == max_retries:
 						error_msg = f'Step {i + 1} failed after {max_retries} attempts: {str(e)}'
 						self.logger.error(error_msg)
+						results.extend(executed_results)
 						if not skip_failures:
 							results.append(ActionResult(error=error_msg))
 							raise RuntimeError(error_msg)
 					else:
 						self.logger.warning(f'Step {i + 1} failed (attempt {retry_count}/{max_retries}), retrying...')
-						await asyncio.sleep(delay_between_actions)
+						if not turbo:  # turbo steps start by waiting for the page to settle anyway
+							await asyncio.sleep(delay_between_actions)
 
 		return results
 
@@ -1453,6 +1780,66 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		await asyncio.sleep(delay)
 		return result
 
+	async def _execute_history_step_turbo(
+		self,
+		history_item: AgentHistory,
+		screenshots: bool = False,
+		executed_results: list[ActionResult] | None = None,
+	) -> list[ActionResult]:
+		"""
+		Execute a single step from history in turbo mode: one get_replay_state() probe for the whole step, recorded
+		elements matched directly in the probed DOM, and the actions executed back to back without re-extracting state
+		in between. Only if an earlier action added/removed elements is the page probed again before the next index action.
+		If a recorded element can't be found, raises after the actions executed so far were appended to executed_results,
+		so a retry with the same list continues from the failed action instead of repeating the ones that succeeded.
+		"""
+		assert self.browser_session is not None, 'BrowserSession is not set up'
+		if not history_item.model_output:
+			raise ValueError('Invalid model output')
+		actions = history_item.model_output.action
+		interacted_elements = history_item.state.interacted_element
+		results = executed_results if executed_results is not None else []
+		first = len(results)
+
+		def historical_element(i: int) -> DOMHistoryElement | None:
+			return interacted_elements[i] if i < len(interacted_elements) else None
+
+		# steps that only navigate/scroll/extract don't need the DOM at all, just the page to settle
+		needs_dom = any(historical_element(i) is not None for i in range(first, len(actions)))
+		state = await self.browser_session.get_replay_state(include_dom=needs_dom)
+
+		for i in range(first, len(actions)):
+			action = actions[i]
+			if i > first and historical_element(i) is not None and await self.browser_session.replay_dom_changed():
+				self.logger.debug(f'Page changed after action {i} / {len(actions)}, probing it again')
+				state = await self.browser_session.get_replay_state()
+			updated_action = await self._update_action_indices(historical_element(i), action, state) if state else action
+			if updated_action is None:
+				raise ValueError(f'Could not find matching element {i} in current page')
+
+			await self._raise_if_stopped_or_paused()
+			result = await self.controller.act(
+				action=updated_action,
+				browser_session=self.browser_session,
+				file_system=self.file_system,
+				page_extraction_llm=self.settings.page_extraction_llm,
+				sensitive_data=self.sensitive_data,
+				available_file_paths=self.settings.available_file_paths,
+				context=self.context,
+			)
+			results.append(result)
+			if result.is_done or result.error:
+				break
+
+		if screenshots and results:
+			await self.browser_session.get_replay_state(include_dom=False)
+			screenshot = await self.browser_session.capture_screenshot()
+			self._delete_default_screenshots_dir_with_history()
+			await asyncio.to_thread(screenshot.spill, self.screenshots_dir)
+			results[-1].attachments = [*(results[-1].attachments or []), str(screenshot.path)]
+
+		return results
+
 	async def _update_action_indices(
 		self,
 		historical_element: DOMHistoryElement | None,
@@ -1466,8 +1853,8 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		if not historical_element or not browser_state_summary.element_tree:
 			return action
 
-		current_element = HistoryTreeProcessor.find_history_element_in_tree(
-			historical_element, browser_state_summary.element_tree
+		current_element = HistoryTreeProcessor.find_history_element_in_selector_map(
+			historical_element, browser_state_summary.selector_map
 		)
 
 		if not current_element or current_element.highlight_index is None:
@@ -1499,6 +1886,54 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 			file_path = 'AgentHistory.json'
 		self.state.history.save_to_file(file_path)
 
+	async def resume_from_checkpoint(
+		self,
+		checkpoint_path: str | Path | None = None,
+		max_steps: int = 100,
+		on_step_start: AgentHookFunc | None = None,
+		on_step_end: AgentHookFunc | None = None,
+	) -> AgentHistoryList[AgentStructuredOutput]:
+		"""
+		Continue a run that was interrupted (crash, preempted worker, ...) from its last checkpoint.
+
+		Restores the agent state, history, message history and file system written with Agent(checkpoint_path=...),
+		reopens the tabs with their cookies + scroll positions, then runs from the next step on. max_steps includes the
+		steps that already ran before the checkpoint. New checkpoints are appended to the same store.
+
+		Args:
+		                checkpoint_path: The checkpoint directory, defaults to the checkpoint_path this agent was created with
+		"""
+		checkpoint_path = checkpoint_path or self.settings.checkpoint_path
+		assert checkpoint_path, 'No checkpoint_path given to resume from'
+
+		self._checkpoint_store = AgentCheckpointStore(checkpoint_path)
+		self.settings.checkpoint_path = checkpoint_path
+		state, browser_snapshot = await asyncio.to_thread(self._checkpoint_store.load, self.AgentOutput)
+		state.paused = state.stopped = False
+
+		self.state = state
+		self._set_file_system()
+		self._message_manager.state = self.state.message_manager_state
+		self._message_manager.file_system = self.file_system
+		self.initial_actions = None  # they ran before the first checkpoint
+
+		if self.state.history.is_done():
+			self.logger.info(f'⏯️ Checkpoint at {_log_pretty_path(checkpoint_path)} is already done, nothing to resume')
+			return self.state.history
+
+		assert self.browser_session is not None, 'BrowserSession is not set up'
+		await self.browser_session.start()
+		restored_tabs = 0
+		if browser_snapshot:
+			restored_tabs = await self.browser_session._restore_recovery_snapshot(browser_snapshot)
+		self.logger.info(
+			f'⏯️ Resuming from checkpoint {_log_pretty_path(checkpoint_path)} at step {self.state.n_steps} '
+			f'with {len(self.state.history)} history items and {restored_tabs} restored tabs'
+		)
+
+		steps_done = self.state.n_steps - 1
+		return await self.run(max_steps=max(max_steps - steps_done, 1), on_step_start=on_step_start, on_step_end=on_step_end)
+
 	async def wait_until_resumed(self):
 		await self._external_pause_event.wait()
 
@@ -1582,6 +2017,38 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 		if not self.settings.planner_llm:
 			return None
 
+		return await self._invoke_planner(await self._get_planner_messages())
+
+	async def _start_concurrent_planner(self) -> None:
+		"""Start a planner run on the current message history without waiting for it, see _add_finished_plan()"""
+		if self._pending_plan and not self._pending_plan.done():
+			self.logger.debug('Planner from an earlier step is still running, not starting another one')
+			return
+		planner_messages = await self._get_planner_messages()
+		self._pending_plan = asyncio.create_task(
+			self._run_concurrent_planner(planner_messages), name=f'planner_{self.id[-4:]}_{self.state.n_steps}'
+		)
+
+	async def _run_concurrent_planner(self, planner_messages: list[BaseMessage]) -> str | None:
+		detach_spans()  # outlives the step that started it
+		return await self._invoke_planner(planner_messages)
+
+	def _add_finished_plan(self) -> None:
+		"""Add the plan of a concurrent planner run once it's done, a planner that's still running doesn't hold up the step"""
+		planner_run = self._pending_plan
+		if planner_run is None or not planner_run.done():
+			return
+		self._pending_plan = None
+		if planner_run.cancelled():
+			return
+		if error := planner_run.exception():
+			self.logger.warning(f'⚠️ Concurrent planner failed, continuing without its plan: {type(error).__name__}: {error}')
+			return
+		# add plan before last state message
+		self._message_manager.add_plan(planner_run.result(), position=-1)
+
+	async def _get_planner_messages(self) -> list[BaseMessage]:
+		"""Planner prompt with all available actions + the message history so far"""
 		# Get current state to filter actions by page
 		assert self.browser_session is not None, 'BrowserSession is not set up'
 		page = await self.browser_session.get_current_page()
@@ -1619,9 +2086,14 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 
 			planner_messages[-1] = UserMessage(content=new_msg)
 
-		# Get planner output
+		return planner_messages
+
+	async def _invoke_planner(self, planner_messages: list[BaseMessage]) -> str | None:
+		"""Get the plan from the planner LLM"""
+		assert self.settings.planner_llm is not None, 'planner_llm is not set'
 		try:
-			response = await self.settings.planner_llm.ainvoke(planner_messages)
+			with trace_span('planner_llm_call', model=self.settings.planner_llm.model):
+				response = await self.settings.planner_llm.ainvoke(planner_messages)
 		except Exception as e:
 			self.logger.error(f'Failed to invoke planner: {str(e)}')
 			# Extract status code if available (e.g., from HTTP exceptions)
@@ -1653,6 +2125,9 @@ class Agent(Generic[Context, AgentStructuredOutput]):
 	async def close(self):
 		"""Close all resources"""
 		try:
+			# Let the last step's background bookkeeping finish before tearing anything down
+			await self._wait_for_step_bookkeeping()
+
 			# First close browser resources
 			assert self.browser_session is not None, 'BrowserSession is not set up'
 			await self.browser_session.stop()
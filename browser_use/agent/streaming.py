@@ -0,0 +1,107 @@
+"""
+Incremental parsing of a streamed AgentOutput, so actions can be executed while the LLM is still generating.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from typing import get_args
+
+from pydantic import ValidationError
+
+from browser_use.agent.views import AgentOutput
+from browser_use.controller.registry.views import ActionModel
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingActionParser:
+	"""
+	Scans the raw JSON of a streamed AgentOutput and returns each entry of its top-level "action" list as soon as
+	that entry's JSON object is complete, validated against the output format's ActionModel.
+
+	Usage:
+		parser = StreamingActionParser(AgentOutput)
+		async for chunk in llm.astream(messages, output_format=AgentOutput):
+			for action in parser.feed(chunk.delta):
+				...
+	"""
+
+	def __init__(self, output_format: type[AgentOutput]):
+		(self.action_model,) = get_args(output_format.model_fields['action'].annotation)
+
+		self.buffer = ''
+		self.actions: list[ActionModel] = []
+		self.failed = False  # stop emitting actions once one of them doesn't validate, the full response decides
+
+		# scanner state, carried over between feed() calls so every character is only looked at once
+		self._pos = 0
+		self._stack: list[str] = []
+		self._in_string = False
+		self._escaped = False
+		self._string_start = -1
+		self._last_key: str | None = None
+		self._in_action_list = False
+		self._action_start = -1
+
+	def feed(self, delta: str) -> list[ActionModel]:
+		"""Consume the next fragment of raw JSON, returns the actions that were completed by it"""
+		self.buffer += delta
+		completed: list[ActionModel] = []
+
+		buffer = self.buffer
+		for pos in range(self._pos, len(buffer)):
+			char = buffer[pos]
+
+			if self._in_string:
+				if self._escaped:
+					self._escaped = False
+				elif char == '\\':
+					self._escaped = True
+				elif char == '"':
+					self._in_string = False
+					if len(self._stack) == 1:
+						# a string directly inside the top-level object is a key if a ':' follows it
+						self._last_key = buffer[self._string_start + 1 : pos]
+				continue
+
+			if char == '"':
+				self._in_string = True
+				self._string_start = pos
+			elif char in '{[':
+				if char == '[' and self._stack == ['{'] and self._last_key == 'action':
+					self._in_action_list = True
+				elif char == '{' and self._in_action_list and len(self._stack) == 2:
+					self._action_start = pos
+				self._stack.append(char)
+			elif char in '}]':
+				if self._stack:
+					self._stack.pop()
+				if self._in_action_list and len(self._stack) == 2 and char == '}' and self._action_start >= 0:
+					action = self._parse_action(buffer[self._action_start : pos + 1])
+					if action is not None:
+						self.actions.append(action)
+						completed.append(action)
+					self._action_start = -1
+				elif self._in_action_list and len(self._stack) == 1:
+					self._in_action_list = False
+			elif char == ',' and len(self._stack) == 1:
+				self._last_key = None
+
+		self._pos = len(buffer)
+		return completed
+
+	def _parse_action(self, action_json: str) -> ActionModel | None:
+		if self.failed:
+			return None
+		try:
+			action = self.action_model.model_validate(json.loads(action_json))
+		except (json.JSONDecodeError, ValidationError) as e:
+			logger.debug(f'Streamed action did not validate, waiting for the full response instead: {type(e).__name__}: {e}')
+			self.failed = True
+			return None
+		if not action.model_dump(exclude_unset=True):
+			self.failed = True  # empty action, the agent retries these after the full response
+			return None
+		return action
@@ -0,0 +1,67 @@
+"""
+Tests for the per-step agent checkpoints that Agent.resume_from_checkpoint() restores from.
+"""
+
+import json
+
+from browser_use.agent.checkpoint import AgentCheckpointStore
+from browser_use.agent.views import ActionResult, AgentHistory, AgentOutput, AgentState
+from browser_use.browser.views import BrowserStateHistory, Screenshot
+from browser_use.controller.service import Controller
+from browser_use.filesystem.file_system import FileSystem
+
+
+def test_checkpoints_store_deltas_and_fold_back_into_the_agent_state(tmp_path):
+	output_model = AgentOutput.type_with_custom_actions(Controller().registry.create_action_model())
+	file_system = FileSystem(tmp_path / 'fs')
+	state = AgentState(file_system_state=file_system.get_state())
+	store = AgentCheckpointStore(tmp_path / 'checkpoint')
+	browser_snapshot = {'urls': ['https://example.com/a'], 'agent_tab_index': 0, 'scroll_positions': [400], 'cookies': []}
+
+	def finish_step(url: str, action: dict) -> None:
+		model_output = output_model.model_validate(
+			{'evaluation_previous_goal': '', 'memory': '', 'next_goal': '', 'action': [action]}
+		)
+		state.history.history.append(
+			AgentHistory(
+				model_output=model_output,
+				result=[ActionResult(extracted_content=url)],
+				state=BrowserStateHistory(
+					url=url, title='', tabs=[], interacted_element=[None], screenshot=Screenshot(url.encode())
+				),
+			)
+		)
+		state.last_model_output = model_output
+		state.n_steps += 1
+		state.file_system_state = file_system.get_state()
+		store.write_record(store.build_record(state, browser_snapshot))
+
+	finish_step('https://example.com/a', {'go_to_url': {'url': 'https://example.com/a', 'new_tab': False}})
+	file_system.get_file('todo.md').update_content('- [x] open a')
+	finish_step('https://example.com/b', {'click_element_by_index': {'index': 7}})
+
+	records = [json.loads(line) for line in store.file.read_text().splitlines()]
+	assert len(records) == 2
+	assert [h['state']['url'] for h in records[1]['history']] == ['https://example.com/b']  # only the new history item
+	assert list(records[1]['file_system']['changed_files']) == ['todo.md']  # only the changed file
+	assert records[1]['history'][0]['state']['screenshot']['path'].startswith(str(store.screenshots_dir))
+
+	# a record cut short by a crash is dropped
+	with open(store.file, 'a') as f:
+		f.write('{"version": 1, "n_steps": 4, "sta')
+
+	resumed_store = AgentCheckpointStore(tmp_path / 'checkpoint')
+	restored, restored_browser = resumed_store.load(output_model)
+
+	assert restored.n_steps == 3
+	assert [h.state.url for h in restored.history.history] == ['https://example.com/a', 'https://example.com/b']
+	assert restored.history.history[1].model_output.action[0].get_index() == 7
+	assert restored.last_model_output.action[0].get_index() == 7
+	assert restored.history.history[0].state.screenshot.data == b'https://example.com/a'
+	assert FileSystem.from_state(restored.file_system_state).get_file('todo.md').content == '- [x] open a'
+	assert restored_browser == browser_snapshot
+	assert len(store.file.read_text().splitlines()) == 2
+
+	# further checkpoints only append the new delta
+	finish_step_record = resumed_store.build_record(restored, None)
+	assert finish_step_record['history'] == [] and finish_step_record['file_system']['changed_files'] == {}
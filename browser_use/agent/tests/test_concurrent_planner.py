@@ -0,0 +1,85 @@
+"""
+Tests for Agent(concurrent_planner=True), where the planner runs alongside the main LLM call and its plan goes into a later step.
+"""
+
+import asyncio
+
+from browser_use import Agent
+from browser_use.llm.messages import UserMessage
+from browser_use.llm.views import ChatInvokeCompletion
+from browser_use.tracing import record_spans
+
+
+class FakeLLM:
+	provider = 'fake'
+	model = 'fake-1'
+	name = 'fake'
+	_verified_api_keys = True
+
+	def __init__(self, delay: float = 0.0, plans: list[str | Exception] | None = None):
+		self.delay = delay
+		self.plans = plans or []
+		self.calls = 0
+
+	async def ainvoke(self, messages, output_format=None):
+		self.calls += 1
+		await asyncio.sleep(self.delay)
+		plan = self.plans.pop(0)
+		if isinstance(plan, Exception):
+			raise plan
+		return ChatInvokeCompletion(completion=plan, usage=None)
+
+
+async def test_concurrent_planner_does_not_block_the_step_and_its_plan_goes_into_a_later_step():
+	planner = FakeLLM(delay=0.2, plans=['plan for step 1', RuntimeError('planner down')])
+	agent = Agent(task='find the docs', llm=FakeLLM(), planner_llm=planner, concurrent_planner=True)
+
+	async def get_planner_messages():
+		return [UserMessage(content='state')]
+
+	agent._get_planner_messages = get_planner_messages  # type: ignore[method-assign]
+
+	def assistant_messages() -> list[str]:
+		return [m.content for m in agent.message_manager.get_messages() if m.role == 'assistant']
+
+	examples = len(assistant_messages())
+
+	def plans() -> list[str]:
+		return assistant_messages()[examples:]
+
+	started = asyncio.get_running_loop().time()
+	await agent._start_concurrent_planner()
+	assert asyncio.get_running_loop().time() - started < 0.1
+
+	# next step comes around while the planner is still thinking: no plan yet, and no second planner run
+	agent._add_finished_plan()
+	await agent._start_concurrent_planner()
+	await asyncio.sleep(0.05)
+	assert planner.calls == 1 and plans() == []
+
+	await asyncio.sleep(0.3)
+	agent._add_finished_plan()
+	assert plans() == ['plan for step 1']
+
+	# a failed planner run is dropped instead of failing the step
+	await agent._start_concurrent_planner()
+	await asyncio.sleep(0.3)
+	agent._add_finished_plan()
+	assert planner.calls == 2 and plans() == ['plan for step 1']
+	assert agent._pending_plan is None
+
+
+async def test_concurrent_planner_spans_stay_out_of_the_step_that_started_it():
+	agent = Agent(task='find the docs', llm=FakeLLM(), planner_llm=FakeLLM(delay=0.1, plans=['plan']), concurrent_planner=True)
+
+	async def get_planner_messages():
+		return [UserMessage(content='state')]
+
+	agent._get_planner_messages = get_planner_messages  # type: ignore[method-assign]
+
+	with record_spans('step') as step_span:
+		await agent._start_concurrent_planner()
+	assert agent._pending_plan is not None
+	await agent._pending_plan
+
+	assert [span.name for span, _ in step_span.walk()] == ['step']
@@ -0,0 +1,83 @@
+"""
+Tests for the background history compaction into a memory digest.
+"""
+
+import asyncio
+
+from browser_use.agent.message_manager.compaction import DIGEST_PREFIX, HistoryCompactor
+from browser_use.agent.message_manager.views import HistoryItem
+from browser_use.llm.views import ChatInvokeCompletion
+from browser_use.tokens.estimator import TokenEstimator
+
+
+class FakeSummarizer:
+	provider = 'fake'
+	model = 'summarizer-1'
+	name = 'summarizer-1'
+
+	def __init__(self):
+		self.release = asyncio.Event()
+		self.inputs: list[str] = []
+
+	async def ainvoke(self, messages, output_format=None):
+		self.inputs.append(messages[-1].content)
+		await self.release.wait()
+		return ChatInvokeCompletion(completion=f'- digest #{len(self.inputs)}', usage=None)
+
+
+def _step(step: int) -> HistoryItem:
+	return HistoryItem(step_number=step, evaluation_previous_goal='ok', memory=f'found fact {step} ' * 20, next_goal='next')
+
+
+async def test_old_items_are_replaced_by_a_digest_without_blocking_the_step():
+	summarizer = FakeSummarizer()
+	compactor = HistoryCompactor(summarizer, token_budget=1_000)  # type: ignore[arg-type]
+	items = [HistoryItem(step_number=0, system_message='Agent initialized')]
+
+	step = 0
+	while not summarizer.inputs:
+		step += 1
+		items.append(_step(step))
+		compactor.update(items)
+		await asyncio.sleep(0)
+	assert 'found fact 1 ' in summarizer.inputs[0]
+
+	# the step loop keeps going while the summarizer is busy, with the full history
+	items.append(_step(step + 1))
+	compactor.update(items)
+	assert len(summarizer.inputs) == 1 and len(items) == step + 2
+
+	summarizer.release.set()
+	await asyncio.sleep(0)
+	compactor.update(items)
+	assert items[0].system_message == f'{DIGEST_PREFIX}\n- digest #1'
+	assert items[-1].step_number == step + 1
+	assert sum(len(item.to_string()) // 4 for item in items) <= 1_000
+
+	# the digest rolls into the next compaction
+	while len(summarizer.inputs) == 1:
+		step += 1
+		items.append(_step(step + 1))
+		compactor.update(items)
+		await asyncio.sleep(0)
+	assert summarizer.inputs[1].startswith(f'<sys>\n{DIGEST_PREFIX}\n- digest #1')
+	compactor.cancel()
+
+
+async def test_history_is_measured_with_the_agent_models_token_estimator():
+	items = [_step(step) for step in range(1, 11)]
+	tokens = sum(TokenEstimator().count_text(item.to_string()) for item in items)
+
+	summarizer = FakeSummarizer()
+	HistoryCompactor(summarizer, token_budget=tokens + 100).update(items)  # type: ignore[arg-type]
+	await asyncio.sleep(0)
+	assert summarizer.inputs == []
+
+	# the provider bills twice what the byte ratio estimates, the same history is now over budget
+	estimator = TokenEstimator()
+	estimator.correction = 2.0
+	compactor = HistoryCompactor(summarizer, token_budget=tokens + 100, token_estimator=estimator)  # type: ignore[arg-type]
+	compactor.update(items)
+	await asyncio.sleep(0)
+	assert len(summarizer.inputs) == 1
+	compactor.cancel()
@@ -0,0 +1,49 @@
+"""
+Tests for the incrementally built agent history description in the message manager.
+"""
+
+from browser_use.agent.message_manager.service import MessageManager
+from browser_use.agent.message_manager.views import HistoryItem, MessageManagerState
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.messages import SystemMessage
+
+
+def _message_manager(tmp_path, max_history_items: int | None) -> MessageManager:
+	return MessageManager(
+		task='find the docs',
+		system_message=SystemMessage(content='system'),
+		file_system=FileSystem(tmp_path),
+		state=MessageManagerState(),
+		max_history_items=max_history_items,
+	)
+
+
+def test_each_history_item_is_rendered_once_and_the_description_is_unchanged(tmp_path, monkeypatch):
+	renders = []
+	original_render = HistoryItem._render
+	monkeypatch.setattr(HistoryItem, '_render', lambda item: renders.append(item.step_number) or original_render(item))
+
+	unlimited = _message_manager(tmp_path / 'unlimited', max_history_items=None)
+	windowed = _message_manager(tmp_path / 'windowed', max_history_items=6)
+	assert unlimited.agent_history_description == windowed.agent_history_description == '<sys>\nAgent initialized\n</sys>'
+
+	for step in range(1, 21):
+		for message_manager in (unlimited, windowed):
+			message_manager.state.agent_history_items.append(
+				HistoryItem(step_number=step, evaluation_previous_goal='ok', memory=f'memory {step}', next_goal='next')
+			)
+			items = message_manager.state.agent_history_items
+			expected = '\n'.join(original_render(item) for item in items)
+			if message_manager.max_history_items and len(items) > message_manager.max_history_items:
+				kept = [items[0], *items[-5:]]
+				expected = '\n'.join(
+					[original_render(kept[0]), f'<sys>[... {len(items) - 6} previous steps omitted...]</sys>']
+					+ [original_render(item) for item in kept[1:]]
+				)
+			renders.clear()
+			assert message_manager.agent_history_description == expected
+			assert renders == [step]  # only the new item was rendered
+
+	# replacing the history (e.g. restoring a saved state) starts over
+	unlimited.state.agent_history_items = [HistoryItem(step_number=0, system_message='Agent initialized')]
+	assert unlimited.agent_history_description == '<sys>\nAgent initialized\n</sys>'
@@ -0,0 +1,103 @@
+"""
+Tests for resizing / re-encoding / cropping screenshots before they are sent to the LLM.
+"""
+
+import io
+
+from PIL import Image, ImageDraw
+
+from browser_use.agent.image_preprocessing import (
+	ImagePreprocessing,
+	ImageSizeLimit,
+	preprocess_screenshot,
+	preprocess_state_screenshot,
+)
+from browser_use.agent.prompts import AgentMessagePrompt
+from browser_use.browser.views import BrowserStateSummary, Screenshot, TabInfo
+from browser_use.dom.views import CoordinateSet, DOMElementNode, ViewportInfo
+from browser_use.filesystem.file_system import FileSystem
+
+
+def _png(width: int, height: int, box_color: str = 'white') -> Screenshot:
+	image = Image.new('RGB', (width, height), 'white')
+	ImageDraw.Draw(image).rectangle((width // 4, height // 4, width // 2, height // 2), fill=box_color)
+	buffer = io.BytesIO()
+	image.save(buffer, format='PNG')
+	return Screenshot(data=buffer.getvalue())
+
+
+def _size(screenshot: Screenshot) -> tuple[int, int]:
+	return Image.open(io.BytesIO(screenshot.data)).size
+
+
+def _browser_state(screenshot: Screenshot) -> BrowserStateSummary:
+	button = DOMElementNode(
+		tag_name='button',
+		xpath='/body/button',
+		attributes={},
+		children=[],
+		is_visible=True,
+		is_interactive=True,
+		is_in_viewport=True,
+		highlight_index=1,
+		viewport_coordinates=CoordinateSet.from_rect(x=200, y=100, width=300, height=50),
+		parent=None,
+	)
+	body = DOMElementNode(
+		tag_name='body',
+		xpath='/body',
+		attributes={},
+		children=[button],
+		is_visible=True,
+		viewport_info=ViewportInfo(width=1280, height=1100),
+		parent=None,
+	)
+	return BrowserStateSummary(
+		element_tree=body,
+		selector_map={1: button},
+		url='https://example.com',
+		title='Example',
+		tabs=[TabInfo(page_id=1, url='https://example.com', title='Example')],
+		screenshot=screenshot,
+	)
+
+
+def test_screenshots_are_resized_for_the_provider_and_encoded_once():
+	screenshot = _png(1280, 1100)
+	preprocessing = ImagePreprocessing().for_provider('openai')
+	assert preprocessing.size_limit == ImageSizeLimit(max_long_edge=2048, max_short_edge=768)
+
+	variant = preprocess_screenshot(screenshot, preprocessing)
+	assert variant.media_type == 'image/jpeg'
+	assert _size(variant) == (893, 768)
+	assert preprocess_screenshot(screenshot, preprocessing) is variant  # cached on the screenshot
+
+	anthropic = preprocess_screenshot(screenshot, ImagePreprocessing(format='webp').for_provider('anthropic'))
+	assert anthropic.media_type == 'image/webp'
+	width, height = _size(anthropic)
+	assert width <= 1568 and width * height <= 1_150_000
+
+	# nothing to resize or re-encode: the screenshot is sent as is
+	assert preprocess_screenshot(screenshot, ImagePreprocessing(format='png').for_provider('ollama')) is screenshot
+
+
+def test_current_screenshot_is_cropped_to_the_highlighted_elements(tmp_path):
+	screenshot = _png(2560, 2200)  # device scale factor 2
+	browser_state = _browser_state(screenshot)
+	preprocessing = ImagePreprocessing(crop_to_highlights=True, crop_padding=50).for_provider('anthropic')
+
+	cropped = preprocess_state_screenshot(browser_state, preprocessing)
+	assert cropped is not None
+	assert _size(cropped) == (2 * 400, 2 * 150)
+
+	# the prompt sends the cached variant for the current screenshot and re-uses it once it is a previous screenshot
+	previous = _png(1280, 1100, box_color='black')
+	message = AgentMessagePrompt(
+		browser_state_summary=browser_state,
+		file_system=FileSystem(tmp_path),
+		screenshots=[previous, screenshot],
+		image_preprocessing=preprocessing,
+	).get_user_message(use_vision=True)
+	images = [part.image_url for part in message.content if part.type == 'image_url']  # type: ignore[union-attr]
+	assert [image.url for image in images] == [preprocess_screenshot(previous, preprocessing).data_url, cropped.data_url]
+	assert [image.media_type for image in images] == ['image/jpeg', 'image/jpeg']
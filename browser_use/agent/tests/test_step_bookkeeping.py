@@ -0,0 +1,165 @@
+"""
+Tests for the step bookkeeping (screenshot spilling, checkpoint, CreateAgentStepEvent) that runs in the background
+while the next step captures the browser state.
+"""
+
+import gc
+import tempfile
+import time
+from pathlib import Path
+
+from browser_use import Agent
+from browser_use.agent.views import ActionResult, AgentHistory, AgentStepInfo
+from browser_use.browser.views import BrowserStateHistory, BrowserStateSummary, Screenshot, TabInfo
+from browser_use.dom.views import DOMElementNode
+
+
+class FakeLLM:
+	provider = 'fake'
+	model = 'fake-1'
+	name = 'fake'
+	_verified_api_keys = True
+
+	async def ainvoke(self, messages, output_format=None):
+		raise AssertionError('get_next_action is replaced in this test')
+
+
+class FakePage:
+	url = 'https://example.com/'
+
+
+class SlowCheckpointStore:
+	"""Records the order checkpoints are written in, each write takes a while"""
+
+	def __init__(self, log: list[tuple[str, int]]):
+		self.log = log
+		self.file = 'checkpoint.jsonl'
+
+	def build_record(self, state, browser_snapshot):
+		return {'n_steps': state.n_steps}
+
+	def write_record(self, record):
+		time.sleep(0.05)
+		self.log.append(('checkpoint', record['n_steps']))
+
+
+async def test_step_bookkeeping_is_out_before_the_next_step_builds_its_messages():
+	log: list[tuple[str, int]] = []
+	agent = Agent(task='find the docs', llm=FakeLLM())  # type: ignore[arg-type]
+	agent._checkpoint_store = SlowCheckpointStore(log)  # type: ignore[assignment]
+
+	async def get_state_summary(cache_clickable_elements_hashes: bool = False):
+		log.append(('state', agent.state.n_steps))
+		return BrowserStateSummary(
+			element_tree=DOMElementNode(tag_name='body', xpath='/body', attributes={}, children=[], is_visible=True, parent=None),
+			selector_map={},
+			url='https://example.com/',
+			title='Example',
+			tabs=[TabInfo(page_id=1, url='https://example.com/', title='Example')],
+		)
+
+	async def get_current_page():
+		return FakePage()
+
+	async def recycle_if_over_memory_budget():
+		return False
+
+	browser_session = agent.browser_session
+	assert browser_session is not None
+	object.__setattr__(browser_session, 'get_state_summary', get_state_summary)
+	object.__setattr__(browser_session, 'get_current_page', get_current_page)
+	object.__setattr__(browser_session, 'recycle_if_over_memory_budget', recycle_if_over_memory_budget)
+
+	add_state_message = agent._message_manager.add_state_message
+
+	def record_add_state_message(**kwargs):
+		log.append(('messages', agent.state.n_steps))
+		add_state_message(**kwargs)
+
+	async def get_next_action(input_messages):
+		return agent.AgentOutput.model_validate(
+			{'evaluation_previous_goal': '', 'memory': '', 'next_goal': '', 'action': [{'go_back': {}}]}
+		)
+
+	async def multi_act(actions, executed_results=None):
+		return [ActionResult(extracted_content='went back')]
+
+	def slow_spill_old_screenshots():
+		time.sleep(0.1)  # runs in a worker thread, like writing screenshots to disk
+
+	agent._message_manager.add_state_message = record_add_state_message  # type: ignore[method-assign]
+	agent.get_next_action = get_next_action  # type: ignore[method-assign]
+	agent.multi_act = multi_act  # type: ignore[method-assign]
+	agent._spill_old_screenshots = slow_spill_old_screenshots  # type: ignore[method-assign]
+	object.__setattr__(agent.eventbus, 'dispatch', lambda event: log.append(('event', event.step)))
+
+	for step in range(3):
+		await agent.step(AgentStepInfo(step_number=step, max_steps=10))
+	await agent._wait_for_step_bookkeeping()
+
+	assert log == [
+		('state', 1),
+		('messages', 1),
+		# step 1 finished as n_steps=2, the next state capture overlaps with its bookkeeping
+		('state', 2),
+		('checkpoint', 2),
+		('event', 2),
+		('messages', 2),
+		('state', 3),
+		('checkpoint', 3),
+		('event', 3),
+		('messages', 3),
+		('checkpoint', 4),
+		('event', 4),
+	]
+	# the step numbers of the events match the history even though the bookkeeping lagged behind
+	assert [h.metadata.step_number for h in agent.state.history.history if h.metadata] == [2, 3, 4]
+	assert agent.state.n_steps == 4
+
+
+def _history_item(screenshot: Screenshot) -> AgentHistory:
+	return AgentHistory(
+		model_output=None,
+		result=[],
+		state=BrowserStateHistory(url='https://example.com/', title='', tabs=[], interacted_element=[], screenshot=screenshot),
+	)
+
+
+async def test_default_screenshots_dir_lives_as_long_as_the_history(tmp_path):
+	agent = Agent(task='find the docs', llm=FakeLLM())  # type: ignore[arg-type]
+	for i in range(3):
+		agent.state.history.history.append(_history_item(Screenshot(data=f'screenshot {i}'.encode())))
+	agent._spill_old_screenshots()  # the last one is still needed in memory
+	screenshots_dir = agent.screenshots_dir
+	assert screenshots_dir.parent == Path(tempfile.gettempdir()) and len(list(screenshots_dir.iterdir())) == 2
+
+	# close() (called by run()) leaves the spilled screenshots on disk, the caller may still read the history
+	await agent.close()
+	history = agent.state.history
+	assert [s.is_spilled for s in history.screenshots() if s] == [True, True, False]
+	assert [s.data for s in history.screenshots() if s] == [b'screenshot 0', b'screenshot 1', b'screenshot 2']
+
+	# the dir goes away with the last reference to the history
+	del agent
+	gc.collect()
+	assert screenshots_dir.exists()
+	del history
+	gc.collect()
+	assert not screenshots_dir.exists()
+
+	# or right away on request
+	agent = Agent(task='find the docs', llm=FakeLLM())  # type: ignore[arg-type]
+	agent.state.history.history.extend([_history_item(Screenshot(data=b'old')), _history_item(Screenshot(data=b'new'))])
+	agent._spill_old_screenshots()
+	assert agent.screenshots_dir.exists()
+	agent.delete_spilled_screenshots()
+	assert not agent.screenshots_dir.exists()
+
+	# screenshots_dir set by the user is left alone
+	agent = Agent(task='find the docs', llm=FakeLLM(), screenshots_dir=tmp_path)  # type: ignore[arg-type]
+	agent.state.history.history.extend([_history_item(Screenshot(data=b'old')), _history_item(Screenshot(data=b'new'))])
+	agent._spill_old_screenshots()
+	agent.delete_spilled_screenshots()
+	del agent
+	gc.collect()
+	assert len(list(tmp_path.iterdir())) == 1
@@ -0,0 +1,152 @@
+"""
+Tests for Agent(stream_actions=True) and the incremental action parser it uses.
+"""
+
+import asyncio
+import json
+
+from browser_use import Agent
+from browser_use.agent.streaming import StreamingActionParser
+from browser_use.agent.views import ActionResult, AgentOutput, AgentStepInfo
+from browser_use.browser.views import BrowserStateSummary, TabInfo
+from browser_use.controller.service import Controller
+from browser_use.dom.views import DOMElementNode
+from browser_use.llm.exceptions import ModelProviderError
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamChunk, ChatInvokeUsage
+
+
+def _agent_output_type() -> type[AgentOutput]:
+	return AgentOutput.type_with_custom_actions(Controller().registry.create_action_model())
+
+
+def test_parser_emits_each_action_once_its_json_is_complete():
+	output_format = _agent_output_type()
+	response = json.dumps(
+		{
+			'thinking': 'the "action" key in a string {[ must not confuse the parser',
+			'evaluation_previous_goal': 'ok',
+			'memory': 'm',
+			'next_goal': 'click the button',
+			'action': [
+				{'click_element_by_index': {'index': 3}},
+				{'input_text': {'index': 5, 'text': 'he said \\"hi\\" }]'}},
+			],
+		}
+	)
+
+	parser = StreamingActionParser(output_format)
+	emitted_at: list[tuple[int, str]] = []
+	for pos, char in enumerate(response):
+		for action in parser.feed(char):
+			emitted_at.append((pos, next(iter(action.model_dump(exclude_unset=True)))))
+
+	assert [name for _, name in emitted_at] == ['click_element_by_index', 'input_text']
+	# the first action is available long before the response is complete
+	assert emitted_at[0][0] < response.index('input_text')
+	assert parser.actions[0].get_index() == 3
+
+	# the streamed actions match what the full response parses to
+	full = output_format.model_validate_json(response)
+	assert [a.model_dump(exclude_unset=True) for a in parser.actions] == [a.model_dump(exclude_unset=True) for a in full.action]
+
+
+def test_parser_stops_at_the_first_invalid_action():
+	parser = StreamingActionParser(_agent_output_type())
+	actions = parser.feed('{"memory": "", "action": [{"not_an_action": {}}, {"go_back": {}}]}')
+	assert actions == []
+	assert parser.failed
+
+
+RESPONSE = json.dumps(
+	{'evaluation_previous_goal': '', 'memory': '', 'next_goal': '', 'action': [{'click_element_by_index': {'index': 3}}]}
+)
+
+
+class FakeStreamingLLM:
+	provider = 'fake'
+	model = 'fake-1'
+	name = 'fake'
+	_verified_api_keys = True
+
+	def __init__(self, fail_after_response: bool = False):
+		self.fail_after_response = fail_after_response
+
+	async def ainvoke(self, messages, output_format=None):
+		raise AssertionError('the streaming path must not call ainvoke()')
+
+	async def astream(self, messages, output_format=None):
+		for i in range(0, len(RESPONSE), 16):
+			await asyncio.sleep(0.005)
+			yield ChatInvokeStreamChunk(delta=RESPONSE[i : i + 16])
+		if self.fail_after_response:
+			raise ModelProviderError('connection reset', model=self.name)
+		usage = ChatInvokeUsage(
+			prompt_tokens=1200,
+			prompt_cached_tokens=None,
+			prompt_cache_creation_tokens=None,
+			prompt_image_tokens=None,
+			completion_tokens=40,
+			total_tokens=1240,
+		)
+		yield ChatInvokeStreamChunk(
+			completion=ChatInvokeCompletion(completion=output_format.model_validate_json(RESPONSE), usage=usage)
+		)
+
+
+def _streaming_agent(llm: FakeStreamingLLM) -> tuple[Agent, list[str]]:
+	agent = Agent(task='click the button', llm=llm, stream_actions=True)  # type: ignore[arg-type]
+	executed: list[str] = []
+
+	async def get_state_summary(cache_clickable_elements_hashes: bool = False):
+		return BrowserStateSummary(
+			element_tree=DOMElementNode(tag_name='body', xpath='/body', attributes={}, children=[], is_visible=True, parent=None),
+			selector_map={},
+			url='https://example.com/',
+			title='Example',
+			tabs=[TabInfo(page_id=1, url='https://example.com/', title='Example')],
+		)
+
+	async def get_current_page():
+		return type('FakePage', (), {'url': 'https://example.com/'})()
+
+	async def recycle_if_over_memory_budget():
+		return False
+
+	async def execute_streamed_action(action):
+		executed.append(next(iter(action.model_dump(exclude_unset=True))))
+		return ActionResult(extracted_content='clicked the button', include_in_memory=True)
+
+	browser_session = agent.browser_session
+	assert browser_session is not None
+	object.__setattr__(browser_session, 'get_state_summary', get_state_summary)
+	object.__setattr__(browser_session, 'get_current_page', get_current_page)
+	object.__setattr__(browser_session, 'recycle_if_over_memory_budget', recycle_if_over_memory_budget)
+	agent._execute_streamed_action = execute_streamed_action  # type: ignore[method-assign]
+	object.__setattr__(agent.eventbus, 'dispatch', lambda event: None)
+	return agent, executed
+
+
+async def test_streamed_step_usage_is_tracked_with_its_estimate():
+	agent, executed = _streaming_agent(FakeStreamingLLM())
+
+	await agent.step(AgentStepInfo(step_number=0, max_steps=10))
+	await agent._wait_for_step_bookkeeping()
+
+	assert executed == ['click_element_by_index']
+	(usage,) = agent.token_cost_service.usage_history
+	assert (usage.model, usage.usage.prompt_tokens, usage.usage.completion_tokens) == ('fake-1', 1200, 40)
+	assert usage.estimated_prompt_tokens  # a sample for calibrating the token estimator
+
+
+async def test_action_executed_before_the_stream_failed_is_kept_in_the_step_result():
+	agent, executed = _streaming_agent(FakeStreamingLLM(fail_after_response=True))
+
+	await agent.step(AgentStepInfo(step_number=0, max_steps=10))
+	await agent._wait_for_step_bookkeeping()
+
+	assert executed == ['click_element_by_index']
+	clicked, failed = agent.state.last_result
+	assert clicked.extracted_content == 'clicked the button'
+	assert failed.error and 'connection reset' in failed.error
+	assert agent.state.history.history[-1].result == agent.state.last_result
+	assert agent._interrupted_stream_results == []
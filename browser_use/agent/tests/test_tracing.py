@@ -0,0 +1,121 @@
+"""
+Tests for the per-step timing spans and the trace exporters.
+"""
+
+import asyncio
+import json
+
+from browser_use.agent.views import AgentHistory, AgentHistoryList, StepMetadata
+from browser_use.browser.views import BrowserStateHistory
+from browser_use.tracing import record_spans, to_chrome_trace, to_otel_json, trace_span
+from browser_use.utils import time_execution_async
+
+
+@time_execution_async('--fake_llm_call')
+async def fake_llm_call() -> str:
+	await asyncio.sleep(0.01)
+	return 'done'
+
+
+async def test_spans_nest_and_concurrent_children_get_their_own_trace_row(tmp_path):
+	with trace_span('outside_of_a_step') as ignored:
+		assert ignored is None
+
+	with record_spans('step', step=1) as step:
+		with trace_span('prompt_build'):
+			pass
+		await fake_llm_call()
+
+		async def action(index: int) -> None:
+			with trace_span('action', index=index):
+				await asyncio.sleep(0.01)
+
+		await asyncio.gather(action(0), action(1))
+
+	assert [(span.name, depth) for span, depth in step.walk()] == [
+		('step', 0),
+		('prompt_build', 1),
+		('fake_llm_call', 1),
+		('action', 1),
+		('action', 1),
+	]
+	assert all(span.end_time is not None for span, _ in step.walk())
+	assert step.summary()['action'] > 0.015
+
+	chrome = to_chrome_trace([step])
+	events = [event for event in chrome['traceEvents'] if event['ph'] == 'X']
+	assert len(events) == 5
+	action_rows = {event['tid'] for event in events if event['name'] == 'action'}
+	assert len(action_rows) == 2  # overlapping siblings can't share a row
+
+	otel = to_otel_json([step])
+	otel_spans = otel['resourceSpans'][0]['scopeSpans'][0]['spans']
+	root = next(span for span in otel_spans if 'parentSpanId' not in span)
+	assert root['name'] == 'step'
+	assert {span['parentSpanId'] for span in otel_spans if span is not root} == {root['spanId']}
+	assert len({span['traceId'] for span in otel_spans}) == 1
+
+	history = AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=None,
+				result=[],
+				state=BrowserStateHistory(url='', title='', tabs=[], interacted_element=[]),
+				metadata=StepMetadata(step_number=1, step_start_time=step.start_time, step_end_time=step.end_time, spans=[step]),
+			)
+		]
+	)
+	trace_file = history.save_trace(tmp_path / 'trace.json')
+	assert len(json.loads(trace_file.read_text())['traceEvents']) == 6
+	loaded = AgentHistoryList.model_validate(history.model_dump())
+	assert loaded.history[0].metadata.spans[0].children[2].attributes == {'index': 0}
+
+
+async def test_streamed_llm_call_is_traced_next_to_the_early_action():
+	from browser_use import Agent
+	from browser_use.agent.views import ActionResult
+	from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamChunk
+
+	response = json.dumps(
+		{'evaluation_previous_goal': '', 'memory': '', 'next_goal': '', 'action': [{'go_back': {}}, {'go_back': {}}]}
+	)
+
+	class FakeStreamingLLM:
+		provider = 'fake'
+		model = 'fake-1'
+		name = 'fake'
+		_verified_api_keys = True
+
+		async def ainvoke(self, messages, output_format=None):
+			raise AssertionError('the streaming path must not call ainvoke()')
+
+		async def astream(self, messages, output_format=None):
+			for i in range(0, len(response), 16):
+				await asyncio.sleep(0.005)
+				yield ChatInvokeStreamChunk(delta=response[i : i + 16])
+			yield ChatInvokeStreamChunk(
+				completion=ChatInvokeCompletion(completion=output_format.model_validate_json(response), usage=None)
+			)
+
+	agent = Agent(task='go back', llm=FakeStreamingLLM())  # type: ignore[arg-type]
+
+	async def execute_streamed_action(action):
+		with trace_span('action', index=0):
+			await asyncio.sleep(0.01)
+		return ActionResult(extracted_content='went back')
+
+	agent._execute_streamed_action = execute_streamed_action  # type: ignore[method-assign]
+
+	with record_spans('step', step=1) as step:
+		model_output, executed_results = await agent.get_next_action_streaming([])
+
+	assert len(model_output.action) == 2 and len(executed_results) == 1
+	assert [(span.name, depth) for span, depth in step.walk()] == [
+		('step', 0),
+		('get_next_action_streaming', 1),
+		('llm_call', 2),
+		('action', 2),
+	]
+	llm_call, action = step.children[0].children
+	assert llm_call.attributes == {'model': 'fake-1', 'messages': 0, 'streaming': True}
+	assert action.start_time < llm_call.end_time  # the action ran while the response was still streaming
@@ -0,0 +1,138 @@
+"""
+Tests for replaying recorded histories (Agent.rerun_history) in turbo mode and the direct element matching it uses.
+"""
+
+from browser_use import Agent
+from browser_use.agent.views import ActionResult, AgentHistory, AgentHistoryList
+from browser_use.browser.views import BrowserStateHistory, BrowserStateSummary
+from browser_use.dom.history_tree_processor.service import HistoryTreeProcessor
+from browser_use.dom.views import DOMElementNode
+
+
+class FakeLLM:
+	provider = 'fake'
+	model = 'fake-1'
+	name = 'fake'
+	_verified_api_keys = True
+
+	async def ainvoke(self, messages, output_format=None):
+		raise AssertionError('replays never call the LLM')
+
+
+def _node(
+	tag: str, xpath: str, parent: DOMElementNode | None, highlight_index: int | None = None, **attributes
+) -> DOMElementNode:
+	node = DOMElementNode(
+		is_visible=True,
+		parent=parent,
+		tag_name=tag,
+		xpath=xpath,
+		attributes=attributes,
+		children=[],
+		highlight_index=highlight_index,
+	)
+	if parent is not None:
+		parent.children.append(node)
+	return node
+
+
+def _page(button_index: int) -> tuple[DOMElementNode, dict[int, DOMElementNode]]:
+	root = _node('body', 'html/body', None)
+	form = _node('form', 'html/body/form', root)
+	search = _node('input', 'html/body/form/input', form, highlight_index=0, name='q')
+	button = _node('button', 'html/body/form/button', form, highlight_index=button_index, type='submit')
+	selector_map = {0: search, button_index: button}
+	if button_index != 1:
+		selector_map[1] = _node('a', 'html/body/a', root, highlight_index=1, href='/new-banner')
+	return root, selector_map
+
+
+def test_recorded_element_is_found_in_the_selector_map_even_if_its_index_moved():
+	_, recorded_selector_map = _page(button_index=1)
+	recorded_button = HistoryTreeProcessor.convert_dom_element_to_history_element(recorded_selector_map[1])
+
+	# same page: the element at the recorded index matches right away
+	tree, selector_map = _page(button_index=1)
+	assert HistoryTreeProcessor.find_history_element_in_selector_map(recorded_button, selector_map) is selector_map[1]
+
+	# a new element took the recorded index, the button moved to index 2
+	tree, selector_map = _page(button_index=2)
+	found = HistoryTreeProcessor.find_history_element_in_selector_map(recorded_button, selector_map)
+	assert found is selector_map[2]
+	assert found is HistoryTreeProcessor.find_history_element_in_tree(recorded_button, tree)
+
+	# element is gone
+	del selector_map[2]
+	assert HistoryTreeProcessor.find_history_element_in_selector_map(recorded_button, selector_map) is None
+
+
+def _checkout_page(confirm_index: int | None) -> tuple[DOMElementNode, dict[int, DOMElementNode]]:
+	"""The checkout form, with the confirm button its submit button renders once the order went through"""
+	root = _node('body', 'html/body', None)
+	form = _node('form', 'html/body/form', root)
+	selector_map = {
+		0: _node('input', 'html/body/form/input', form, highlight_index=0, name='coupon'),
+		1: _node('button', 'html/body/form/button', form, highlight_index=1, type='submit'),
+	}
+	if confirm_index is not None:
+		selector_map[confirm_index] = _node('button', 'html/body/button', root, highlight_index=confirm_index, id='confirm')
+	return root, selector_map
+
+
+async def test_turbo_replay_probes_again_after_a_dom_change_and_retries_only_the_failed_action():
+	agent = Agent(task='check out', llm=FakeLLM())  # type: ignore[arg-type]
+	object.__setattr__(agent.eventbus, 'dispatch', lambda event: None)
+
+	_, recorded = _checkout_page(confirm_index=2)
+	step = AgentHistory(
+		model_output=agent.AgentOutput.model_validate(
+			{
+				'evaluation_previous_goal': '',
+				'memory': '',
+				'next_goal': 'apply the coupon and confirm',
+				'action': [
+					{'input_text': {'index': 0, 'text': 'SAVE10'}},
+					{'click_element_by_index': {'index': 1}},
+					{'click_element_by_index': {'index': 2}},
+				],
+			}
+		),
+		result=[],
+		state=BrowserStateHistory(
+			url='https://shop.example.com/checkout',
+			title='Checkout',
+			tabs=[],
+			interacted_element=[HistoryTreeProcessor.convert_dom_element_to_history_element(recorded[i]) for i in range(3)],
+		),
+	)
+
+	# the confirm button isn't rendered yet when the page is first probed again, and shows up at a new index after that
+	probes = [_checkout_page(confirm_index=None), _checkout_page(confirm_index=None), _checkout_page(confirm_index=5)]
+	dom_changed = False
+	acted: list[tuple[str, int | None]] = []
+
+	async def get_replay_state(include_dom: bool = True, **kwargs):
+		nonlocal dom_changed
+		dom_changed = False
+		tree, selector_map = probes.pop(0)
+		return BrowserStateSummary(element_tree=tree, selector_map=selector_map, url='', title='', tabs=[])
+
+	async def replay_dom_changed():
+		return dom_changed
+
+	async def act(action, **kwargs):
+		nonlocal dom_changed
+		name = next(iter(action.model_dump(exclude_unset=True)))
+		acted.append((name, action.get_index()))
+		dom_changed = dom_changed or name == 'click_element_by_index'  # typing doesn't add/remove elements
+		return ActionResult(extracted_content=name)
+
+	object.__setattr__(agent.browser_session, 'get_replay_state', get_replay_state)
+	object.__setattr__(agent.browser_session, 'replay_dom_changed', replay_dom_changed)
+	object.__setattr__(agent.controller, 'act', act)
+
+	results = await agent.rerun_history(AgentHistoryList(history=[step]), turbo=True)
+
+	assert acted == [('input_text', 0), ('click_element_by_index', 1), ('click_element_by_index', 5)]
+	assert [result.extracted_content for result in results] == ['input_text', 'click_element_by_index', 'click_element_by_index']
+	assert probes == []
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import json
 import traceback
 from dataclasses import dataclass
@@ -11,8 +12,9 @@ from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model
 from typing_extensions import TypeVar
 from uuid_extensions import uuid7str
 
+from browser_use.agent.image_preprocessing import ImagePreprocessing
 from browser_use.agent.message_manager.views import MessageManagerState
-from browser_use.browser.views import BrowserStateHistory
+from browser_use.browser.views import BrowserStateHistory, Screenshot
 from browser_use.controller.registry.views import ActionModel
 from browser_use.dom.history_tree_processor.service import (
 	DOMElementNode,
@@ -23,6 +25,7 @@ from browser_use.dom.views import SelectorMap
 from browser_use.filesystem.file_system import FileSystemState
 from browser_use.llm.base import BaseChatModel
 from browser_use.tokens.views import UsageSummary
+from browser_use.tracing import TimingSpan, TraceFormat, save_trace
 
 
 class AgentSettings(BaseModel):
@@ -55,11 +58,21 @@ class AgentSettings(BaseModel):
 	max_actions_per_step: int = 10
 	use_thinking: bool = True
 	max_history_items: int = 40
+	history_compaction_llm: BaseChatModel | None = None  # summarizes old history items in the background, see HistoryCompactor
+	history_compaction_budget: int = 8_000  # estimated tokens of history items before the oldest ones get summarized
 	images_per_step: int = 1
+	image_preprocessing: ImagePreprocessing | None = None  # resize / re-encode screenshots for the LLM's provider
+	max_input_tokens: int | None = None  # locally estimated budget per request, the state message is trimmed to fit
+	# where screenshots of past steps are spilled to, defaults to a per-agent temp dir deleted with the history
+	screenshots_dir: str | Path | None = None
+	stream_actions: bool = False  # execute the first action as soon as it's streamed, while the LLM is still generating
+	# directory to append a checkpoint to after every step, see Agent.resume_from_checkpoint()
+	checkpoint_path: str | Path | None = None
 
 	page_extraction_llm: BaseChatModel | None = None
 	planner_llm: BaseChatModel | None = None
 	planner_interval: int = 1  # Run planner every N steps
+	concurrent_planner: bool = False  # run the planner alongside the main LLM call, its plan is added to the next step
 	is_planner_reasoning: bool = False  # type: ignore
 	extend_planner_system_message: str | None = None
 	calculate_cost: bool = False
@@ -137,6 +150,7 @@ class StepMetadata(BaseModel):
 	step_start_time: float
 	step_end_time: float
 	step_number: int
+	spans: list[TimingSpan] = Field(default_factory=list)  # nested timings of the step's stages, see browser_use.tracing
 
 	@property
 	def duration_seconds(self) -> float:
@@ -175,6 +189,7 @@ class AgentOutput(BaseModel):
 		)
 
 	@staticmethod
+	@functools.lru_cache(maxsize=128)  # Registry.create_action_model() returns the same type for the same actions
 	def type_with_custom_actions(custom_actions: type[ActionModel]) -> type[AgentOutput]:
 		"""Extend actions with custom actions"""
 
@@ -191,6 +206,7 @@ class AgentOutput(BaseModel):
 		return model_
 
 	@staticmethod
+	@functools.lru_cache(maxsize=128)
 	def type_with_custom_actions_no_thinking(custom_actions: type[ActionModel]) -> type[AgentOutput]:
 		"""Extend actions with custom actions and exclude thinking field"""
 
@@ -303,6 +319,10 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 		except Exception as e:
 			raise e
 
+	def save_trace(self, filepath: str | Path, format: TraceFormat = 'chrome') -> Path:
+		"""Save the timing spans of all steps as a Chrome trace (chrome://tracing, Perfetto) or OpenTelemetry JSON file"""
+		return save_trace([span for h in self.history if h.metadata for span in h.metadata.spans], filepath, format=format)
+
 	# def save_as_playwright_script(
 	# 	self,
 	# 	output_path: str | Path,
@@ -346,6 +366,11 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 		"""Load history from JSON file"""
 		with open(filepath, encoding='utf-8') as f:
 			data = json.load(f)
+		return cls.load_from_dict(data, output_model)
+
+	@classmethod
+	def load_from_dict(cls, data: dict[str, Any], output_model: type[AgentOutput]) -> AgentHistoryList:
+		"""Load history from a dict produced by model_dump()"""
 		# loop through history and validate output_model actions to enrich with custom actions
 		for h in data['history']:
 			if h['model_output']:
@@ -403,8 +428,8 @@ class AgentHistoryList(BaseModel, Generic[AgentStructuredOutput]):
 		"""Get all unique URLs from history"""
 		return [h.state.url if h.state.url is not None else None for h in self.history]
 
-	def screenshots(self, n_last: int | None = None, return_none_if_not_screenshot: bool = True) -> list[str | None]:
-		"""Get all screenshots from history"""
+	def screenshots(self, n_last: int | None = None, return_none_if_not_screenshot: bool = True) -> list[Screenshot | None]:
+		"""Get all screenshots from history (use .base64 / .data_url / .data on each Screenshot for the encoding you need)"""
 		if n_last == 0:
 			return []
 		if n_last is None:
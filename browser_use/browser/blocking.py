@@ -0,0 +1,252 @@
+"""
+Context-level request blocking for BrowserSession.
+
+Blocking rules from BrowserProfile.block_resources / BrowserProfile.blocked_domains are compiled once into
+a domain-suffix trie + a set of playwright resource types, so the per-request cost of deciding whether to
+abort a request only depends on the number of labels in its hostname, not on the number of rules.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable
+from urllib.parse import urlsplit
+
+from browser_use.browser.profile import BlockedResourceClass
+from browser_use.browser.types import Route
+
+logger = logging.getLogger(__name__)
+
+# Third-party ad networks, analytics/trackers, chat widgets and push notification vendors.
+# Every entry also matches all of its subdomains (e.g. doubleclick.net matches stats.g.doubleclick.net).
+AD_AND_TRACKER_DOMAINS = [
+	# Ad networks
+	'doubleclick.net',
+	'googlesyndication.com',
+	'googleadservices.com',
+	'adservice.google.com',
+	'amazon-adsystem.com',
+	'adnxs.com',
+	'adsrvr.org',
+	'advertising.com',
+	'criteo.com',
+	'criteo.net',
+	'taboola.com',
+	'outbrain.com',
+	'rubiconproject.com',
+	'pubmatic.com',
+	'openx.net',
+	'casalemedia.com',
+	'moatads.com',
+	'media.net',
+	'smartadserver.com',
+	'yieldmo.com',
+	'sharethrough.com',
+	'teads.tv',
+	'3lift.com',
+	# Analytics and tracking
+	'google-analytics.com',
+	'googletagmanager.com',
+	'analytics.google.com',
+	'scorecardresearch.com',
+	'quantserve.com',
+	'connect.facebook.net',
+	'bat.bing.com',
+	'clarity.ms',
+	'hotjar.com',
+	'mixpanel.com',
+	'api.amplitude.com',
+	'cdn.segment.com',
+	'api.segment.io',
+	'fullstory.com',
+	'mouseflow.com',
+	'newrelic.com',
+	'nr-data.net',
+	'chartbeat.com',
+	'chartbeat.net',
+	'parsely.com',
+	'branch.io',
+	'adjust.com',
+	'appsflyer.com',
+	'snap.licdn.com',
+	'ads.linkedin.com',
+	'analytics.tiktok.com',
+	'ads-twitter.com',
+	# Live chat and support widgets
+	'widget.intercom.io',
+	'js.intercomcdn.com',
+	'zdassets.com',
+	'livechatinc.com',
+	'client.crisp.chat',
+	'js.driftt.com',
+	# Push notifications
+	'onesignal.com',
+	'pushwoosh.com',
+]
+
+# playwright request.resource_type values aborted for each non-domain based resource class
+RESOURCE_TYPES_BY_CLASS: dict[BlockedResourceClass, frozenset[str]] = {
+	BlockedResourceClass.FONTS: frozenset({'font'}),
+	BlockedResourceClass.MEDIA: frozenset({'media'}),
+	BlockedResourceClass.IMAGES: frozenset({'image'}),
+}
+
+_TERMINAL = ''  # key used to mark the end of a rule in the trie (never a valid hostname label)
+
+
+class DomainSuffixTrie:
+	"""
+	Trie of reversed hostname labels, e.g. ads.example.com is stored as com -> example -> ads.
+
+	match('a.b.ads.example.com') walks at most as many nodes as the hostname has labels,
+	and returns the shortest rule that is a suffix of the hostname.
+	"""
+
+	def __init__(self, domains: Iterable[str] = ()) -> None:
+		self._root: dict[str, dict] = {}
+		self._size = 0
+		for domain in domains:
+			self.add(domain)
+
+	def __len__(self) -> int:
+		return self._size
+
+	@staticmethod
+	def _labels(domain: str) -> list[str]:
+		return [label for label in domain.strip().lower().strip('.').split('.') if label]
+
+	def add(self, domain: str) -> None:
+		labels = self._labels(domain.removeprefix('*.'))
+		if not labels:
+			return
+		node = self._root
+		for label in reversed(labels):
+			node = node.setdefault(label, {})
+		if _TERMINAL not in node:
+			node[_TERMINAL] = {}
+			self._size += 1
+
+	def match(self, hostname: str) -> str | None:
+		"""Return the blocking rule that matches hostname (or any of its parent domains), else None"""
+		node = self._root
+		matched: list[str] = []
+		for label in reversed(self._labels(hostname)):
+			child = node.get(label)
+			if child is None:
+				return None
+			matched.append(label)
+			if _TERMINAL in child:
+				return '.'.join(reversed(matched))
+			node = child
+		return None
+
+
+def get_hostname(url: str) -> str:
+	"""Get the lowercased hostname of a URL, or '' for urls without one (data:, blob:, about:, etc.)"""
+	try:
+		return urlsplit(url).hostname or ''
+	except ValueError:
+		return ''
+
+
+class RequestBlocker:
+	"""
+	Decides which requests to abort based on BrowserProfile.block_resources + BrowserProfile.blocked_domains,
+	and keeps counters of how many requests were blocked per resource class.
+
+	Usage:
+		blocker = RequestBlocker(block_resources=['ads', 'fonts'], blocked_domains=['tracker.example.com'])
+		await browser_context.route('**/*', blocker.handle_route)
+	"""
+
+	def __init__(
+		self,
+		block_resources: Iterable[BlockedResourceClass | str] = (),
+		blocked_domains: Iterable[str] = (),
+	) -> None:
+		self.block_resources = {BlockedResourceClass(resource_class) for resource_class in block_resources}
+
+		domains = list(blocked_domains)
+		if BlockedResourceClass.ADS in self.block_resources:
+			domains.extend(AD_AND_TRACKER_DOMAINS)
+		self.domain_trie = DomainSuffixTrie(domains)
+
+		self.blocked_resource_types: dict[str, BlockedResourceClass] = {}
+		for resource_class, resource_types in RESOURCE_TYPES_BY_CLASS.items():
+			if resource_class in self.block_resources:
+				for resource_type in resource_types:
+					self.blocked_resource_types[resource_type] = resource_class
+
+		self.total_requests = 0
+		self.blocked_counts: dict[str, int] = {}
+
+	@classmethod
+	def from_profile(cls, browser_profile) -> RequestBlocker | None:
+		"""Build a RequestBlocker from a BrowserProfile, or return None if request blocking is not enabled"""
+		if not (browser_profile.block_resources or browser_profile.blocked_domains):
+			return None
+		return cls(block_resources=browser_profile.block_resources, blocked_domains=browser_profile.blocked_domains)
+
+	@property
+	def total_blocked(self) -> int:
+		return sum(self.blocked_counts.values())
+
+	@property
+	def stats(self) -> dict[str, int | dict[str, int]]:
+		"""Counters for logging/metrics e.g. {'total_requests': 120, 'total_blocked': 48, 'blocked': {'ads': 40, 'fonts': 8}}"""
+		return {
+			'total_requests': self.total_requests,
+			'total_blocked': self.total_blocked,
+			'blocked': dict(self.blocked_counts),
+		}
+
+	def reset_stats(self) -> None:
+		self.total_requests = 0
+		self.blocked_counts = {}
+
+	def classify(self, url: str, resource_type: str, is_main_frame_navigation: bool = False) -> str | None:
+		"""
+		Return the name of the rule class that blocks this request ('ads', 'domains', 'fonts', 'media', 'images'),
+		or None if the request should be allowed through.
+		"""
+		# never block top-level page loads, the agent (or user) explicitly asked to go there
+		if is_main_frame_navigation:
+			return None
+
+		blocked_class = self.blocked_resource_types.get(resource_type)
+		if blocked_class is not None:
+			return blocked_class.value
+
+		if len(self.domain_trie):
+			hostname = get_hostname(url)
+			if hostname and self.domain_trie.match(hostname):
+				return BlockedResourceClass.ADS.value if BlockedResourceClass.ADS in self.block_resources else 'domains'
+
+		return None
+
+	def should_block(self, url: str, resource_type: str, is_main_frame_navigation: bool = False) -> bool:
+		"""Check a request against the compiled rules and update the counters"""
+		self.total_requests += 1
+		blocked_class = self.classify(url, resource_type, is_main_frame_navigation)
+		if blocked_class is None:
+			return False
+		self.blocked_counts[blocked_class] = self.blocked_counts.get(blocked_class, 0) + 1
+		return True
+
+	async def handle_route(self, route: Route) -> None:
+		"""playwright route handler, aborts blocked requests and passes everything else on to the next handler/network"""
+		request = route.request
+		try:
+			is_main_frame_navigation = request.is_navigation_request() and request.frame.parent_frame is None
+		except Exception:
+			# service worker requests have no frame
+			is_main_frame_navigation = False
+
+		try:
+			if self.should_block(request.url, request.resource_type, is_main_frame_navigation):
+				await route.abort('blockedbyclient')
+			else:
+				await route.fallback()
+		except Exception as e:
+			# route was already handled or the page/context is closing, nothing to do
+			logger.debug(f'Failed to handle route for {request.url[:100]}: {type(e).__name__}: {e}')
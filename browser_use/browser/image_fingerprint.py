@@ -0,0 +1,84 @@
+"""
+Fingerprints of screenshots, to tell screenshots that look the same apart from real page changes.
+
+The image is shrunk to a FINGERPRINT_SIZE x FINGERPRINT_SIZE grayscale thumbnail (each pixel the mean brightness of its
+cell, ~10x9 CSS pixels of a 1280x1100 viewport). Screenshots are near-duplicates if no thumbnail pixel differs by more than
+NEAR_DUPLICATE_MAX_DIFFERENCE, which absorbs rendering and re-encoding noise. Anything the model could act on, a typed
+character, a toggled checkbox, an error message, moves its cell by more than that and counts as a change.
+
+The one small change that is ignored is a blinking text cursor: if the changed cells are no bigger than a line of text,
+text_cursor_only() diffs that area of the full-size images and lets it through when all changed pixels form a caret-like
+sliver at most TEXT_CURSOR_MAX_WIDTH pixels wide. A typed character is wider than that and still counts as a change.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_SIZE = 128
+NEAR_DUPLICATE_MAX_DIFFERENCE = 16  # out of 255
+TEXT_CURSOR_MAX_CELLS = (2, 6)  # (columns, rows) of fingerprint cells, about one line of text
+TEXT_CURSOR_MAX_WIDTH = 3  # pixels
+TEXT_CURSOR_MIN_PIXEL_DIFFERENCE = 96  # out of 255, ignores anti-aliasing and JPEG ringing around the caret
+
+
+def fingerprint(image_bytes: bytes, size: int = FINGERPRINT_SIZE) -> bytes | None:
+	"""The grayscale thumbnail of an encoded image, None if it can't be computed (pillow not installed or not a valid image)"""
+	try:
+		from PIL import Image
+	except ImportError:
+		return None
+
+	try:
+		with Image.open(io.BytesIO(image_bytes)) as image:
+			image.draft('L', (size * 4, size * 4))  # decode JPEGs at reduced size, no-op for other formats
+			return image.convert('L').resize((size, size), Image.Resampling.BOX).tobytes()
+	except Exception as e:
+		logger.debug(f'Failed to compute the fingerprint of an image: {type(e).__name__}: {e}')
+		return None
+
+
+def changed_cells(fingerprint1: bytes, fingerprint2: bytes, max_difference: int = NEAR_DUPLICATE_MAX_DIFFERENCE) -> list[int]:
+	"""Indexes of the cells whose brightness differs by more than max_difference"""
+	return [i for i, (a, b) in enumerate(zip(fingerprint1, fingerprint2)) if abs(a - b) > max_difference]
+
+
+def text_cursor_only(image_bytes1: bytes, image_bytes2: bytes, cells: list[int], size: int = FINGERPRINT_SIZE) -> bool:
+	"""
+	Whether the only difference between two same-sized images in the given changed fingerprint cells is a text cursor
+	(a sliver at most TEXT_CURSOR_MAX_WIDTH pixels wide), False if it can't be computed
+	"""
+	if not cells:
+		return True
+	rows = [cell // size for cell in cells]
+	columns = [cell % size for cell in cells]
+	max_columns, max_rows = TEXT_CURSOR_MAX_CELLS
+	if max(columns) - min(columns) >= max_columns or max(rows) - min(rows) >= max_rows:
+		return False
+
+	try:
+		from PIL import Image, ImageChops
+	except ImportError:
+		return False
+
+	try:
+		with Image.open(io.BytesIO(image_bytes1)) as image1, Image.open(io.BytesIO(image_bytes2)) as image2:
+			if image1.size != image2.size:
+				return False
+			width, height = image1.size
+			# the changed cells plus a one cell margin, in pixels of the full-size images
+			box = (
+				max(0, (min(columns) - 1) * width // size),
+				max(0, (min(rows) - 1) * height // size),
+				min(width, (max(columns) + 2) * width // size),
+				min(height, (max(rows) + 2) * height // size),
+			)
+			difference = ImageChops.difference(image1.crop(box).convert('L'), image2.crop(box).convert('L'))
+			changed_box = difference.point(lambda value: 255 if value > TEXT_CURSOR_MIN_PIXEL_DIFFERENCE else 0).getbbox()
+	except Exception as e:
+		logger.debug(f'Failed to compare the changed area of two images: {type(e).__name__}: {e}')
+		return False
+	return changed_box is None or changed_box[2] - changed_box[0] <= TEXT_CURSOR_MAX_WIDTH
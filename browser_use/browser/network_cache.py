@@ -0,0 +1,240 @@
+"""
+Record/replay network cache for BrowserSession.
+
+In RECORD mode every routed request is fetched from the network and its response is stored in a
+content-addressed cache directory, in REPLAY mode requests are answered from that cache and only
+fall through to the network (or hard-fail) on a cache miss. This makes page loads (and therefore
+agent step timings) reproducible across eval reruns and benchmarks.
+
+Cache layout:
+	<cache_dir>/index.jsonl                   append-only log of {key, method, url, status, headers, body_sha256}
+	<cache_dir>/blobs/<sha[:2]>/<sha256>      response bodies, stored once per unique content
+
+An existing HAR file (e.g. recorded with BrowserProfile(record_har_path=..., record_har_content='embed'))
+can be imported into the cache with NetworkCache.import_har().
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+from browser_use.browser.profile import NetworkCacheMode
+from browser_use.browser.types import Route
+from browser_use.config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_METHODS = {'GET', 'HEAD', 'POST'}
+
+# the cached body is stored decoded, so these no longer describe it correctly when replaying
+STRIPPED_RESPONSE_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive'}
+
+
+def get_default_network_cache_dir() -> Path:
+	return CONFIG.XDG_CACHE_HOME / 'browseruse' / 'network_cache'
+
+
+def get_request_key(method: str, url: str, post_data: bytes | None = None) -> str:
+	"""Stable cache key for a request: sha256 of method + url (without #fragment) + sha256 of the request body"""
+	url = url.split('#', 1)[0]
+	body_hash = hashlib.sha256(post_data).hexdigest() if post_data else ''
+	return hashlib.sha256(f'{method.upper()} {url} {body_hash}'.encode()).hexdigest()
+
+
+class NetworkCache:
+	"""
+	Content-addressed store of HTTP responses keyed by get_request_key(), plus a playwright route handler
+	that records into / replays from it.
+
+	Usage:
+		cache = NetworkCache('./tmp/network_cache', mode='replay', fallthrough=True)
+		await browser_context.route('**/*', cache.handle_route)
+	"""
+
+	def __init__(self, cache_dir: str | Path, mode: NetworkCacheMode | str = NetworkCacheMode.REPLAY, fallthrough: bool = True):
+		self.cache_dir = Path(cache_dir).expanduser().resolve()
+		self.mode = NetworkCacheMode(mode)
+		self.fallthrough = fallthrough
+
+		self.index_path = self.cache_dir / 'index.jsonl'
+		self.blobs_dir = self.cache_dir / 'blobs'
+		self.entries: dict[str, dict[str, Any]] = {}
+
+		self.hits = 0
+		self.misses = 0
+		self.recorded = 0
+		self.failed = 0
+
+		self.load_index()
+
+	@classmethod
+	def from_profile(cls, browser_profile) -> NetworkCache | None:
+		"""Build a NetworkCache from a BrowserProfile, or return None if network_cache_mode is not set"""
+		if not browser_profile.network_cache_mode:
+			return None
+		network_cache = cls(
+			cache_dir=browser_profile.network_cache_dir or get_default_network_cache_dir(),
+			mode=browser_profile.network_cache_mode,
+			fallthrough=browser_profile.network_cache_fallthrough,
+		)
+		# seed the cache from a HAR recorded on a previous run
+		har_path = browser_profile.record_har_path
+		if network_cache.mode == NetworkCacheMode.REPLAY and har_path and Path(har_path).is_file():
+			network_cache.import_har(har_path)
+		return network_cache
+
+	def __len__(self) -> int:
+		return len(self.entries)
+
+	@property
+	def stats(self) -> dict[str, int | str]:
+		return {
+			'mode': self.mode.value,
+			'entries': len(self.entries),
+			'hits': self.hits,
+			'misses': self.misses,
+			'recorded': self.recorded,
+			'failed': self.failed,
+		}
+
+	# --- Storage ---
+
+	def _blob_path(self, body_sha256: str) -> Path:
+		return self.blobs_dir / body_sha256[:2] / body_sha256
+
+	def load_index(self) -> None:
+		"""Load index.jsonl from disk, later entries for the same key win"""
+		if not self.index_path.exists():
+			return
+		with open(self.index_path, encoding='utf-8') as f:
+			for line in f:
+				try:
+					entry = json.loads(line)
+					self.entries[entry['key']] = entry
+				except (json.JSONDecodeError, KeyError):
+					# a partially written last line from a crashed run, skip it
+					continue
+
+	def put(self, method: str, url: str, post_data: bytes | None, status: int, headers: dict[str, str], body: bytes) -> str:
+		"""Store a response and return its cache key"""
+		key = get_request_key(method, url, post_data)
+		body_sha256 = hashlib.sha256(body).hexdigest()
+
+		blob_path = self._blob_path(body_sha256)
+		if not blob_path.exists():
+			blob_path.parent.mkdir(parents=True, exist_ok=True)
+			tmp_path = blob_path.with_suffix('.tmp')
+			tmp_path.write_bytes(body)
+			tmp_path.replace(blob_path)
+
+		entry = {
+			'key': key,
+			'method': method.upper(),
+			'url': url,
+			'status': status,
+			'headers': {k: v for k, v in headers.items() if k.lower() not in STRIPPED_RESPONSE_HEADERS},
+			'body_sha256': body_sha256,
+		}
+		if self.entries.get(key) == entry:
+			# e.g. re-importing the same HAR file on every run, don't grow the index
+			return key
+
+		self.cache_dir.mkdir(parents=True, exist_ok=True)
+		with open(self.index_path, 'a', encoding='utf-8') as f:
+			f.write(json.dumps(entry) + '\n')
+		self.entries[key] = entry
+		return key
+
+	def get(self, method: str, url: str, post_data: bytes | None = None) -> tuple[dict[str, Any], bytes] | None:
+		"""Return (entry, body) for a cached request, or None on a miss"""
+		entry = self.entries.get(get_request_key(method, url, post_data))
+		if entry is None:
+			return None
+		try:
+			return entry, self._blob_path(entry['body_sha256']).read_bytes()
+		except FileNotFoundError:
+			return None
+
+	def import_har(self, har_path: str | Path) -> int:
+		"""Import all responses with content from a HAR file into the cache, returns the number of imported entries"""
+		har_path = Path(har_path)
+		har = json.loads(har_path.read_text(encoding='utf-8'))
+		imported = 0
+		for har_entry in har.get('log', {}).get('entries', []):
+			request, response = har_entry.get('request', {}), har_entry.get('response', {})
+			content = response.get('content', {})
+			status = response.get('status', 0)
+			if not request.get('url') or status <= 0:
+				continue
+
+			if '_file' in content:
+				# record_har_content='attach' stores bodies next to the HAR file
+				body_path = har_path.parent / content['_file']
+				if not body_path.exists():
+					continue
+				body = body_path.read_bytes()
+			elif 'text' in content:
+				body = base64.b64decode(content['text']) if content.get('encoding') == 'base64' else content['text'].encode()
+			else:
+				continue
+
+			post_data = request.get('postData', {}).get('text')
+			self.put(
+				method=request.get('method', 'GET'),
+				url=request['url'],
+				post_data=post_data.encode() if post_data else None,
+				status=status,
+				headers={h['name']: h['value'] for h in response.get('headers', [])},
+				body=body,
+			)
+			imported += 1
+		logger.debug(f'📼 Imported {imported} responses from {har_path} into network cache {self.cache_dir}')
+		return imported
+
+	# --- Routing ---
+
+	async def handle_route(self, route: Route) -> None:
+		"""playwright route handler, records responses or replays them depending on self.mode"""
+		request = route.request
+		if request.method.upper() not in CACHEABLE_METHODS or not request.url.startswith(('http://', 'https://')):
+			await route.fallback()
+			return
+
+		try:
+			post_data = request.post_data_buffer
+			if self.mode == NetworkCacheMode.REPLAY:
+				cached = await asyncio.to_thread(self.get, request.method, request.url, post_data)
+				if cached is not None:
+					entry, body = cached
+					self.hits += 1
+					await route.fulfill(status=entry['status'], headers=entry['headers'], body=body)
+					return
+
+				self.misses += 1
+				if not self.fallthrough:
+					self.failed += 1
+					logger.warning(
+						f'📼 Network cache miss, failing request (fallthrough disabled): {request.method} {request.url[:100]}'
+					)
+					await route.abort('internetdisconnected')
+					return
+
+			# RECORD mode, or a REPLAY miss falling through to the network: fetch and store the response
+			response = await route.fetch()
+			body = await response.body()
+			await asyncio.to_thread(self.put, request.method, request.url, post_data, response.status, response.headers, body)
+			self.recorded += 1
+			await route.fulfill(response=response, body=body)
+		except Exception as e:
+			# page/context closed mid-request, or the network fetch failed
+			logger.debug(f'📼 Network cache failed to handle {request.url[:100]}: {type(e).__name__}: {e}')
+			try:
+				await route.fallback()
+			except Exception:
+				pass
@@ -103,6 +103,21 @@ CHROME_DETERMINISTIC_RENDERING_ARGS = [
 	'--force-color-profile=srgb',
 ]
 
+CHROME_LOW_RESOURCE_ARGS = [
+	# density-over-fidelity preset for packing many headless sessions onto one server, see BrowserProfile(low_resource=True)
+	'--disable-gpu',  # headless servers have no GPU, skip spawning + initializing the GPU process
+	'--renderer-process-limit=2',  # share renderer processes between tabs/iframes instead of one per site
+	'--disable-site-isolation-trials',  # lowers RAM use by 10-16%, see CHROME_DOCKER_ARGS
+	'--disk-cache-size=33554432',  # 32MB HTTP cache instead of ~10% of free disk
+	'--media-cache-size=1',
+	'--disable-background-networking',  # no component/variations/safe-browsing fetches in the background
+	'--disable-component-update',
+	'--disable-default-apps',
+	'--disable-breakpad',
+	'--mute-audio',
+	# no --force-device-scale-factor, the preset defaults device_scale_factor=1 so an explicit value still wins
+]
+
 CHROME_DEFAULT_ARGS = [
 	# # provided by playwright by default: https://github.com/microsoft/playwright/blob/41008eeddd020e2dee1c540f7c0cdfa337e99637/packages/playwright-core/src/server/chromium/chromiumSwitches.ts#L76
 	# # we don't need to include them twice in our own config, but it's harmless
@@ -276,8 +291,23 @@ class RecordHarMode(str, Enum):
 	MINIMAL = 'minimal'
 
 
+class BlockedResourceClass(str, Enum):
+	ADS = 'ads'  # ad networks, analytics/trackers, chat widgets, push notification vendors
+	FONTS = 'fonts'
+	MEDIA = 'media'
+	IMAGES = 'images'
+
+
+class NetworkCacheMode(str, Enum):
+	RECORD = 'record'
+	REPLAY = 'replay'
+
+
 class BrowserChannel(str, Enum):
 	CHROMIUM = 'chromium'
+	CHROMIUM_HEADLESS_SHELL = (
+		'chromium-headless-shell'  # lighter old-headless-only build, installed by `playwright install chromium`
+	)
 	CHROME = 'chrome'
 	CHROME_BETA = 'chrome-beta'
 	CHROME_DEV = 'chrome-dev'
@@ -576,6 +606,52 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 	wait_for_network_idle_page_load_time: float = Field(default=0.5, description='Time to wait for network idle.')
 	maximum_wait_page_load_time: float = Field(default=5.0, description='Maximum time to wait for page load.')
 	wait_between_actions: float = Field(default=0.5, description='Time to wait between actions.')
+	adaptive_settle: bool = Field(
+		default=True,
+		description='Wait until the page goes quiet (no DOM mutations, pending requests or CSS transitions) instead of sleeping, '
+		'wait_between_actions and maximum_wait_page_load_time become upper bounds and minimum_wait_page_load_time is skipped.',
+	)
+	settle_quiet_time: float = Field(default=0.1, description='How long the page has to stay quiet to count as settled.')
+	settle_max_dom_wait: float = Field(
+		default=1.0,
+		description='How long to keep waiting for DOM mutations/transitions to stop once the network is idle, for pages that never stop changing.',
+	)
+
+	# --- Request blocking ---
+	block_resources: list[BlockedResourceClass] = Field(
+		default_factory=list,
+		description='Resource classes to abort via context-level request routing e.g. ["ads", "fonts", "media", "images"].',
+	)
+	blocked_domains: list[str] = Field(
+		default_factory=list,
+		description='Extra domains to block (including all their subdomains) e.g. ["tracker.example.com", "ads.example.net"].',
+	)
+
+	# --- Resource usage ---
+	low_resource: bool = Field(
+		default=False,
+		description='Preset for high-density headless servers: headless shell, no GPU, fewer renderer processes, small caches, service workers blocked.',
+	)
+
+	# --- Memory watchdog ---
+	memory_budget_mb: int | None = Field(
+		default=None,
+		description='Recycle the browser between agent steps once the RSS of its process tree exceeds this many MB.',
+	)
+	memory_check_interval: float = Field(default=10.0, description='Seconds between memory usage samples of the browser.')
+
+	# --- Record/replay network cache ---
+	network_cache_mode: NetworkCacheMode | None = Field(
+		default=None,
+		description='Record responses into network_cache_dir, or replay requests from it for deterministic reruns.',
+	)
+	network_cache_dir: str | Path | None = Field(
+		default=None,
+		description='Directory for the content-addressed network cache (defaults to ~/.cache/browseruse/network_cache).',
+	)
+	network_cache_fallthrough: bool = Field(
+		default=True, description='In replay mode, fetch (and record) cache misses from the network instead of failing them.'
+	)
 
 	# --- UI/viewport/DOM ---
 	include_dynamic_attributes: bool = Field(default=True, description='Include dynamic attributes in selectors.')
@@ -622,6 +698,23 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 			self.window_size = window_size
 		return self
 
+	@model_validator(mode='after')
+	def apply_low_resource_preset(self) -> Self:
+		"""Fill in density-friendly defaults for any options not explicitly set when low_resource=True"""
+		if not self.low_resource:
+			return self
+		if self.headless is None:
+			self.headless = True
+		if self.headless and not (self.channel or self.executable_path or self.stealth):
+			# headless shell skips loading the full browser UI stack, it's noticeably smaller + faster to start
+			self.channel = BrowserChannel.CHROMIUM_HEADLESS_SHELL
+		if self.device_scale_factor is None:
+			self.device_scale_factor = 1.0
+		if 'service_workers' not in self.model_fields_set and self.service_workers != ServiceWorkers.BLOCK:
+			# service workers keep extra processes + caches alive per origin, and make request routing miss requests
+			self.service_workers = ServiceWorkers.BLOCK
+		return self
+
 	@model_validator(mode='after')
 	def warn_storage_state_user_data_dir_conflict(self) -> Self:
 		"""Warn when both storage_state and user_data_dir are set, as this can cause conflicts."""
@@ -686,9 +779,11 @@ class BrowserProfile(BrowserConnectArgs, BrowserLaunchPersistentContextArgs, Bro
 			*self.args,
 			f'--profile-directory={self.profile_directory}',
 			*(CHROME_DOCKER_ARGS if CONFIG.IN_DOCKER else []),
-			*(CHROME_HEADLESS_ARGS if self.headless else []),
+			# chromium-headless-shell only has the old headless mode, playwright passes --headless for it already
+			*(CHROME_HEADLESS_ARGS if self.headless and self.channel != BrowserChannel.CHROMIUM_HEADLESS_SHELL else []),
 			*(CHROME_DISABLE_SECURITY_ARGS if self.disable_security else []),
 			*(CHROME_DETERMINISTIC_RENDERING_ARGS if self.deterministic_rendering else []),
+			*(CHROME_LOW_RESOURCE_ARGS if self.low_resource else []),
 			*(
 				[f'--window-size={self.window_size["width"]},{self.window_size["height"]}']
 				if self.window_size
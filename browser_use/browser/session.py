@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 import atexit
-import base64
 import json
 import logging
 import os
@@ -10,13 +9,17 @@ import re
 import shutil
 import tempfile
 import time
-from dataclasses import dataclass
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from functools import wraps
 from pathlib import Path
 from typing import Any, Self
 from urllib.parse import urlparse
 
 from browser_use.config import CONFIG
+from browser_use.tracing import trace_span
 from browser_use.utils import _log_pretty_path, _log_pretty_url
 
 from .utils import normalize_url
@@ -29,6 +32,8 @@ from playwright._impl._api_structures import ViewportSize
 from pydantic import AliasChoices, BaseModel, ConfigDict, Field, InstanceOf, PrivateAttr, model_validator
 from uuid_extensions import uuid7str
 
+from browser_use.browser.blocking import RequestBlocker
+from browser_use.browser.network_cache import NetworkCache
 from browser_use.browser.profile import BROWSERUSE_DEFAULT_CHANNEL, BrowserChannel, BrowserProfile
 from browser_use.browser.types import (
 	Browser,
@@ -44,6 +49,7 @@ from browser_use.browser.types import (
 from browser_use.browser.views import (
 	BrowserError,
 	BrowserStateSummary,
+	Screenshot,
 	TabInfo,
 	URLNotAllowedError,
 )
@@ -120,6 +126,52 @@ def require_initialization(func):
 
 DEFAULT_BROWSER_PROFILE = BrowserProfile()
 
+# Installs (once per document) a MutationObserver that timestamps the last DOM change, and reports how long the DOM has been
+# quiet + how many finite CSS transitions/animations are running (infinite ones like spinners would never settle)
+SETTLE_PROBE_JS = """
+	() => {
+		let settle = window.__browserUseSettle;
+		if (!settle) {
+			settle = window.__browserUseSettle = { lastMutation: performance.now() };
+			// inline style churn (JS-driven carousels, tickers, progress bars) never stops, don't count it as the page changing
+			new MutationObserver((mutations) => {
+				if (mutations.some((mutation) => mutation.type !== 'attributes' || mutation.attributeName !== 'style')) {
+					settle.lastMutation = performance.now();
+				}
+			}).observe(document, {
+				subtree: true, childList: true, attributes: true, characterData: true,
+			});
+		}
+		const runningTransitions = document.getAnimations
+			? document.getAnimations().filter(
+				(animation) => animation.playState === 'running' && animation.effect
+					&& animation.effect.getComputedTiming().endTime !== Infinity
+			).length
+			: 0;
+		return { msSinceMutation: performance.now() - settle.lastMutation, runningTransitions };
+	}
+"""
+
+# flags structural DOM changes (nodes added/removed) after a replay probe, which can invalidate the xpaths it resolved
+REPLAY_DOM_WATCH_JS = """
+	() => {
+		let watch = window.__browserUseReplayWatch;
+		if (!watch) {
+			watch = window.__browserUseReplayWatch = { changed: false };
+			new MutationObserver(() => { watch.changed = true; }).observe(document, { subtree: true, childList: true });
+		}
+		watch.changed = false;
+	}
+"""
+
+
+@dataclass
+class _NetworkActivity:
+	"""Requests still in flight + when the last one started/finished, see BrowserSession._track_network_activity()"""
+
+	last_activity: float
+	pending_requests: set[Any] = field(default_factory=set)
+
 
 @dataclass
 class CachedClickableElementHashes:
@@ -220,6 +272,16 @@ class BrowserSession(BaseModel):
 	_downloaded_files: list[str] = PrivateAttr(default_factory=list)
 	_original_browser_session: Any = PrivateAttr(default=None)  # Reference to prevent GC of the original session when copied
 	_owns_browser_resources: bool = PrivateAttr(default=True)  # True if this instance owns and should clean up browser resources
+	_request_blocker: RequestBlocker | None = PrivateAttr(default=None)
+	_network_cache: NetworkCache | None = PrivateAttr(default=None)
+	_memory_watchdog_task: asyncio.Task | None = PrivateAttr(default=None)
+	_memory_recycle_requested: bool = PrivateAttr(default=False)
+	_last_memory_usage_mb: float | None = PrivateAttr(default=None)
+	_memory_recycles: list[dict[str, Any]] = PrivateAttr(default_factory=list)
+	_recovery_snapshot: dict[str, Any] | None = PrivateAttr(default=None)
+	_tab_info_cache: weakref.WeakKeyDictionary = PrivateAttr(
+		default_factory=weakref.WeakKeyDictionary
+	)  # Page -> (url, title | None)
 
 	@model_validator(mode='after')
 	def apply_session_overrides_to_profile(self) -> Self:
@@ -283,6 +345,7 @@ class BrowserSession(BaseModel):
 
 		# Quick return if already connected
 		if self.initialized and await self.is_connected():
+			self._start_memory_watchdog()  # stopped by a previous stop() with keep_alive=True, no-op if still running
 			return self
 
 		# Reset if we were initialized but lost connection
@@ -306,8 +369,17 @@ class BrowserSession(BaseModel):
 
 			# Configure browser
 			await self._setup_viewports()
+			# route handlers run in reverse registration order, so blocked requests never reach the network cache
+			await self._setup_network_cache()
+			await self._setup_request_blocking()
 			await self._setup_current_page_change_listeners()
+			await self._setup_tab_info_cache()
 			await self._start_context_tracing()
+			self._start_memory_watchdog()
+
+			# we're reconnecting after the browser crashed/disconnected, reopen the tabs the agent had open
+			if self._recovery_snapshot:
+				await self._recover_from_snapshot()
 
 			self.initialized = True
 			return self
@@ -353,6 +425,9 @@ class BrowserSession(BaseModel):
 			)
 			return  # nothing to do if keep_alive=True, leave the browser running
 
+		self._stop_memory_watchdog()
+		self._recovery_snapshot = None  # shutting down on purpose, nothing to recover on the next start()
+
 		# Only the owner can actually stop the browser
 		if not self._owns_browser_resources:
 			self.logger.debug(f'🔗 BrowserSession.stop() called on a copy, not closing shared browser resources {_hint}')
@@ -707,7 +782,7 @@ class BrowserSession(BaseModel):
 		semaphore_timeout=10,  # wait up to 10s for a lock
 		semaphore_lax=True,  # proceed anyway if we cant get a lock
 	)
-	async def _take_screenshot_hybrid(self, page: Page, clip: dict[str, int] | None = None) -> str:
+	async def _take_screenshot_hybrid(self, page: Page, clip: dict[str, int] | None = None) -> bytes:
 		"""Take screenshot using Playwright, with retry and semaphore protection."""
 		# Use Playwright screenshot directly
 
@@ -736,9 +811,8 @@ class BrowserSession(BaseModel):
 				await self.start()
 			raise err
 		assert await page.evaluate('() => true'), 'Page is not usable after screenshot!'
-		screenshot_b64 = base64.b64encode(screenshot).decode('utf-8')
-		assert screenshot_b64, 'Playwright page.screenshot() returned empty base64'
-		return screenshot_b64
+		assert screenshot, 'Playwright page.screenshot() returned empty bytes'
+		return screenshot
 
 	@retry(
 		wait=1,
@@ -1348,6 +1422,74 @@ class BrowserSession(BaseModel):
 					f'⚠️ Failed to add visibility listener to existing tab, is it crashed or ignoring CDP commands?: [{page_idx}]{page.url}: {type(e).__name__}: {e}'
 				)
 
+	async def _setup_tab_info_cache(self) -> None:
+		"""
+		Keep a per-page (url, title) cache updated from framenavigated events + a <title> MutationObserver,
+		so get_tabs_info() can usually answer without any CDP round trips.
+		"""
+		assert self.browser_context is not None, 'BrowserContext object is not set'
+		tab_info_cache = self._tab_info_cache
+
+		def _on_frame_navigated(frame) -> None:
+			# fires for both full navigations and same-document history.pushState() navigations
+			if frame.parent_frame is None:
+				cached_url, cached_title = tab_info_cache.get(frame.page, (None, None))
+				# keep the title on same-document navigations, the title observer will report if it changes
+				same_document = cached_url is not None and cached_url.split('#', 1)[0] == frame.url.split('#', 1)[0]
+				tab_info_cache[frame.page] = (frame.url, cached_title if same_document else None)
+				self._update_recovery_snapshot()
+
+		def _on_page_closed(page: Page) -> None:
+			tab_info_cache.pop(page, None)
+
+		def _watch_page(page: Page) -> None:
+			page.on('framenavigated', _on_frame_navigated)
+			page.on('close', _on_page_closed)
+
+		def _BrowserUseonTitleChange(source: dict[str, Any], payload: dict[str, str]) -> None:
+			"""hook callback fired by the init script below whenever document.title changes"""
+			page = source.get('page')
+			if page is not None and not page.is_closed():
+				tab_info_cache[page] = (payload.get('url') or page.url, payload.get('title') or '')
+
+		try:
+			await self.browser_context.expose_binding('_BrowserUseonTitleChange', _BrowserUseonTitleChange)
+		except Exception as e:
+			if 'has been already registered' not in str(e):
+				self.logger.debug(f'⚠️ Failed to expose title change binding: {type(e).__name__}: {e}')
+
+		update_tab_title_script = """
+			(() => {
+				if (window.top !== window || window._BrowserUseTitleObserverInstalled) return;
+				window._BrowserUseTitleObserverInstalled = true;
+				let lastTitle = null;
+				const report = () => {
+					if (document.title === lastTitle) return;
+					lastTitle = document.title;
+					window._BrowserUseonTitleChange?.({ url: document.location.href, title: lastTitle })?.catch?.(() => {});
+				};
+				const observe = () => {
+					report();
+					// only watch <head>, watching the whole document would fire on every DOM mutation of the page
+					const target = document.head || document.documentElement;
+					if (target) new MutationObserver(report).observe(target, { subtree: true, childList: true, characterData: true });
+				};
+				if (document.readyState === 'loading') {
+					document.addEventListener('DOMContentLoaded', observe, { once: true });
+				} else {
+					observe();
+				}
+			})();
+		"""
+		try:
+			await self.browser_context.add_init_script(update_tab_title_script)
+		except Exception as e:
+			self.logger.debug(f'⚠️ Failed to register init script for tab title tracking: {type(e).__name__}: {e}')
+
+		self.browser_context.on('page', _watch_page)
+		for page in self.browser_context.pages:
+			_watch_page(page)
+
 	async def _setup_viewports(self) -> None:
 		"""Resize any existing page viewports to match the configured size, set up storage_state, permissions, geolocation, etc."""
 
@@ -1533,6 +1675,7 @@ class BrowserSession(BaseModel):
 		self.human_current_page = None
 		self._cached_clickable_element_hashes = None
 		self._cached_browser_state_summary = None
+		self._tab_info_cache.clear()
 		# Don't clear self.playwright here - it should be cleared explicitly in kill()
 
 		if self.browser_pid:
@@ -1552,6 +1695,259 @@ class BrowserSession(BaseModel):
 		if not already_disconnected:
 			self.logger.debug(f'⚰️ Browser {self._connection_str} disconnected')
 
+	# --- Memory watchdog ---
+
+	def _start_memory_watchdog(self) -> None:
+		"""Start sampling the browser's memory usage in the background if browser_profile.memory_budget_mb is set"""
+		if not self.browser_profile.memory_budget_mb or not self._owns_browser_resources:
+			return
+		if self._memory_watchdog_task and not self._memory_watchdog_task.done():
+			return  # already running, e.g. start() called again after a recycle
+		self._memory_watchdog_task = asyncio.create_task(self._memory_watchdog_loop(), name=f'memory_watchdog_{self.id[-4:]}')
+
+	def _stop_memory_watchdog(self) -> None:
+		if self._memory_watchdog_task and not self._memory_watchdog_task.done():
+			self._memory_watchdog_task.cancel()
+		self._memory_watchdog_task = None
+
+	def _get_browser_memory_usage_mb(self) -> float | None:
+		"""Sum the RSS of the browser process and all its renderer/gpu/utility child processes"""
+		if not self.browser_pid:
+			return None
+		try:
+			browser_proc = psutil.Process(self.browser_pid)
+			procs = [browser_proc, *browser_proc.children(recursive=True)]
+		except (psutil.NoSuchProcess, psutil.AccessDenied):
+			return None
+
+		total_rss = 0
+		for proc in procs:
+			try:
+				total_rss += proc.memory_info().rss
+			except (psutil.NoSuchProcess, psutil.AccessDenied):
+				pass
+		return total_rss / 1024 / 1024
+
+	async def _memory_watchdog_loop(self) -> None:
+		budget_mb = self.browser_profile.memory_budget_mb
+		assert budget_mb, 'memory watchdog started without browser_profile.memory_budget_mb'
+		while True:
+			await asyncio.sleep(self.browser_profile.memory_check_interval)
+			try:
+				# psutil walks /proc for every child process, keep that off the event loop
+				usage_mb = await asyncio.to_thread(self._get_browser_memory_usage_mb)
+			except Exception as e:
+				self.logger.debug(f'Failed to sample browser memory usage: {type(e).__name__}: {e}')
+				continue
+			if usage_mb is None:
+				continue
+
+			self._last_memory_usage_mb = usage_mb
+			if usage_mb > budget_mb and not self._memory_recycle_requested:
+				self.logger.warning(
+					f'🐘 Browser browser_pid={self.browser_pid} is using {usage_mb:.0f}MB > memory_budget_mb={budget_mb}MB, '
+					'it will be recycled before the next agent step'
+				)
+				self._memory_recycle_requested = True
+
+	@property
+	def memory_watchdog_stats(self) -> dict[str, Any]:
+		"""Latest memory sample + one entry per recycle, e.g. {'memory_usage_mb': 812.5, 'budget_mb': 1500, 'recycles': [...]}"""
+		return {
+			'memory_usage_mb': self._last_memory_usage_mb,
+			'budget_mb': self.browser_profile.memory_budget_mb,
+			'recycle_requested': self._memory_recycle_requested,
+			'recycles': list(self._memory_recycles),
+		}
+
+	async def recycle_if_over_memory_budget(self) -> bool:
+		"""
+		Recycle the browser if the memory watchdog found it over browser_profile.memory_budget_mb.
+		Meant to be called between agent steps (when no action is in flight), returns True if the browser was recycled.
+		"""
+		if not self._memory_recycle_requested:
+			return False
+		self._memory_recycle_requested = False
+		try:
+			await self.recycle_browser(_reason=f'over memory_budget_mb={self.browser_profile.memory_budget_mb}')
+			return True
+		except Exception as e:
+			self.logger.warning(f'❌ Failed to recycle browser to free memory: {type(e).__name__}: {e}')
+			return False
+
+	async def recycle_browser(self, _reason: str = '') -> dict[str, Any]:
+		"""
+		Checkpoint the storage state + open tab URLs, restart the browser process, then restore them.
+		Only possible for browsers launched by this BrowserSession (not ones connected to via cdp_url/wss_url/browser_pid).
+		"""
+		assert self.browser_context is not None, 'BrowserContext is not set up'
+		if self.cdp_url or self.wss_url or not self._owns_browser_resources:
+			raise BrowserError(f'Cannot recycle {self._connection_str}, it was not launched by this BrowserSession')
+
+		started_at = time.time()
+		memory_before_mb = await asyncio.to_thread(self._get_browser_memory_usage_mb)
+
+		# checkpoint, and take the snapshot out of start()'s hands so we can report how many tabs came back
+		await self._checkpoint_recovery_snapshot()
+		recovery_snapshot, self._recovery_snapshot = self._recovery_snapshot, None
+		try:
+			await self.save_storage_state()
+		except Exception as e:
+			self.logger.warning(f'⚠️ Failed to save storage state before recycling browser: {type(e).__name__}: {e}')
+
+		# recycle, without going through stop() so the (possibly temporary) user_data_dir and keep_alive are left alone
+		self.logger.info(f'♻️ Recycling browser {self._connection_str} {_reason}...')
+		try:
+			await self._close_browser_context()
+			await self._close_browser()
+		except Exception as e:
+			self.logger.debug(f'Error closing browser before recycling: {type(e).__name__}: {e}')
+		if self.browser_pid:
+			try:
+				await self._terminate_browser_process(_hint='(recycling)')
+			except Exception:
+				self._kill_child_processes(_hint='(recycling)')
+		self.browser_pid = None
+		self._reset_connection_state()
+		await self.start()
+
+		# restore
+		assert self.browser_context is not None, 'BrowserContext failed to start after recycling'
+		restored_tabs = await self._restore_recovery_snapshot(recovery_snapshot) if recovery_snapshot else 0
+
+		memory_after_mb = await asyncio.to_thread(self._get_browser_memory_usage_mb)
+		metrics = {
+			'timestamp': started_at,
+			'reason': _reason,
+			'memory_before_mb': memory_before_mb,
+			'memory_after_mb': memory_after_mb,
+			'budget_mb': self.browser_profile.memory_budget_mb,
+			'tabs_restored': restored_tabs,
+			'duration_seconds': time.time() - started_at,
+		}
+		self._memory_recycles.append(metrics)
+		self._last_memory_usage_mb = memory_after_mb
+		self.logger.info(
+			f'♻️ Recycled browser in {metrics["duration_seconds"]:.1f}s: '
+			f'{memory_before_mb or 0:.0f}MB ➡️ {memory_after_mb or 0:.0f}MB, restored {restored_tabs} tabs'
+		)
+		return metrics
+
+	# --- Crash recovery ---
+
+	def _update_recovery_snapshot(self, agent_scroll_y: int | None = None) -> dict[str, Any] | None:
+		"""
+		Refresh the running snapshot of open tab URLs, the focused tab and per-tab scroll positions that start() uses
+		to reopen everything after the browser crashes/disconnects. Makes no CDP calls, so it's cheap enough to run on
+		every top-level navigation.
+		"""
+		if not self.initialized or not self.browser_context:
+			return self._recovery_snapshot  # (re)connecting, don't overwrite the snapshot we're about to recover from
+		try:
+			pages = self.browser_context.pages
+			urls = [page.url for page in pages]
+		except Exception:
+			return self._recovery_snapshot
+		if not urls:
+			return self._recovery_snapshot  # pages are dropped from the context when the browser dies, keep the last good one
+
+		previous = self._recovery_snapshot or {}
+		# carry scroll positions over for tabs that are still on the same url
+		previous_scroll_positions = dict(zip(previous.get('urls', []), previous.get('scroll_positions', [])))
+		scroll_positions = [previous_scroll_positions.get(url, 0) for url in urls]
+		agent_tab_index = pages.index(self.agent_current_page) if self.agent_current_page in pages else 0
+		if agent_scroll_y is not None:
+			scroll_positions[agent_tab_index] = agent_scroll_y
+
+		self._recovery_snapshot = {
+			'urls': urls,
+			'agent_tab_index': agent_tab_index,
+			'scroll_positions': scroll_positions,
+			'cookies': previous.get('cookies', []),
+		}
+		return self._recovery_snapshot
+
+	async def _checkpoint_recovery_snapshot(self, agent_scroll_y: int | None = None) -> None:
+		"""Refresh the recovery snapshot including the context's cookies (one CDP round trip), called after every get_state_summary()"""
+		recovery_snapshot = self._update_recovery_snapshot(agent_scroll_y)
+		if not recovery_snapshot or not self.browser_context:
+			return
+		try:
+			recovery_snapshot['cookies'] = await self.browser_context.cookies()
+		except Exception as e:
+			self.logger.debug(f'Failed to checkpoint cookies for crash recovery: {type(e).__name__}: {e}')
+
+	async def _recover_from_snapshot(self) -> int:
+		"""Called by start() when reconnecting after a crash/disconnect, restores cookies + tabs from the last recovery snapshot"""
+		assert self.browser_context is not None, 'BrowserContext is not set up'
+		recovery_snapshot, self._recovery_snapshot = self._recovery_snapshot, None
+		if not recovery_snapshot:
+			return 0
+
+		# e.g. we reconnected to a cdp_url/browser_pid browser that survived with its tabs intact, nothing to restore
+		if any(
+			page.url not in ('about:blank', 'chrome://newtab/', 'chrome://new-tab-page/') for page in self.browser_context.pages
+		):
+			self.logger.debug('🩹 Reconnected browser still has its tabs open, skipping tab recovery')
+			return 0
+
+		started_at = time.time()
+		try:
+			restored_tabs = await self._restore_recovery_snapshot(recovery_snapshot)
+		except Exception as e:
+			self.logger.warning(f'⚠️ Failed to restore tabs after reconnecting to browser: {type(e).__name__}: {e}')
+			return 0
+		self.logger.info(
+			f'🩹 Restored {restored_tabs}/{len(recovery_snapshot["urls"])} tabs after reconnecting in {time.time() - started_at:.1f}s'
+		)
+		return restored_tabs
+
+	async def _restore_recovery_snapshot(self, recovery_snapshot: dict[str, Any]) -> int:
+		"""Restore the cookies and reopen the tabs from a recovery snapshot concurrently, returns the number of tabs restored"""
+		assert self.browser_context is not None, 'BrowserContext is not set up'
+		if recovery_snapshot.get('cookies'):
+			try:
+				await self.browser_context.add_cookies(recovery_snapshot['cookies'])
+			except Exception as e:
+				self.logger.warning(f'⚠️ Failed to restore cookies: {type(e).__name__}: {e}')
+
+		urls: list[str] = recovery_snapshot.get('urls', [])
+		scroll_positions: list[int] = recovery_snapshot.get('scroll_positions') or [0] * len(urls)
+		if not urls:
+			return 0
+
+		# reuse the blank tab the fresh browser started with for the first url
+		pages = list(self.browser_context.pages)
+		while len(pages) < len(urls):
+			pages.append(await self.browser_context.new_page())
+
+		async def _restore_tab(page: Page, url: str, scroll_y: int) -> bool:
+			if url == 'about:blank' or page.url == url:
+				return True
+			try:
+				await page.goto(
+					url, wait_until='domcontentloaded', timeout=self.browser_profile.maximum_wait_page_load_time * 1000
+				)
+				if scroll_y:
+					await page.evaluate('(y) => window.scrollTo(0, y)', scroll_y)
+				return True
+			except Exception as e:
+				self.logger.debug(f'⚠️ Failed to restore tab {_log_pretty_url(url)}: {type(e).__name__}: {e}')
+				return False
+
+		restored = await asyncio.gather(
+			*(_restore_tab(page, url, scroll_y) for page, url, scroll_y in zip(pages, urls, scroll_positions))
+		)
+
+		agent_tab_index = min(recovery_snapshot.get('agent_tab_index', 0), len(urls) - 1)
+		self.agent_current_page = pages[agent_tab_index]
+		self.human_current_page = pages[agent_tab_index]
+		try:
+			await self.agent_current_page.bring_to_front()
+		except Exception:
+			pass
+		return sum(restored)
+
 	def prepare_user_data_dir(self) -> None:
 		"""Create and unlock the user data dir and ensure all recording paths exist."""
 
@@ -1827,19 +2223,27 @@ class BrowserSession(BaseModel):
 	async def get_tabs_info(self) -> list[TabInfo]:
 		"""Get information about all tabs"""
 		assert self.browser_context is not None, 'BrowserContext is not set up'
-		tabs_info = []
-		for page_id, page in enumerate(self.browser_context.pages):
+
+		async def _get_tab_info(page_id: int, page: Page) -> TabInfo:
+			url = page.url  # page.url is tracked locally by playwright, no round trip needed
+			cached_url, cached_title = self._tab_info_cache.get(page, (None, None))
+			if cached_url == url and cached_title is not None:
+				return TabInfo(page_id=page_id, url=url, title=cached_title)
+
 			try:
 				title = await self._get_page_title(page)
-				tab_info = TabInfo(page_id=page_id, url=page.url, title=title)
+				self._tab_info_cache[page] = (url, title)
+				return TabInfo(page_id=page_id, url=url, title=title)
 			except Exception:
 				# page.title() can hang forever on tabs that are crashed/disappeared/about:blank
 				# we dont want to try automating those tabs because they will hang the whole script
-				self.logger.debug(f'⚠️ Failed to get tab info for tab #{page_id}: {_log_pretty_url(page.url)} (ignoring)')
-				tab_info = TabInfo(page_id=page_id, url='about:blank', title='ignore this tab and do not use it')
-			tabs_info.append(tab_info)
+				self.logger.debug(f'⚠️ Failed to get tab info for tab #{page_id}: {_log_pretty_url(url)} (ignoring)')
+				return TabInfo(page_id=page_id, url='about:blank', title='ignore this tab and do not use it')
 
-		return tabs_info
+		# cache misses are fetched concurrently so N tabs cost one round trip of latency instead of N
+		return list(
+			await asyncio.gather(*(_get_tab_info(page_id, page) for page_id, page in enumerate(self.browser_context.pages)))
+		)
 
 	@retry(timeout=1, retries=0)  # Single attempt with 1s timeout, no retries
 	async def _get_page_title(self, page: Page) -> str:
@@ -2137,11 +2541,10 @@ class BrowserSession(BaseModel):
 	# 	"""
 	# 	return list(Path(self.browser_profile.downloads_path).glob('*'))
 
-	async def _wait_for_stable_network(self):
-		pending_requests = set()
-		last_activity = asyncio.get_event_loop().time()
-
-		page = await self.get_current_page()
+	@contextmanager
+	def _track_network_activity(self, page: Page) -> Iterator[_NetworkActivity]:
+		"""Track the in-flight requests that matter for page load (documents, styles, scripts, images, fonts, not analytics/ads/streams)"""
+		activity = _NetworkActivity(last_activity=asyncio.get_event_loop().time())
 
 		# Define relevant resource types and content types
 		RELEVANT_RESOURCE_TYPES = {
@@ -2234,14 +2637,13 @@ class BrowserSession(BaseModel):
 			]:
 				return
 
-			nonlocal last_activity
-			pending_requests.add(request)
-			last_activity = asyncio.get_event_loop().time()
+			activity.pending_requests.add(request)
+			activity.last_activity = asyncio.get_event_loop().time()
 			# self.logger.debug(f'Request started: {request.url} ({request.resource_type})')
 
 		async def on_response(response):
 			request = response.request
-			if request not in pending_requests:
+			if request not in activity.pending_requests:
 				return
 
 			# Filter by content type if available
@@ -2261,57 +2663,110 @@ class BrowserSession(BaseModel):
 					'protobuf',
 				]
 			):
-				pending_requests.remove(request)
+				activity.pending_requests.remove(request)
 				return
 
 			# Only process relevant content types
 			if not any(ct in content_type for ct in RELEVANT_CONTENT_TYPES):
-				pending_requests.remove(request)
+				activity.pending_requests.remove(request)
 				return
 
 			# Skip if response is too large (likely not essential for page load)
 			content_length = response.headers.get('content-length')
 			if content_length and int(content_length) > 5 * 1024 * 1024:  # 5MB
-				pending_requests.remove(request)
+				activity.pending_requests.remove(request)
 				return
 
-			nonlocal last_activity
-			pending_requests.remove(request)
-			last_activity = asyncio.get_event_loop().time()
+			activity.pending_requests.remove(request)
+			activity.last_activity = asyncio.get_event_loop().time()
 			# self.logger.debug(f'Request resolved: {request.url} ({content_type})')
 
+		async def on_request_failed(request):
+			# failed/aborted requests (e.g. blocked by browser_profile.block_resources) never get a response
+			if request in activity.pending_requests:
+				activity.pending_requests.remove(request)
+				activity.last_activity = asyncio.get_event_loop().time()
+
 		# Attach event listeners
 		page.on('request', on_request)
 		page.on('response', on_response)
-
-		now = asyncio.get_event_loop().time()
+		page.on('requestfailed', on_request_failed)
 		try:
+			yield activity
+		finally:
+			# Clean up event listeners
+			page.remove_listener('request', on_request)
+			page.remove_listener('response', on_response)
+			page.remove_listener('requestfailed', on_request_failed)
+
+	async def _wait_for_stable_network(self, idle_time: float | None = None):
+		idle_time = self.browser_profile.wait_for_network_idle_page_load_time if idle_time is None else idle_time
+		poll_interval = min(max(idle_time, 0.02), 0.1)
+
+		page = await self.get_current_page()
+
+		now = start_time = asyncio.get_event_loop().time()
+		with self._track_network_activity(page) as network:
 			# Wait for idle time
-			start_time = asyncio.get_event_loop().time()
 			while True:
-				await asyncio.sleep(0.1)
+				await asyncio.sleep(poll_interval)
 				now = asyncio.get_event_loop().time()
-				if (
-					len(pending_requests) == 0
-					and (now - last_activity) >= self.browser_profile.wait_for_network_idle_page_load_time
-				):
+				if len(network.pending_requests) == 0 and (now - network.last_activity) >= idle_time:
 					break
 				if now - start_time > self.browser_profile.maximum_wait_page_load_time:
 					self.logger.debug(
-						f'{self} Network timeout after {self.browser_profile.maximum_wait_page_load_time}s with {len(pending_requests)} '
-						f'pending requests: {[r.url for r in pending_requests]}'
+						f'{self} Network timeout after {self.browser_profile.maximum_wait_page_load_time}s with {len(network.pending_requests)} '
+						f'pending requests: {[r.url for r in network.pending_requests]}'
 					)
 					break
 
-		finally:
-			# Clean up event listeners
-			page.remove_listener('request', on_request)
-			page.remove_listener('response', on_response)
-
 		elapsed = now - start_time
 		if elapsed > 1:
 			self.logger.debug(f'💤 Page network traffic calmed down after {now - start_time:.2f} seconds')
 
+	@time_execution_async('--wait_for_page_settle')
+	async def wait_for_page_settle(self, max_wait: float | None = None, quiet_time: float | None = None) -> float:
+		"""
+		Wait until the current page has gone quiet for quiet_time: no DOM mutations, no pending requests (of the classes
+		_wait_for_stable_network tracks) and no finite CSS transitions/animations running. Gives up after max_wait, or
+		once the network has been idle for settle_max_dom_wait on pages whose DOM never stops changing.
+		Returns the number of seconds waited.
+		"""
+		max_wait = self.browser_profile.maximum_wait_page_load_time if max_wait is None else max_wait
+		quiet_time = self.browser_profile.settle_quiet_time if quiet_time is None else quiet_time
+		max_dom_wait = max(self.browser_profile.settle_max_dom_wait, quiet_time)
+		poll_interval = min(max(quiet_time / 2, 0.02), 0.1)
+
+		page = await self.get_current_page()
+		loop = asyncio.get_event_loop()
+		start_time = loop.time()
+		with self._track_network_activity(page) as network:
+			while True:
+				elapsed = loop.time() - start_time
+				try:
+					probe = await asyncio.wait_for(page.evaluate(SETTLE_PROBE_JS), timeout=max(max_wait - elapsed, poll_interval))
+					dom_quiet = probe['msSinceMutation'] >= quiet_time * 1000 and not probe['runningTransitions']
+				except Exception:
+					dom_quiet = False  # mid-navigation, the new document gets its observer on the next probe
+
+				now = loop.time()
+				network_idle_for = 0.0 if network.pending_requests else now - max(network.last_activity, start_time)
+				if dom_quiet and network_idle_for >= quiet_time:
+					break
+				if network_idle_for >= max_dom_wait:
+					self.logger.debug(
+						f'{self} Network idle but the page is still changing after {now - start_time:.2f}s, not waiting for it'
+					)
+					break
+				if now - start_time >= max_wait:
+					self.logger.debug(
+						f'{self} Page still busy after {max_wait}s (dom_quiet={dom_quiet}, pending_requests={len(network.pending_requests)})'
+					)
+					break
+				await asyncio.sleep(min(poll_interval, max_wait - (now - start_time)))
+
+		return loop.time() - start_time
+
 	async def _wait_for_page_and_frames_load(self, timeout_overwrite: float | None = None):
 		"""
 		Ensures page is fully loaded before continuing.
@@ -2324,7 +2779,13 @@ class BrowserSession(BaseModel):
 		# Wait for page load
 		page = await self.get_current_page()
 		try:
-			await self._wait_for_stable_network()
+			if self.browser_profile.adaptive_settle:
+				# return as soon as the page is quiet, minimum_wait_page_load_time doesn't apply
+				with trace_span('wait_for_page_settle'):
+					await self.wait_for_page_settle()
+			else:
+				with trace_span('wait_for_network_idle'):
+					await self._wait_for_stable_network()
 
 			# Check if the loaded URL is allowed
 			await self._check_and_handle_navigation(page)
@@ -2337,7 +2798,9 @@ class BrowserSession(BaseModel):
 
 		# Calculate remaining time to meet minimum WAIT_TIME
 		elapsed = time.time() - start_time
-		remaining = max((timeout_overwrite or self.browser_profile.minimum_wait_page_load_time) - elapsed, 0)
+		remaining = 0.0
+		if not self.browser_profile.adaptive_settle:
+			remaining = max((timeout_overwrite or self.browser_profile.minimum_wait_page_load_time) - elapsed, 0)
 
 		# just for logging, calculate how much data was downloaded
 		try:
@@ -2374,7 +2837,8 @@ class BrowserSession(BaseModel):
 
 		# Sleep remaining time if needed
 		if remaining > 0:
-			await asyncio.sleep(remaining)
+			with trace_span('minimum_wait_page_load_time', seconds=round(remaining, 3)):
+				await asyncio.sleep(remaining)
 
 	def _is_url_allowed(self, url: str) -> bool:
 		"""
@@ -2594,7 +3058,8 @@ class BrowserSession(BaseModel):
 			This is used to calculate which elements are new to the LLM since the last message,
 			which helps reduce token usage.
 		"""
-		await self._wait_for_page_and_frames_load()
+		with trace_span('page_settle'):
+			await self._wait_for_page_and_frames_load()
 		updated_state = await self._get_updated_state()
 
 		# Find out which elements are new
@@ -2618,9 +3083,61 @@ class BrowserSession(BaseModel):
 
 		assert updated_state
 		self._cached_browser_state_summary = updated_state
+		await self._checkpoint_recovery_snapshot(agent_scroll_y=updated_state.pixels_above)
+
+		return self._cached_browser_state_summary
+
+	@require_initialization
+	async def get_replay_state(
+		self,
+		include_dom: bool = True,
+		include_screenshot: bool = False,
+		network_idle_time: float = 0.1,
+	) -> BrowserStateSummary | None:
+		"""
+		Lightweight alternative to get_state_summary() for replaying recorded actions.
+
+		Waits only until the network has been quiet for network_idle_time (no minimum page load time), then extracts the
+		interactive elements of the whole page without highlighting them, capturing tab titles or scroll info.
+		The result becomes the cached state that index-based actions resolve against. Returns None if include_dom=False.
+		Use replay_dom_changed() to check whether the page changed structurally since.
+		"""
+		page = await self.get_current_page()
+		try:
+			await self._wait_for_stable_network(idle_time=network_idle_time)
+		except Exception as e:
+			self.logger.debug(f'Waiting for network idle failed during replay, continuing anyway: {type(e).__name__}: {e}')
+		await self._check_and_handle_navigation(page)
 
+		if not include_dom:
+			return None
+
+		try:
+			await page.evaluate(REPLAY_DOM_WATCH_JS)
+		except Exception as e:
+			self.logger.debug(f'Failed to watch the DOM for changes during replay: {type(e).__name__}: {e}')
+		content = await DomService(page, logger=self.logger).get_clickable_elements(
+			highlight_elements=False,
+			viewport_expansion=-1,  # recorded elements may be anywhere on the page, clicks scroll them into view
+		)
+		self._cached_browser_state_summary = BrowserStateSummary(
+			element_tree=content.element_tree,
+			selector_map=content.selector_map,
+			url=page.url,
+			title=self._tab_info_cache.get(page, (None, ''))[1] or '',
+			tabs=[],
+			screenshot=await self.capture_screenshot() if include_screenshot else None,
+		)
 		return self._cached_browser_state_summary
 
+	async def replay_dom_changed(self) -> bool:
+		"""Whether elements were added/removed or the page navigated since the last get_replay_state() probe"""
+		page = await self.get_current_page()
+		try:
+			return await page.evaluate('() => !window.__browserUseReplayWatch || window.__browserUseReplayWatch.changed')
+		except Exception:
+			return True
+
 	async def _get_updated_state(self, focus_element: int = -1) -> BrowserStateSummary:
 		"""Update and return state."""
 
@@ -2667,10 +3184,10 @@ class BrowserSession(BaseModel):
 			# 	)
 
 			try:
-				screenshot_b64 = await self.take_screenshot()
+				screenshot = await self.capture_screenshot()
 			except Exception as e:
 				self.logger.warning(f'Failed to capture screenshot: {type(e).__name__}: {e}')
-				screenshot_b64 = None
+				screenshot = None
 
 			pixels_above, pixels_below = await self.get_scroll_info(page)
 
@@ -2680,7 +3197,7 @@ class BrowserSession(BaseModel):
 				url=page.url,
 				title=await page.title(),
 				tabs=tabs_info,
-				screenshot=screenshot_b64,
+				screenshot=screenshot,
 				pixels_above=pixels_above,
 				pixels_below=pixels_below,
 			)
@@ -2695,11 +3212,18 @@ class BrowserSession(BaseModel):
 
 	# region - Browser Actions
 	@require_initialization
-	@time_execution_async('--take_screenshot')
 	async def take_screenshot(self, full_page: bool = False) -> str:
 		"""
 		Returns a base64 encoded screenshot of the current page.
 		"""
+		return (await self.capture_screenshot(full_page=full_page)).base64
+
+	@require_initialization
+	@time_execution_async('--take_screenshot')
+	async def capture_screenshot(self, full_page: bool = False) -> Screenshot:
+		"""
+		Returns a Screenshot of the current page holding the raw PNG bytes (base64 is only encoded when needed).
+		"""
 		assert self.agent_current_page is not None, 'Agent current page is not set'
 
 		# page has already loaded by this point, this is just extra for previous action animations/frame loads to settle
@@ -2735,7 +3259,7 @@ class BrowserSession(BaseModel):
 			# Take screenshot using our retry-decorated method
 			# Don't pass clip parameter - let Playwright capture the full viewport
 			# It will automatically handle cases where viewport extends beyond page content
-			return await self._take_screenshot_hybrid(page)
+			return Screenshot(data=await self._take_screenshot_hybrid(page))
 		except Exception as e:
 			self.logger.error(f'❌ Failed to take screenshot after retries: {type(e).__name__}: {e}')
 			raise
@@ -2753,6 +3277,59 @@ class BrowserSession(BaseModel):
 			counter += 1
 		return new_filename
 
+	async def _setup_network_cache(self) -> None:
+		"""Record responses into / replay them from the network cache configured by browser_profile.network_cache_mode"""
+		if not self.browser_context:
+			return
+
+		# keep the same cache (and its counters) across reconnects
+		# loading the index (and importing a recorded HAR) reads the whole cache from disk, keep it off the event loop
+		self._network_cache = self._network_cache or await asyncio.to_thread(NetworkCache.from_profile, self.browser_profile)
+		if not self._network_cache:
+			return
+
+		try:
+			await self.browser_context.route('**/*', self._network_cache.handle_route)
+			self.logger.debug(
+				f'📼 Network cache in {self._network_cache.mode.value} mode ({len(self._network_cache)} cached responses '
+				f'in {_log_pretty_path(self._network_cache.cache_dir)}, fallthrough={self._network_cache.fallthrough})'
+			)
+		except Exception as e:
+			self.logger.warning(f'Failed to set up network cache: {type(e).__name__}: {e}')
+
+	@property
+	def network_cache_stats(self) -> dict[str, Any]:
+		"""Counters of the record/replay network cache, e.g. {'mode': 'replay', 'entries': 310, 'hits': 120, 'misses': 2, ...}"""
+		if not self._network_cache:
+			return {}
+		return self._network_cache.stats
+
+	async def _setup_request_blocking(self) -> None:
+		"""Abort requests matching browser_profile.block_resources / blocked_domains using context-level routing"""
+		if not self.browser_context:
+			return
+
+		# keep the same blocker (and its counters) across reconnects
+		self._request_blocker = self._request_blocker or RequestBlocker.from_profile(self.browser_profile)
+		if not self._request_blocker:
+			return
+
+		try:
+			await self.browser_context.route('**/*', self._request_blocker.handle_route)
+			self.logger.debug(
+				f'🚫 Blocking requests for resource classes={[c.value for c in self._request_blocker.block_resources]} '
+				f'({len(self._request_blocker.domain_trie)} blocked domains)'
+			)
+		except Exception as e:
+			self.logger.warning(f'Failed to set up request blocking: {type(e).__name__}: {e}')
+
+	@property
+	def blocked_request_stats(self) -> dict[str, Any]:
+		"""Counters of requests seen/blocked by the request blocker, e.g. {'total_requests': 120, 'total_blocked': 48, 'blocked': {'ads': 40, 'fonts': 8}}"""
+		if not self._request_blocker:
+			return {'total_requests': 0, 'total_blocked': 0, 'blocked': {}}
+		return self._request_blocker.stats
+
 	async def _start_context_tracing(self):
 		"""Start tracing on browser context if trace_path is configured."""
 		if self.browser_profile.traces_dir and self.browser_context:
@@ -3461,7 +4038,7 @@ class BrowserSession(BaseModel):
 		# DISABLED: This overlay blocks the entire browser view with a bouncing logo
 		# The user has specifically requested this be removed as it's annoying and unnecessary
 		return
-		
+
 		# Original code below is disabled:
 		if CONFIG.IS_IN_EVALS:
 			# dont bother wasting CPU showing animations during evals
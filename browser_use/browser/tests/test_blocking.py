@@ -0,0 +1,49 @@
+"""
+Tests for the compiled request blocking rules used by BrowserProfile(block_resources=[...]).
+"""
+
+from browser_use.browser.blocking import DomainSuffixTrie, RequestBlocker
+from browser_use.browser.profile import BlockedResourceClass, BrowserProfile
+
+
+def test_domain_suffix_trie_matches_subdomains_only_on_label_boundaries():
+	trie = DomainSuffixTrie(['doubleclick.net', '*.ads.example.com'])
+
+	assert trie.match('doubleclick.net') == 'doubleclick.net'
+	assert trie.match('stats.g.doubleclick.net') == 'doubleclick.net'
+	assert trie.match('ads.example.com') == 'ads.example.com'
+	assert trie.match('x.ads.example.com') == 'ads.example.com'
+
+	assert trie.match('notdoubleclick.net') is None
+	assert trie.match('example.com') is None
+	assert trie.match('net') is None
+	assert len(trie) == 2
+
+
+def test_request_blocker_classifies_and_counts():
+	blocker = RequestBlocker(block_resources=['ads', 'fonts'], blocked_domains=['cdn.junk.io'])
+
+	assert blocker.should_block('https://www.google-analytics.com/collect?v=1', 'xhr')
+	assert blocker.should_block('https://fonts.gstatic.com/s/roboto.woff2', 'font')
+	assert blocker.should_block('https://cdn.junk.io/widget.js', 'script')
+	assert not blocker.should_block('https://example.com/logo.png', 'image')
+	assert not blocker.should_block('data:image/png;base64,AAAA', 'image')
+
+	# never block the page the agent explicitly navigated to
+	assert not blocker.should_block('https://doubleclick.net/', 'document', is_main_frame_navigation=True)
+
+	assert blocker.stats == {'total_requests': 6, 'total_blocked': 3, 'blocked': {'ads': 2, 'fonts': 1}}
+
+
+def test_request_blocker_from_profile():
+	assert RequestBlocker.from_profile(BrowserProfile()) is None
+
+	blocker = RequestBlocker.from_profile(BrowserProfile(block_resources=['images', 'media']))
+	assert blocker is not None
+	assert blocker.block_resources == {BlockedResourceClass.IMAGES, BlockedResourceClass.MEDIA}
+	assert blocker.classify('https://example.com/a.mp4', 'media') == 'media'
+	assert blocker.classify('https://doubleclick.net/pixel', 'xhr') is None
+
+	blocker = RequestBlocker.from_profile(BrowserProfile(blocked_domains=['tracker.example.com']))
+	assert blocker is not None
+	assert blocker.classify('https://a.tracker.example.com/t.js', 'script') == 'domains'
@@ -0,0 +1,98 @@
+"""
+Tests for the running tab/scroll/cookie snapshot BrowserSession uses to recover after the browser crashes.
+"""
+
+import asyncio
+
+from browser_use.browser import BrowserProfile, BrowserSession
+
+
+class FakePage:
+	def __init__(self, url: str = 'about:blank'):
+		self.url = url
+		self.scrolled_to: int | None = None
+
+	async def goto(self, url: str, **kwargs):
+		self.url = url
+
+	async def evaluate(self, script: str, arg=None):
+		self.scrolled_to = arg
+
+	async def bring_to_front(self):
+		pass
+
+
+class FakeBrowserContext:
+	def __init__(self, pages: list[FakePage], cookies: list[dict] | None = None):
+		self.pages = pages
+		self._cookies = cookies or []
+
+	async def cookies(self):
+		return list(self._cookies)
+
+	async def add_cookies(self, cookies):
+		self._cookies.extend(cookies)
+
+	async def new_page(self):
+		page = FakePage()
+		self.pages.append(page)
+		return page
+
+
+def _attach(browser_session: BrowserSession, browser_context: FakeBrowserContext, agent_page: FakePage | None) -> None:
+	# bypass pydantic validation of the playwright object types
+	object.__setattr__(browser_session, 'browser_context', browser_context)
+	object.__setattr__(browser_session, 'agent_current_page', agent_page)
+
+
+def test_recovery_snapshot_tracks_tabs_scroll_and_cookies():
+	browser_session = BrowserSession(browser_profile=BrowserProfile(user_data_dir=None))
+	pages = [FakePage('https://example.com/'), FakePage('https://example.com/results')]
+	_attach(browser_session, FakeBrowserContext(pages, cookies=[{'name': 'sid', 'value': '1'}]), pages[1])
+	browser_session.initialized = True
+
+	asyncio.run(browser_session._checkpoint_recovery_snapshot(agent_scroll_y=800))
+	snapshot = browser_session._recovery_snapshot
+	assert snapshot == {
+		'urls': ['https://example.com/', 'https://example.com/results'],
+		'agent_tab_index': 1,
+		'scroll_positions': [0, 800],
+		'cookies': [{'name': 'sid', 'value': '1'}],
+	}
+
+	# a navigation in the other tab keeps the focused tab's scroll position and the cookies
+	pages[0].url = 'https://example.com/other'
+	browser_session._update_recovery_snapshot()
+	assert browser_session._recovery_snapshot['scroll_positions'] == [0, 800]
+	assert browser_session._recovery_snapshot['cookies'] == [{'name': 'sid', 'value': '1'}]
+
+	# the browser died and took its pages with it, the last good snapshot is kept
+	pages.clear()
+	browser_session._update_recovery_snapshot()
+	assert browser_session._recovery_snapshot['urls'] == ['https://example.com/other', 'https://example.com/results']
+
+
+def test_recover_from_snapshot_reopens_tabs_concurrently():
+	browser_session = BrowserSession(browser_profile=BrowserProfile(user_data_dir=None))
+	browser_session._recovery_snapshot = {
+		'urls': ['https://example.com/', 'https://example.com/results'],
+		'agent_tab_index': 1,
+		'scroll_positions': [0, 800],
+		'cookies': [{'name': 'sid', 'value': '1'}],
+	}
+
+	# the relaunched browser starts with a single blank tab
+	browser_context = FakeBrowserContext([FakePage()])
+	_attach(browser_session, browser_context, None)
+
+	assert asyncio.run(browser_session._recover_from_snapshot()) == 2
+	assert [page.url for page in browser_context.pages] == ['https://example.com/', 'https://example.com/results']
+	assert browser_context.pages[1].scrolled_to == 800
+	assert browser_context._cookies == [{'name': 'sid', 'value': '1'}]
+	assert browser_session.agent_current_page is browser_context.pages[1]
+	assert browser_session._recovery_snapshot is None
+
+	# reconnecting to a browser that kept its tabs (e.g. via cdp_url) leaves them alone
+	browser_session._recovery_snapshot = {'urls': ['https://example.com/'], 'agent_tab_index': 0}
+	_attach(browser_session, FakeBrowserContext([FakePage('https://still-open.com/')]), None)
+	assert asyncio.run(browser_session._recover_from_snapshot()) == 0
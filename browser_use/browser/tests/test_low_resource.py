@@ -0,0 +1,39 @@
+"""
+Tests for the BrowserProfile(low_resource=True) preset, which only fills in options the user didn't set explicitly.
+"""
+
+from browser_use.browser.profile import BrowserChannel, BrowserProfile, ServiceWorkers
+
+
+def test_low_resource_preset_defaults():
+	profile = BrowserProfile(low_resource=True)
+
+	assert profile.headless is True
+	assert profile.channel == BrowserChannel.CHROMIUM_HEADLESS_SHELL
+	assert profile.device_scale_factor == 1.0
+	assert profile.service_workers == ServiceWorkers.BLOCK
+	assert '--disable-gpu' in profile.get_args()
+	assert not any(arg.startswith('--force-device-scale-factor') for arg in profile.get_args())
+
+
+def test_low_resource_preset_keeps_explicit_overrides():
+	profile = BrowserProfile(low_resource=True, device_scale_factor=2, service_workers='allow')
+
+	assert profile.device_scale_factor == 2
+	assert profile.service_workers == ServiceWorkers.ALLOW
+
+	# deterministic_rendering's scale factor is the only one on the command line
+	args = BrowserProfile(low_resource=True, deterministic_rendering=True).get_args()
+	assert [arg for arg in args if arg.startswith('--force-device-scale-factor')] == ['--force-device-scale-factor=2']
+
+
+def test_low_resource_preset_only_picks_the_headless_shell_when_nothing_else_was_chosen():
+	assert BrowserProfile(low_resource=True, channel='chrome').channel == BrowserChannel.CHROME
+	assert (
+		BrowserProfile(low_resource=True, executable_path='/usr/bin/chromium').channel != BrowserChannel.CHROMIUM_HEADLESS_SHELL
+	)
+	assert BrowserProfile(low_resource=True, stealth=True).channel != BrowserChannel.CHROMIUM_HEADLESS_SHELL
+
+	headful = BrowserProfile(low_resource=True, headless=False)
+	assert headful.headless is False
+	assert headful.channel != BrowserChannel.CHROMIUM_HEADLESS_SHELL
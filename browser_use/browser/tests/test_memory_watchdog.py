@@ -0,0 +1,172 @@
+"""
+Tests for the memory watchdog that recycles the browser between agent steps once it goes over memory_budget_mb.
+"""
+
+import asyncio
+
+from browser_use.browser import BrowserProfile, BrowserSession
+
+
+class FakePage:
+	def __init__(self, url: str = 'about:blank'):
+		self.url = url
+		self.scrolled_to: int | None = None
+
+	async def goto(self, url: str, **kwargs):
+		self.url = url
+
+	async def evaluate(self, script: str, arg=None):
+		self.scrolled_to = arg
+
+	async def bring_to_front(self):
+		pass
+
+
+class FakeBrowserContext:
+	def __init__(self, pages: list[FakePage], cookies: list[dict] | None = None):
+		self.pages = pages
+		self._cookies = cookies or []
+
+	async def cookies(self):
+		return list(self._cookies)
+
+	async def add_cookies(self, cookies):
+		self._cookies.extend(cookies)
+
+	async def new_page(self):
+		page = FakePage()
+		self.pages.append(page)
+		return page
+
+
+def _attach(browser_session: BrowserSession, browser_context: FakeBrowserContext | None, agent_page: FakePage | None) -> None:
+	# bypass pydantic validation of the playwright object types
+	object.__setattr__(browser_session, 'browser_context', browser_context)
+	object.__setattr__(browser_session, 'agent_current_page', agent_page)
+
+
+def _browser_session(**profile_kwargs) -> BrowserSession:
+	return BrowserSession(
+		browser_profile=BrowserProfile(user_data_dir=None, memory_budget_mb=500, memory_check_interval=0.01, **profile_kwargs)
+	)
+
+
+def test_watchdog_samples_memory_and_requests_a_recycle_over_budget(monkeypatch):
+	samples = [200.0, None, 450.0, 700.0, 800.0]
+	monkeypatch.setattr(BrowserSession, '_get_browser_memory_usage_mb', lambda self: samples.pop(0) if samples else 800.0)
+	browser_session = _browser_session()
+
+	async def run():
+		browser_session._start_memory_watchdog()
+		task = browser_session._memory_watchdog_task
+		browser_session._start_memory_watchdog()  # already running, not started twice
+		assert browser_session._memory_watchdog_task is task
+
+		for _ in range(200):
+			if not samples:
+				break
+			await asyncio.sleep(0.01)
+		await asyncio.sleep(0.05)
+		browser_session._stop_memory_watchdog()
+		await asyncio.sleep(0)
+		assert task is not None and task.cancelled()
+
+	asyncio.run(run())
+	stats = browser_session.memory_watchdog_stats
+	assert stats['memory_usage_mb'] == 800.0
+	assert stats['budget_mb'] == 500
+	assert stats['recycle_requested'] is True
+	assert stats['recycles'] == []
+
+
+def test_recycle_is_only_triggered_when_the_watchdog_requested_it(monkeypatch):
+	recycled = []
+
+	async def fake_recycle_browser(self, _reason: str = ''):
+		recycled.append(_reason)
+		return {}
+
+	monkeypatch.setattr(BrowserSession, 'recycle_browser', fake_recycle_browser)
+	browser_session = _browser_session()
+
+	assert asyncio.run(browser_session.recycle_if_over_memory_budget()) is False
+	assert recycled == []
+
+	browser_session._memory_recycle_requested = True
+	assert asyncio.run(browser_session.recycle_if_over_memory_budget()) is True
+	assert recycled == ['over memory_budget_mb=500']
+	assert browser_session._memory_recycle_requested is False
+
+	# the request is consumed, the next step doesn't recycle again
+	assert asyncio.run(browser_session.recycle_if_over_memory_budget()) is False
+
+
+def test_recycle_restarts_the_browser_and_restores_tabs_scroll_and_cookies(monkeypatch):
+	memory_samples = [900.0, 150.0]
+	monkeypatch.setattr(BrowserSession, '_get_browser_memory_usage_mb', lambda self: memory_samples.pop(0))
+
+	async def noop(self, *args, **kwargs):
+		pass
+
+	for method in ('save_storage_state', '_close_browser_context', '_close_browser'):
+		monkeypatch.setattr(BrowserSession, method, noop)
+
+	relaunched_context = FakeBrowserContext([FakePage()])  # the relaunched browser starts with a single blank tab
+
+	async def fake_start(self):
+		_attach(self, relaunched_context, relaunched_context.pages[0])
+		self.initialized = True
+		return self
+
+	monkeypatch.setattr(BrowserSession, 'start', fake_start)
+
+	browser_session = _browser_session()
+	pages = [FakePage('https://example.com/'), FakePage('https://example.com/cart')]
+	_attach(browser_session, FakeBrowserContext(pages, cookies=[{'name': 'sid', 'value': '1'}]), pages[1])
+	browser_session.initialized = True
+	browser_session._update_recovery_snapshot(agent_scroll_y=600)
+
+	metrics = asyncio.run(browser_session.recycle_browser(_reason='test'))
+
+	assert [page.url for page in relaunched_context.pages] == ['https://example.com/', 'https://example.com/cart']
+	assert relaunched_context.pages[1].scrolled_to == 600
+	assert relaunched_context._cookies == [{'name': 'sid', 'value': '1'}]
+	assert browser_session.agent_current_page is relaunched_context.pages[1]
+	assert metrics['tabs_restored'] == 2
+	assert (metrics['memory_before_mb'], metrics['memory_after_mb']) == (900.0, 150.0)
+	assert browser_session.memory_watchdog_stats['recycles'] == [metrics]
+
+
+def test_keep_alive_stop_keeps_the_watchdog_and_the_next_start_restarts_it(monkeypatch):
+	monkeypatch.setattr(BrowserSession, '_get_browser_memory_usage_mb', lambda self: 100.0)
+
+	async def connected(self, restart: bool = True):
+		return True
+
+	monkeypatch.setattr(BrowserSession, 'is_connected', connected)
+	browser_session = _browser_session(keep_alive=True)
+	snapshot = {'urls': ['https://example.com/'], 'agent_tab_index': 0, 'scroll_positions': [0], 'cookies': []}
+
+	async def run():
+		browser_session.initialized = True
+		browser_session._start_memory_watchdog()
+		browser_session._recovery_snapshot = snapshot
+
+		# e.g. Agent.close() on a browser that is reused by the next agent
+		await browser_session.stop()
+		assert browser_session._memory_watchdog_task is not None and not browser_session._memory_watchdog_task.done()
+		assert browser_session._recovery_snapshot is snapshot
+
+		# a watchdog that stopped anyway is restarted by the quick-return path of start()
+		browser_session._stop_memory_watchdog()
+		assert await browser_session.start() is browser_session
+		assert browser_session._memory_watchdog_task is not None and not browser_session._memory_watchdog_task.done()
+
+		# a real shutdown stops it and drops the snapshot
+		browser_session.browser_profile.keep_alive = False
+		browser_session._owns_browser_resources = False  # nothing to close, just reset the references
+		await browser_session.stop()
+		assert browser_session._memory_watchdog_task is None
+		assert browser_session._recovery_snapshot is None
+
+	asyncio.run(run())
@@ -0,0 +1,71 @@
+"""
+Tests for the content-addressed record/replay network cache used by BrowserProfile(network_cache_mode=...).
+"""
+
+import base64
+import json
+
+from browser_use.browser.network_cache import NetworkCache, get_request_key
+
+
+def test_network_cache_roundtrip_and_dedupes_bodies(tmp_path):
+	cache = NetworkCache(tmp_path, mode='record')
+	cache.put(
+		'GET', 'https://example.com/a.js', None, 200, {'Content-Type': 'text/javascript', 'Content-Encoding': 'gzip'}, b'x=1'
+	)
+	cache.put('GET', 'https://example.com/b.js#frag', None, 200, {'Content-Type': 'text/javascript'}, b'x=1')
+	cache.put('POST', 'https://example.com/api', b'{"q": 1}', 201, {}, b'{"ok": true}')
+
+	# identical bodies are only stored once
+	assert len(list((tmp_path / 'blobs').rglob('*'))) == 2 + 2  # 2 blobs + their 2 prefix dirs
+
+	# a fresh instance replays from the on-disk index
+	replay = NetworkCache(tmp_path, mode='replay', fallthrough=False)
+	assert len(replay) == 3
+
+	entry, body = replay.get('GET', 'https://example.com/a.js')
+	assert body == b'x=1'
+	assert entry['headers'] == {'Content-Type': 'text/javascript'}  # body is stored decoded
+
+	assert replay.get('GET', 'https://example.com/b.js')[1] == b'x=1'  # fragment is ignored
+	assert replay.get('POST', 'https://example.com/api', b'{"q": 1}')[0]['status'] == 201
+	assert replay.get('POST', 'https://example.com/api', b'{"q": 2}') is None
+	assert replay.get('GET', 'https://example.com/missing') is None
+
+
+def test_network_cache_import_har(tmp_path):
+	har = {
+		'log': {
+			'entries': [
+				{
+					'request': {'method': 'GET', 'url': 'https://example.com/'},
+					'response': {
+						'status': 200,
+						'headers': [{'name': 'content-type', 'value': 'text/html'}],
+						'content': {'text': '<h1>hi</h1>'},
+					},
+				},
+				{
+					'request': {'method': 'GET', 'url': 'https://example.com/logo.png'},
+					'response': {
+						'status': 200,
+						'headers': [],
+						'content': {'text': base64.b64encode(b'\x89PNG').decode(), 'encoding': 'base64'},
+					},
+				},
+				{'request': {'method': 'GET', 'url': 'https://example.com/omitted'}, 'response': {'status': 200, 'content': {}}},
+			]
+		}
+	}
+	har_path = tmp_path / 'run.har'
+	har_path.write_text(json.dumps(har))
+
+	cache = NetworkCache(tmp_path / 'cache', mode='replay')
+	assert cache.import_har(har_path) == 2
+	assert cache.get('GET', 'https://example.com/')[1] == b'<h1>hi</h1>'
+	assert cache.get('GET', 'https://example.com/logo.png')[1] == b'\x89PNG'
+
+	# re-importing the same HAR does not grow the index
+	cache.import_har(har_path)
+	assert len((tmp_path / 'cache' / 'index.jsonl').read_text().splitlines()) == 2
+	assert get_request_key('get', 'https://example.com/') == get_request_key('GET', 'https://example.com/#top')
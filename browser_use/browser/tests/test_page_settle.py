@@ -0,0 +1,108 @@
+"""
+Tests for the adaptive page settle that replaces the fixed waits between actions and before capturing page state.
+"""
+
+import asyncio
+import time
+
+from browser_use.browser import BrowserProfile, BrowserSession
+
+
+class FakeRequest:
+	def __init__(self, url: str, resource_type: str = 'script'):
+		self.url = url
+		self.resource_type = resource_type
+		self.headers = {}
+
+
+class FakeResponse:
+	def __init__(self, request: FakeRequest):
+		self.request = request
+		self.headers = {'content-type': 'application/javascript'}
+
+
+class FakePage:
+	"""Page whose DOM keeps mutating until busy_until, and that reports running CSS transitions until transitions_until"""
+
+	def __init__(self, busy_for: float = 0.0, transitions_for: float = 0.0):
+		now = time.monotonic()
+		self.busy_until = now + busy_for
+		self.transitions_until = now + transitions_for
+		self.listeners = {}
+		self.probes = 0
+
+	def is_closed(self) -> bool:
+		return False
+
+	def on(self, event: str, handler):
+		self.listeners[event] = handler
+
+	def remove_listener(self, event: str, handler):
+		assert self.listeners.pop(event) is handler
+
+	async def evaluate(self, script: str, arg=None):
+		self.probes += 1
+		now = time.monotonic()
+		return {
+			'msSinceMutation': max(now - self.busy_until, 0) * 1000,
+			'runningTransitions': 1 if now < self.transitions_until else 0,
+		}
+
+
+def _session_on(page: FakePage, **profile_kwargs) -> BrowserSession:
+	browser_session = BrowserSession(browser_profile=BrowserProfile(user_data_dir=None, **profile_kwargs))
+
+	async def get_current_page():
+		return page
+
+	object.__setattr__(browser_session, 'get_current_page', get_current_page)
+	return browser_session
+
+
+async def test_settle_returns_once_the_page_is_quiet_instead_of_sleeping_the_full_wait():
+	quiet_page = FakePage()
+	waited = await _session_on(quiet_page).wait_for_page_settle(max_wait=2.0, quiet_time=0.05)
+	assert waited < 0.5
+	assert quiet_page.listeners == {}  # network listeners are removed again
+
+	busy_page = FakePage(busy_for=0.2, transitions_for=0.3)
+	waited = await _session_on(busy_page).wait_for_page_settle(max_wait=2.0, quiet_time=0.05)
+	assert 0.3 <= waited < 1.0
+
+	never_quiet = FakePage(busy_for=60)
+	waited = await _session_on(never_quiet).wait_for_page_settle(max_wait=0.3, quiet_time=0.05)
+	assert 0.3 <= waited < 0.6
+
+
+async def test_settle_stops_waiting_for_a_continuously_mutating_page_once_the_network_is_idle():
+	ticker_page = FakePage(busy_for=60)
+	waited = await _session_on(ticker_page, settle_max_dom_wait=0.3).wait_for_page_settle(max_wait=5.0, quiet_time=0.05)
+	assert 0.3 <= waited < 0.6
+
+	# while requests are still pending the DOM is given the full max_wait
+	browser_session = _session_on(ticker_page, settle_max_dom_wait=0.3)
+	settle = asyncio.create_task(browser_session.wait_for_page_settle(max_wait=5.0, quiet_time=0.05))
+	await asyncio.sleep(0.01)
+	bundle = FakeRequest('https://example.com/app.js')
+	await ticker_page.listeners['request'](bundle)
+	await asyncio.sleep(0.5)
+	assert not settle.done()
+
+	await ticker_page.listeners['response'](FakeResponse(bundle))
+	assert 0.8 <= await settle < 1.2
+
+
+async def test_settle_waits_for_tracked_requests_but_ignores_analytics():
+	page = FakePage()
+	browser_session = _session_on(page)
+	settle = asyncio.create_task(browser_session.wait_for_page_settle(max_wait=2.0, quiet_time=0.05))
+	await asyncio.sleep(0.01)
+
+	await page.listeners['request'](FakeRequest('https://www.google-analytics.com/collect'))
+	bundle = FakeRequest('https://example.com/app.js')
+	await page.listeners['request'](bundle)
+	await asyncio.sleep(0.3)
+	assert not settle.done()
+
+	await page.listeners['response'](FakeResponse(bundle))
+	assert await settle < 0.6
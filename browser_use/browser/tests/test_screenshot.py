@@ -0,0 +1,143 @@
+"""
+Tests for the bytes-first Screenshot type used in BrowserStateSummary / BrowserStateHistory.
+"""
+
+import base64
+import io
+
+from browser_use.agent.prompts import AgentMessagePrompt
+from browser_use.agent.views import AgentHistory, AgentHistoryList, AgentState
+from browser_use.browser.views import BrowserStateHistory, Screenshot
+
+PNG_BYTES = b'\x89PNG\r\n\x1a\n' + b'\x00' * 64
+
+
+def test_screenshot_lazy_encodings_and_equality():
+	screenshot = Screenshot(data=PNG_BYTES)
+	screenshot_b64 = base64.b64encode(PNG_BYTES).decode()
+
+	assert screenshot.base64 == screenshot_b64
+	assert screenshot.base64 is screenshot.base64  # memoized
+	assert screenshot.data_url == f'data:image/png;base64,{screenshot_b64}'
+	assert str(screenshot) == screenshot_b64  # backwards compatible with code expecting a base64 str
+
+	assert Screenshot.from_base64(screenshot_b64) == screenshot
+	assert Screenshot.validate(screenshot_b64).data == PNG_BYTES
+	assert screenshot != Screenshot(data=b'other')
+
+
+def test_screenshot_spill_keeps_only_path_in_memory(tmp_path):
+	screenshot = Screenshot(data=PNG_BYTES)
+	screenshot.data_url
+	screenshot.spill(tmp_path)
+
+	assert screenshot.is_spilled
+	assert screenshot.path == tmp_path / f'{screenshot.sha256}.png'
+	assert screenshot._data is None and screenshot._base64 is None and screenshot._data_url is None
+	assert screenshot.data == PNG_BYTES
+	assert screenshot.base64 == base64.b64encode(PNG_BYTES).decode()
+
+	# identical screenshots are only written once
+	Screenshot(data=PNG_BYTES).spill(tmp_path)
+	assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_history_serializes_spilled_screenshots_as_file_references(tmp_path):
+	spilled = Screenshot(data=PNG_BYTES).spill(tmp_path)
+	history = AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=None,
+				result=[],
+				state=BrowserStateHistory(
+					url='https://example.com', title='', tabs=[], interacted_element=[None], screenshot=spilled
+				),
+			),
+			AgentHistory(
+				model_output=None,
+				result=[],
+				state=BrowserStateHistory(url='about:blank', title='', tabs=[], interacted_element=[None], screenshot=None),
+			),
+		]
+	)
+
+	dumped = history.model_dump()
+	assert dumped['history'][0]['state']['screenshot'] == {
+		'path': str(spilled.path),
+		'sha256': spilled.sha256,
+		'media_type': 'image/png',
+	}
+
+	restored = AgentHistoryList.model_validate(dumped)
+	assert restored.screenshots() == [spilled, None]
+	assert restored.screenshots()[0].data == PNG_BYTES
+
+	# pydantic-native serialization (e.g. AgentState.model_dump_json()) uses the same file reference
+	assert spilled.sha256 in AgentState(history=history).model_dump_json()
+
+
+def _form_png(
+	filled: bool = False, checked: bool = False, cursor: bool = False, typed: str = '', jpeg: bool = False
+) -> Screenshot:
+	"""
+	A signup form: empty, with its fields filled in, its checkbox ticked, or text typed and/or a text cursor in the first field
+	"""
+	from PIL import Image, ImageDraw, ImageFont
+
+	font = ImageFont.load_default(size=16)
+	image = Image.new('RGB', (1280, 1100), 'white')
+	draw = ImageDraw.Draw(image)
+	draw.rectangle((0, 0, 1280, 60), fill=(30, 60, 120))
+	draw.text((20, 20), 'Acme Signup', fill='white', font=font)
+	values = {'First name': 'John', 'Last name': 'Doe', 'Email': 'john.doe@example', 'Phone': '555-0100', 'City': 'Springfield'}
+	for i, (label, value) in enumerate(values.items()):
+		y = 120 + i * 80
+		draw.text((100, y), label, fill=(60, 60, 60), font=font)
+		draw.rectangle((100, y + 22, 500, y + 56), outline=(180, 180, 180))
+		if filled:
+			draw.text((108, y + 30), value, fill='black', font=font)
+	if typed:
+		draw.text((108, 150), typed, fill='black', font=font)
+	if cursor:
+		caret_x = 108 + round(draw.textlength(typed, font=font)) + 1
+		draw.line((caret_x, 148, caret_x, 170), fill='black')
+	draw.rectangle((100, 540, 116, 556), outline=(120, 120, 120))
+	if checked:
+		draw.line((103, 548, 107, 553), fill='black', width=2)
+		draw.line((107, 553, 114, 543), fill='black', width=2)
+	draw.text((124, 540), 'I agree to the terms', fill='black', font=font)
+	buffer = io.BytesIO()
+	image.save(buffer, format='JPEG' if jpeg else 'PNG', quality=90)
+	return Screenshot(data=buffer.getvalue(), media_type='image/jpeg' if jpeg else 'image/png')
+
+
+def test_near_duplicates_ignore_encoding_noise_but_not_form_input():
+	empty_form = _form_png()
+
+	assert empty_form.fingerprint is not None and empty_form.fingerprint is empty_form.fingerprint  # computed once
+	assert empty_form.is_near_duplicate(_form_png())
+	assert empty_form.is_near_duplicate(_form_png(jpeg=True))  # re-encoded, same page
+
+	# typing or ticking a checkbox are changes the model needs to see
+	assert not empty_form.is_near_duplicate(_form_png(filled=True))
+	assert not empty_form.is_near_duplicate(_form_png(checked=True))
+	assert not _form_png(filled=True).is_near_duplicate(_form_png(filled=True, checked=True))
+
+
+def test_near_duplicates_ignore_a_blinking_cursor_but_not_a_typed_character():
+	assert _form_png(typed='Jo', cursor=True).is_near_duplicate(_form_png(typed='Jo'))
+	assert _form_png(typed='Jo', cursor=True).is_near_duplicate(_form_png(typed='Jo', jpeg=True))
+	assert _form_png().is_near_duplicate(_form_png(cursor=True))
+
+	for typed in ('J', 'Jo', 'Joh', 'i', 'l'):
+		assert not _form_png(typed=typed[:-1], cursor=True).is_near_duplicate(_form_png(typed=typed, cursor=True)), typed
+		assert not _form_png(typed=typed[:-1]).is_near_duplicate(_form_png(typed=typed, cursor=True)), typed
+
+
+def test_only_the_most_recent_of_consecutive_near_duplicates_is_sent_to_the_llm():
+	before, before_again, after = _form_png(), _form_png(jpeg=True), _form_png(filled=True)
+
+	prompt = AgentMessagePrompt.__new__(AgentMessagePrompt)
+	assert prompt._deduplicate_screenshots([before, after]) == [before, after]  # the "before" image is kept
+	assert prompt._deduplicate_screenshots([before, before_again, after]) == [before_again, after]
+	assert prompt._deduplicate_screenshots([after, before, before_again]) == [after, before_again]
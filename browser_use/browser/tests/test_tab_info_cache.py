@@ -0,0 +1,120 @@
+"""
+Tests for the per-page (url, title) cache that lets BrowserSession.get_tabs_info() answer without CDP round trips.
+"""
+
+import asyncio
+
+from browser_use.browser import BrowserProfile, BrowserSession
+
+
+class FakeFrame:
+	def __init__(self, page: 'FakePage', url: str):
+		self.page = page
+		self.url = url
+		self.parent_frame = None
+
+
+class FakePage:
+	def __init__(self, url: str, title: str, title_delay: float = 0.0):
+		self.url = url
+		self._title = title
+		self.title_delay = title_delay
+		self.title_calls = 0
+		self.closes_while_fetching_title = False
+		self._closed = False
+		self._handlers: dict[str, list] = {}
+
+	def on(self, event: str, handler) -> None:
+		self._handlers.setdefault(event, []).append(handler)
+
+	def emit(self, event: str, arg) -> None:
+		for handler in self._handlers.get(event, []):
+			handler(arg)
+
+	def is_closed(self) -> bool:
+		return self._closed
+
+	async def title(self) -> str:
+		self.title_calls += 1
+		await asyncio.sleep(self.title_delay)
+		if self.closes_while_fetching_title:
+			self._closed = True
+			self.emit('close', self)
+			raise RuntimeError('Target page, context or browser has been closed')
+		return self._title
+
+	def navigate(self, url: str, title: str) -> None:
+		self.url = url
+		self._title = title
+		self.emit('framenavigated', FakeFrame(self, url))
+
+
+class FakeBrowserContext:
+	def __init__(self, pages: list[FakePage]):
+		self.pages = pages
+		self.bindings: dict = {}
+
+	def on(self, event: str, handler) -> None:
+		pass
+
+	async def expose_binding(self, name: str, callback) -> None:
+		self.bindings[name] = callback
+
+	async def add_init_script(self, script: str) -> None:
+		pass
+
+
+async def _browser_session(pages: list[FakePage]) -> tuple[BrowserSession, FakeBrowserContext]:
+	browser_session = BrowserSession(browser_profile=BrowserProfile(user_data_dir=None))
+	browser_context = FakeBrowserContext(pages)
+	# bypass pydantic validation of the playwright object types
+	object.__setattr__(browser_session, 'browser_context', browser_context)
+	object.__setattr__(browser_session, 'agent_current_page', pages[0])
+	browser_session.initialized = True
+	await browser_session._setup_tab_info_cache()
+	return browser_session, browser_context
+
+
+async def test_tab_titles_are_fetched_concurrently_once_then_served_from_the_cache():
+	pages = [FakePage(f'https://example.com/{i}', f'Page {i}', title_delay=0.2) for i in range(3)]
+	browser_session, browser_context = await _browser_session(pages)
+
+	# cache misses are fetched with one asyncio.gather, so 3 tabs take about as long as 1
+	started = asyncio.get_running_loop().time()
+	tabs = await browser_session.get_tabs_info()
+	assert asyncio.get_running_loop().time() - started < 0.4
+	assert [(tab.page_id, tab.url, tab.title) for tab in tabs] == [(i, f'https://example.com/{i}', f'Page {i}') for i in range(3)]
+	assert [page.title_calls for page in pages] == [1, 1, 1]
+
+	# served from the cache, no round trips
+	await browser_session.get_tabs_info()
+	assert [page.title_calls for page in pages] == [1, 1, 1]
+
+	# a full navigation invalidates the title, a same-document navigation keeps it
+	pages[0].navigate('https://example.com/other', 'Other page')
+	pages[1].navigate('https://example.com/1#section', 'Page 1')
+	tabs = await browser_session.get_tabs_info()
+	assert [tab.title for tab in tabs] == ['Other page', 'Page 1', 'Page 2']
+	assert [page.title_calls for page in pages] == [2, 1, 1]
+
+	# title changes are pushed by the <title> observer in the page
+	browser_context.bindings['_BrowserUseonTitleChange']({'page': pages[2]}, {'url': pages[2].url, 'title': '(1) Page 2'})
+	tabs = await browser_session.get_tabs_info()
+	assert tabs[2].title == '(1) Page 2'
+	assert [page.title_calls for page in pages] == [2, 1, 1]
+
+
+async def test_a_tab_closing_while_its_title_is_fetched_does_not_fail_the_others():
+	pages = [FakePage(f'https://example.com/{i}', f'Page {i}', title_delay=0.05) for i in range(3)]
+	pages[1].closes_while_fetching_title = True
+	browser_session, _ = await _browser_session(pages)
+
+	tabs = await browser_session.get_tabs_info()
+
+	assert [(tab.url, tab.title) for tab in tabs] == [
+		('https://example.com/0', 'Page 0'),
+		('about:blank', 'ignore this tab and do not use it'),
+		('https://example.com/2', 'Page 2'),
+	]
+	assert pages[1] not in browser_session._tab_info_cache  # dropped by the page's close event
+	assert pages[0] in browser_session._tab_info_cache and pages[2] in browser_session._tab_info_cache
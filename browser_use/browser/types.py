@@ -9,6 +9,7 @@ from patchright.async_api import ElementHandle as PatchrightElementHandle
 from patchright.async_api import FrameLocator as PatchrightFrameLocator
 from patchright.async_api import Page as PatchrightPage
 from patchright.async_api import Playwright as Patchright
+from patchright.async_api import Route as PatchrightRoute
 from patchright.async_api import async_playwright as _async_patchright
 from playwright._impl._errors import TargetClosedError as PlaywrightTargetClosedError
 from playwright.async_api import Browser as PlaywrightBrowser
@@ -17,6 +18,7 @@ from playwright.async_api import ElementHandle as PlaywrightElementHandle
 from playwright.async_api import FrameLocator as PlaywrightFrameLocator
 from playwright.async_api import Page as PlaywrightPage
 from playwright.async_api import Playwright as Playwright
+from playwright.async_api import Route as PlaywrightRoute
 from playwright.async_api import async_playwright as _async_playwright
 
 # Define types to be Union[Patchright, Playwright]
@@ -25,6 +27,7 @@ BrowserContext = PatchrightBrowserContext | PlaywrightBrowserContext
 Page = PatchrightPage | PlaywrightPage
 ElementHandle = PatchrightElementHandle | PlaywrightElementHandle
 FrameLocator = PatchrightFrameLocator | PlaywrightFrameLocator
+Route = PatchrightRoute | PlaywrightRoute
 Playwright = Playwright
 Patchright = Patchright
 PlaywrightOrPatchright = Patchright | Playwright
@@ -1,8 +1,14 @@
+import base64
+import hashlib
+from collections.abc import Callable, Hashable
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, GetCoreSchemaHandler
+from pydantic_core import core_schema
 
+from browser_use.browser import image_fingerprint
 from browser_use.dom.history_tree_processor.service import DOMHistoryElement
 from browser_use.dom.views import DOMState
 
@@ -17,6 +23,182 @@ class TabInfo(BaseModel):
 	parent_page_id: int | None = None  # parent page that contains this popup or cross-origin iframe
 
 
+class Screenshot:
+	"""
+	A screenshot stored once as raw image bytes.
+
+	The base64 and data URL encodings are only computed when first needed and then memoized,
+	and the bytes can be spilled to disk with spill(directory) so only the file path + hash stay in memory.
+	Re-encoded variants (e.g. resized for an LLM provider) are cached per screenshot with get_variant(), and the fingerprint
+	used to spot near-duplicate screenshots is computed once.
+	str(screenshot) returns the base64 encoding for backwards compatibility with code that expects a base64 str.
+	"""
+
+	__slots__ = ('_data', '_path', '_sha256', '_fingerprint', '_base64', '_data_url', '_variants', 'media_type')
+
+	def __init__(
+		self,
+		data: bytes | None = None,
+		path: str | Path | None = None,
+		sha256: str | None = None,
+		media_type: str = 'image/png',
+	):
+		assert data is not None or path is not None, 'Screenshot needs either raw bytes or a path to a spilled image file'
+		self._data = data
+		self._path = Path(path) if path is not None else None
+		self._sha256 = sha256
+		self._fingerprint: bytes | None = None  # b'' if it can't be computed
+		self._base64: str | None = None
+		self._data_url: str | None = None
+		self._variants: dict[Hashable, 'Screenshot'] = {}
+		self.media_type = media_type
+
+	@classmethod
+	def from_base64(cls, screenshot_b64: str, media_type: str = 'image/png') -> 'Screenshot':
+		screenshot = cls(data=base64.b64decode(screenshot_b64), media_type=media_type)
+		screenshot._base64 = screenshot_b64
+		return screenshot
+
+	@property
+	def data(self) -> bytes:
+		"""Raw image bytes (read back from disk if the screenshot was spilled)"""
+		data = self._data  # read once, spill() may clear it from the step bookkeeping thread
+		if data is not None:
+			return data
+		assert self._path is not None
+		return self._path.read_bytes()
+
+	@property
+	def path(self) -> Path | None:
+		return self._path
+
+	@property
+	def is_spilled(self) -> bool:
+		return self._data is None
+
+	@property
+	def sha256(self) -> str:
+		if self._sha256 is None:
+			self._sha256 = hashlib.sha256(self.data).hexdigest()
+		return self._sha256
+
+	@property
+	def fingerprint(self) -> bytes | None:
+		"""Grayscale thumbnail of the image (see browser_use.browser.image_fingerprint), None if pillow is not installed"""
+		if self._fingerprint is None:
+			self._fingerprint = image_fingerprint.fingerprint(self.data) or b''
+		return self._fingerprint or None
+
+	def is_near_duplicate(
+		self, other: 'Screenshot', max_difference: int = image_fingerprint.NEAR_DUPLICATE_MAX_DIFFERENCE
+	) -> bool:
+		"""
+		Whether other looks the same, give or take rendering/encoding noise and a blinking text cursor
+		(exact match without pillow)
+		"""
+		if self == other:
+			return True
+		if self.fingerprint is None or other.fingerprint is None or len(self.fingerprint) != len(other.fingerprint):
+			return False
+		changed_cells = image_fingerprint.changed_cells(self.fingerprint, other.fingerprint, max_difference)
+		return image_fingerprint.text_cursor_only(self.data, other.data, changed_cells)
+
+	@property
+	def base64(self) -> str:
+		screenshot_b64 = self._base64
+		if screenshot_b64 is not None:
+			return screenshot_b64
+		screenshot_b64 = base64.b64encode(self.data).decode('utf-8')
+		if not self.is_spilled:
+			self._base64 = screenshot_b64
+		return screenshot_b64
+
+	@property
+	def data_url(self) -> str:
+		data_url = self._data_url
+		if data_url is not None:
+			return data_url
+		data_url = f'data:{self.media_type};base64,{self.base64}'
+		if not self.is_spilled:
+			self._data_url = data_url
+		return data_url
+
+	def get_variant(self, key: Hashable, encode: Callable[['Screenshot'], 'Screenshot']) -> 'Screenshot':
+		"""The variant of this screenshot produced by encode(self), encoded once per key (kept in memory until spilled)"""
+		variant = self._variants.get(key)
+		if variant is None:
+			variant = encode(self)
+			if not self.is_spilled:
+				self._variants[key] = variant
+		return variant
+
+	def save(self, directory: str | Path) -> Path:
+		"""Write the image to <directory>/<sha256>.<ext> (once per unique image) without dropping it from memory"""
+		directory = Path(directory)
+		directory.mkdir(parents=True, exist_ok=True)
+		extension = self.media_type.split('/')[-1].replace('jpeg', 'jpg')
+		path = directory / f'{self.sha256}.{extension}'
+		if not path.exists():
+			tmp_path = path.with_suffix('.tmp')
+			tmp_path.write_bytes(self.data)
+			tmp_path.replace(path)
+		return path
+
+	def spill(self, directory: str | Path) -> 'Screenshot':
+		"""Write the image to <directory>/<sha256>.<ext> (once per unique image) and drop the in-memory bytes + encodings"""
+		if self.is_spilled:
+			return self
+		self._path = self.save(directory)
+		self._data = None
+		self._base64 = None
+		self._data_url = None
+		self._variants = {}
+		return self
+
+	def to_json(self) -> str | dict[str, str]:
+		"""Serialized form used in history files: a file reference if spilled, otherwise the inline base64 string"""
+		if self._path is not None:
+			return {'path': str(self._path), 'sha256': self.sha256, 'media_type': self.media_type}
+		return self.base64
+
+	@classmethod
+	def validate(cls, value: Any) -> 'Screenshot':
+		"""Accepts a Screenshot, a base64 str, raw bytes, or a {'path': ..., 'sha256': ...} file reference"""
+		if isinstance(value, cls):
+			return value
+		if isinstance(value, str):
+			return cls.from_base64(value)
+		if isinstance(value, bytes | bytearray):
+			return cls(data=bytes(value))
+		if isinstance(value, dict) and value.get('path'):
+			return cls(path=value['path'], sha256=value.get('sha256'), media_type=value.get('media_type', 'image/png'))
+		raise ValueError(f'Cannot convert {type(value).__name__} to a Screenshot')
+
+	@classmethod
+	def __get_pydantic_core_schema__(cls, source_type: Any, handler: GetCoreSchemaHandler) -> core_schema.CoreSchema:
+		return core_schema.no_info_plain_validator_function(
+			cls.validate,
+			serialization=core_schema.plain_serializer_function_ser_schema(lambda v: v.to_json()),
+		)
+
+	def __eq__(self, other: object) -> bool:
+		if isinstance(other, Screenshot):
+			return self is other or self.sha256 == other.sha256
+		if isinstance(other, str):
+			return self.base64 == other
+		return NotImplemented
+
+	def __hash__(self) -> int:
+		return hash(self.sha256)
+
+	def __str__(self) -> str:
+		return self.base64
+
+	def __repr__(self) -> str:
+		location = f'path={self._path}' if self.is_spilled else f'{len(self._data or b"")} bytes'
+		return f'Screenshot({self.media_type}, {location})'
+
+
 @dataclass
 class BrowserStateSummary(DOMState):
 	"""The summary of the browser's current state designed for an LLM to process"""
@@ -28,11 +210,15 @@ class BrowserStateSummary(DOMState):
 	url: str
 	title: str
 	tabs: list[TabInfo]
-	screenshot: str | None = field(default=None, repr=False)
+	screenshot: Screenshot | None = field(default=None, repr=False)
 	pixels_above: int = 0
 	pixels_below: int = 0
 	browser_errors: list[str] = field(default_factory=list)
 
+	def __post_init__(self):
+		if self.screenshot is not None:
+			self.screenshot = Screenshot.validate(self.screenshot)
+
 
 @dataclass
 class BrowserStateHistory:
@@ -42,12 +228,16 @@ class BrowserStateHistory:
 	title: str
 	tabs: list[TabInfo]
 	interacted_element: list[DOMHistoryElement | None] | list[None]
-	screenshot: str | None = None
+	screenshot: Screenshot | None = None
+
+	def __post_init__(self):
+		if self.screenshot is not None:
+			self.screenshot = Screenshot.validate(self.screenshot)
 
 	def to_dict(self) -> dict[str, Any]:
 		data = {}
 		data['tabs'] = [tab.model_dump() for tab in self.tabs]
-		data['screenshot'] = self.screenshot
+		data['screenshot'] = self.screenshot.to_json() if self.screenshot else None
 		data['interacted_element'] = [el.to_dict() if el else None for el in self.interacted_element]
 		data['url'] = self.url
 		data['title'] = self.title
@@ -0,0 +1,192 @@
+"""
+Result cache for the extract_structured_data action.
+
+Agents often repeat the same (or a near-identical) extraction query on a page that hasn't changed, e.g. after a
+failed step or when they loop. The cache maps (normalized page markdown, normalized query, extract_links, model)
+to the extraction LLM's answer, so a repeat costs a page.content() call instead of markdownify + an LLM call.
+
+Entries are held in an in-memory LRU, optionally backed by a disk LRU shared across agents and runs:
+	<cache_dir>/<key[:2]>/<key>.json          {key, model, query, extract_links, completion, created_at}
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+_TRAILING_PUNCTUATION = re.compile(r'[\s.?!:;,]+$')
+
+
+def normalize_markdown(markdown: str) -> str:
+	"""Collapse whitespace so re-renders that only differ in blank lines/indentation hash the same"""
+	return _WHITESPACE.sub(' ', markdown).strip()
+
+
+def normalize_query(query: str) -> str:
+	"""Case, whitespace and trailing punctuation don't change what the query asks for"""
+	return _TRAILING_PUNCTUATION.sub('', _WHITESPACE.sub(' ', query).strip().lower())
+
+
+def get_extraction_key(markdown: str, query: str, extract_links: bool, model: str) -> str:
+	markdown_hash = hashlib.sha256(normalize_markdown(markdown).encode()).hexdigest()
+	return hashlib.sha256(f'{markdown_hash}\n{normalize_query(query)}\n{extract_links}\n{model}'.encode()).hexdigest()
+
+
+class ExtractionCache:
+	"""
+	In-memory LRU of extraction results keyed by get_extraction_key(), with an optional disk-backed LRU.
+
+	Also memoizes the html -> markdown conversion of the last few pages, so a hit on an unchanged page skips markdownify too.
+
+	Usage:
+		controller = Controller(extraction_cache=ExtractionCache(cache_dir='~/.cache/browseruse/extraction_cache'))
+		...
+		print(controller.extraction_cache.stats)
+	"""
+
+	def __init__(
+		self,
+		max_entries: int = 256,
+		cache_dir: str | Path | None = None,
+		max_disk_entries: int = 10_000,
+		max_markdown_entries: int = 16,
+	):
+		self.max_entries = max_entries
+		self.cache_dir = Path(cache_dir).expanduser().resolve() if cache_dir else None
+		self.max_disk_entries = max_disk_entries
+		self.max_markdown_entries = max_markdown_entries
+
+		self._entries: OrderedDict[str, str] = OrderedDict()  # key -> completion
+		self._markdown: OrderedDict[str, str] = OrderedDict()  # sha256 of html + strip options -> markdown
+		self._disk_entries: int | None = None  # counted on the first disk write, which runs in a worker thread
+
+		self.hits = 0
+		self.disk_hits = 0
+		self.misses = 0
+		self.markdown_hits = 0
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	@property
+	def stats(self) -> dict[str, int | float]:
+		lookups = self.hits + self.misses
+		return {
+			'entries': len(self._entries),
+			'disk_entries': self._disk_entries or 0,
+			'hits': self.hits,
+			'disk_hits': self.disk_hits,
+			'misses': self.misses,
+			'hit_rate': self.hits / lookups if lookups else 0.0,
+			'markdown_hits': self.markdown_hits,
+		}
+
+	# --- Extraction results ---
+
+	async def get(self, key: str) -> str | None:
+		"""Return the cached completion for a key (counting a hit or a miss), checking memory first and then disk"""
+		completion = self._entries.get(key)
+		if completion is not None:
+			self._entries.move_to_end(key)
+			self.hits += 1
+			return completion
+
+		completion = await asyncio.to_thread(self._read_from_disk, key) if self.cache_dir else None
+		if completion is not None:
+			self._remember(key, completion)
+			self.hits += 1
+			self.disk_hits += 1
+			return completion
+
+		self.misses += 1
+		return None
+
+	async def put(self, key: str, completion: str, **metadata: Any) -> None:
+		self._remember(key, completion)
+		if self.cache_dir:
+			try:
+				await asyncio.to_thread(self._write_to_disk, key, completion, metadata)
+			except OSError as e:
+				logger.debug(f'Failed to write extraction cache entry to {self.cache_dir}: {type(e).__name__}: {e}')
+
+	def clear(self) -> None:
+		"""Drop the in-memory entries (the disk cache is left alone)"""
+		self._entries.clear()
+		self._markdown.clear()
+
+	def _remember(self, key: str, completion: str) -> None:
+		self._entries[key] = completion
+		self._entries.move_to_end(key)
+		while len(self._entries) > self.max_entries:
+			self._entries.popitem(last=False)
+
+	# --- Disk LRU (blocking file I/O, only called through asyncio.to_thread) ---
+
+	def _disk_path(self, key: str) -> Path:
+		assert self.cache_dir is not None
+		return self.cache_dir / key[:2] / f'{key}.json'
+
+	def _read_from_disk(self, key: str) -> str | None:
+		path = self._disk_path(key)
+		try:
+			entry = json.loads(path.read_text(encoding='utf-8'))
+			path.touch()  # mtime is the LRU order
+			return entry['completion']
+		except (OSError, json.JSONDecodeError, KeyError):
+			return None
+
+	def _write_to_disk(self, key: str, completion: str, metadata: dict[str, Any]) -> None:
+		if self._disk_entries is None:
+			self._disk_entries = self._count_disk_entries()
+		path = self._disk_path(key)
+		is_new = not path.exists()
+		path.parent.mkdir(parents=True, exist_ok=True)
+		tmp_path = path.with_suffix('.tmp')
+		tmp_path.write_text(
+			json.dumps({'key': key, **metadata, 'completion': completion, 'created_at': time.time()}, ensure_ascii=False),
+			encoding='utf-8',
+		)
+		tmp_path.replace(path)
+		if is_new:
+			self._disk_entries += 1
+		if self._disk_entries > self.max_disk_entries:
+			self._evict_from_disk()
+
+	def _count_disk_entries(self) -> int:
+		assert self.cache_dir is not None
+		return sum(1 for _ in self.cache_dir.glob('*/*.json')) if self.cache_dir.exists() else 0
+
+	def _evict_from_disk(self) -> None:
+		"""Delete the least recently used tenth of the disk entries, so eviction runs rarely"""
+		assert self.cache_dir is not None
+		paths = sorted(self.cache_dir.glob('*/*.json'), key=lambda path: path.stat().st_mtime)
+		keep = int(self.max_disk_entries * 0.9)
+		for path in paths[: max(len(paths) - keep, 0)]:
+			path.unlink(missing_ok=True)
+		self._disk_entries = min(len(paths), keep)
+
+	# --- html -> markdown memo ---
+
+	def get_markdown(self, html: str, strip: list[str]) -> tuple[str, str | None]:
+		"""Returns (memo key, markdown if this exact html was converted recently)"""
+		memo_key = hashlib.sha256(f'{",".join(strip)}\n{html}'.encode()).hexdigest()
+		markdown = self._markdown.get(memo_key)
+		if markdown is not None:
+			self._markdown.move_to_end(memo_key)
+			self.markdown_hits += 1
+		return memo_key, markdown
+
+	def put_markdown(self, memo_key: str, markdown: str) -> None:
+		self._markdown[memo_key] = markdown
+		while len(self._markdown) > self.max_markdown_entries:
+			self._markdown.popitem(last=False)
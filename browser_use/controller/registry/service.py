@@ -2,7 +2,6 @@ import asyncio
 import functools
 import inspect
 import logging
-import re
 from collections.abc import Callable
 from inspect import Parameter, iscoroutinefunction, signature
 from types import UnionType
@@ -20,8 +19,9 @@ from browser_use.controller.registry.views import (
 )
 from browser_use.filesystem.file_system import FileSystem
 from browser_use.llm.base import BaseChatModel
+from browser_use.redaction import get_sensitive_data_redactor
 from browser_use.telemetry.service import ProductTelemetry
-from browser_use.utils import match_url_with_domain_pattern, time_execution_async
+from browser_use.utils import time_execution_async
 
 Context = TypeVar('Context')
 
@@ -35,6 +35,9 @@ class Registry(Generic[Context]):
 		self.registry = ActionRegistry()
 		self.telemetry = ProductTelemetry()
 		self.exclude_actions = exclude_actions if exclude_actions is not None else []
+		# generated ActionModel types keyed by the ordered (name, id(action)) of the actions they contain,
+		# the RegisteredActions are kept alongside so their ids can't be reused while the entry exists
+		self._action_model_cache: dict[tuple, tuple[tuple[RegisteredAction, ...], type[ActionModel]]] = {}
 
 	def _get_special_param_types(self) -> dict[str, type | UnionType | None]:
 		"""Get the expected types for special parameters from SpecialActionParameters"""
@@ -411,45 +414,16 @@ class Registry(Generic[Context]):
 		Returns:
 			BaseModel: The parameter object with placeholders replaced by actual values
 		"""
-		secret_pattern = re.compile(r'<secret>(.*?)</secret>')
+		redactor = get_sensitive_data_redactor(sensitive_data)
 
 		# Set to track all missing placeholders across the full object
 		all_missing_placeholders = set()
 		# Set to track successfully replaced placeholders
 		replaced_placeholders = set()
 
-		# Process sensitive data based on format and current URL
-		applicable_secrets = {}
-
-		for domain_or_key, content in sensitive_data.items():
-			if isinstance(content, dict):
-				# New format: {domain_pattern: {key: value}}
-				# Only include secrets for domains that match the current URL
-				if current_url and current_url != 'about:blank':
-					# it's a real url, check it using our custom allowed_domains scheme://*.example.com glob matching
-					if match_url_with_domain_pattern(current_url, domain_or_key):
-						applicable_secrets.update(content)
-			else:
-				# Old format: {key: value}, expose to all domains (only allowed for legacy reasons)
-				applicable_secrets[domain_or_key] = content
-
-		# Filter out empty values
-		applicable_secrets = {k: v for k, v in applicable_secrets.items() if v}
-
 		def recursively_replace_secrets(value: str | dict | list) -> str | dict | list:
 			if isinstance(value, str):
-				matches = secret_pattern.findall(value)
-
-				for placeholder in matches:
-					if placeholder in applicable_secrets:
-						value = value.replace(f'<secret>{placeholder}</secret>', applicable_secrets[placeholder])
-						replaced_placeholders.add(placeholder)
-					else:
-						# Keep track of missing placeholders
-						all_missing_placeholders.add(placeholder)
-						# Don't replace the tag, keep it as is
-
-				return value
+				return redactor.fill_placeholders(value, current_url, replaced_placeholders, all_missing_placeholders)
 			elif isinstance(value, dict):
 				return {k: recursively_replace_secrets(v) for k, v in value.items()}
 			elif isinstance(value, list):
@@ -475,9 +449,10 @@ class Registry(Generic[Context]):
 
 		Each action model contains only the specific action being used,
 		rather than all actions with most set to None.
-		"""
-		from typing import Union
 
+		Building pydantic models is slow and the set of actions available on a page rarely changes between steps,
+		so the generated model is cached per set of available actions.
+		"""
 		# Filter actions based on page if provided:
 		#   if page is None, only include actions with no filters
 		#   if page is provided, only include actions that match the page
@@ -501,6 +476,18 @@ class Registry(Generic[Context]):
 			if domain_is_allowed and page_is_allowed:
 				available_actions[name] = action
 
+		cache_key = tuple((name, id(action)) for name, action in available_actions.items())
+		cached = self._action_model_cache.get(cache_key)
+		if cached is not None:
+			return cached[1]
+
+		action_model = self._build_action_model(available_actions)
+		self._action_model_cache[cache_key] = (tuple(available_actions.values()), action_model)
+		return action_model
+
+	def _build_action_model(self, available_actions: dict[str, RegisteredAction]) -> type[ActionModel]:
+		from typing import Union
+
 		# Create individual action models for each action
 		individual_action_models: list[type[BaseModel]] = []
 
@@ -11,6 +11,7 @@ from pydantic import BaseModel
 from browser_use.agent.views import ActionModel, ActionResult
 from browser_use.browser import BrowserSession
 from browser_use.browser.types import Page
+from browser_use.controller.extraction_cache import ExtractionCache, get_extraction_key
 from browser_use.controller.registry.service import Registry
 from browser_use.controller.views import (
 	ClickElementAction,
@@ -74,9 +75,12 @@ class Controller(Generic[Context]):
 		exclude_actions: list[str] = [],
 		output_model: type[T] | None = None,
 		display_files_in_done_text: bool = True,
+		extraction_cache: ExtractionCache | None = None,
 	):
 		self.registry = Registry[Context](exclude_actions)
 		self.display_files_in_done_text = display_files_in_done_text
+		# answers of extract_structured_data for (page content, query, extract_links, model), pass ExtractionCache(max_entries=0) to disable
+		self.extraction_cache = extraction_cache if extraction_cache is not None else ExtractionCache()
 
 		"""Register all default browser actions"""
 
@@ -363,7 +367,10 @@ Only use this for specific queries for information retrieval from the page. Don'
 			page_html = page_html_result
 
 			markdownify_func = partial(markdownify.markdownify, strip=strip)
-			content = await loop.run_in_executor(None, markdownify_func, page_html)
+			markdown_key, content = self.extraction_cache.get_markdown(page_html, strip)
+			if content is None:
+				content = await loop.run_in_executor(None, markdownify_func, page_html)
+				self.extraction_cache.put_markdown(markdown_key, content)
 
 			# manually append iframe text into the content so it's readable by the LLM (includes cross-origin iframes)
 			for iframe in page.frames:
@@ -399,10 +406,20 @@ Only use this for specific queries for information retrieval from the page. Don'
 
 Explain the content of the page and that the requested information is not available in the page. Respond in JSON format.\nQuery: {query}\n Website:\n{page}"""
 			try:
-				formatted_prompt = prompt.format(query=query, page=content)
-				response = await page_extraction_llm.ainvoke([UserMessage(content=formatted_prompt)])
+				model = f'{page_extraction_llm.provider}:{page_extraction_llm.model}'
+				cache_key = get_extraction_key(content, query, extract_links, model)
+				completion = await self.extraction_cache.get(cache_key)
+				if completion is not None:
+					logger.debug(
+						f'📄 Reusing cached extraction for the same query on an unchanged page ({self.extraction_cache.stats})'
+					)
+				else:
+					formatted_prompt = prompt.format(query=query, page=content)
+					response = await page_extraction_llm.ainvoke([UserMessage(content=formatted_prompt)])
+					completion = response.completion
+					await self.extraction_cache.put(cache_key, completion, model=model, query=query, extract_links=extract_links)
 
-				extracted_content = f'Page Link: {page.url}\nQuery: {query}\nExtracted Content:\n{response.completion}'
+				extracted_content = f'Page Link: {page.url}\nQuery: {query}\nExtracted Content:\n{completion}'
 
 				# if content is small include it to memory
 				MAX_MEMORY_SIZE = 600
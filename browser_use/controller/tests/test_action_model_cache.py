@@ -0,0 +1,44 @@
+"""
+Tests for the per-action-set cache of generated ActionModel / AgentOutput types.
+"""
+
+from types import SimpleNamespace
+
+from browser_use.agent.views import AgentOutput
+from browser_use.controller.service import Controller
+
+
+def test_action_model_is_reused_for_the_same_set_of_actions():
+	controller = Controller()
+
+	@controller.registry.action('Open the example.com dashboard', domains=['example.com'])
+	async def open_dashboard():
+		pass
+
+	on_example = SimpleNamespace(url='https://example.com/a')
+	elsewhere = SimpleNamespace(url='https://other.org/')
+
+	action_model = controller.registry.create_action_model(page=on_example)
+	assert controller.registry.create_action_model(page=SimpleNamespace(url='https://example.com/b')) is action_model
+	assert 'open_dashboard' in str(action_model.model_json_schema())
+
+	# a different set of available actions gets its own model
+	other_model = controller.registry.create_action_model(page=elsewhere)
+	assert other_model is not action_model
+	assert 'open_dashboard' not in str(other_model.model_json_schema())
+	assert controller.registry.create_action_model(include_actions=['done']) is controller.registry.create_action_model(
+		include_actions=['done']
+	)
+
+	# AgentOutput types are memoized on top of the cached ActionModel
+	assert AgentOutput.type_with_custom_actions(action_model) is AgentOutput.type_with_custom_actions(action_model)
+	assert AgentOutput.type_with_custom_actions_no_thinking(action_model) is not AgentOutput.type_with_custom_actions(
+		action_model
+	)
+
+	# re-registering an action under the same name invalidates the cached model
+	@controller.registry.action('Open the example.com dashboard, v2', domains=['example.com'])
+	async def open_dashboard():  # noqa: F811
+		pass
+
+	assert controller.registry.create_action_model(page=on_example) is not action_model
@@ -0,0 +1,94 @@
+"""
+Tests for the extract_structured_data result cache.
+"""
+
+import threading
+from types import SimpleNamespace
+
+from browser_use.controller.extraction_cache import ExtractionCache, get_extraction_key
+from browser_use.controller.service import Controller
+from browser_use.filesystem.file_system import FileSystem
+
+
+class FakePage:
+	def __init__(self, url: str, html: str):
+		self.url = url
+		self.html = html
+		self.frames = []
+
+	async def content(self) -> str:
+		return self.html
+
+
+class FakeExtractionLLM:
+	provider = 'fake'
+	model = 'extractor-1'
+
+	def __init__(self):
+		self.calls = 0
+
+	async def ainvoke(self, messages, output_format=None):
+		self.calls += 1
+		return SimpleNamespace(completion=f'{{"price": "$10", "call": {self.calls}}}')
+
+
+async def test_repeated_extraction_on_an_unchanged_page_skips_the_llm(tmp_path):
+	controller = Controller()
+	llm = FakeExtractionLLM()
+	page = FakePage('https://shop.example.com/item', '<html><body><h1>Item</h1><p>Price: $10</p></body></html>')
+	browser_session = SimpleNamespace(get_current_page=lambda: _resolved(page))
+	file_system = FileSystem(tmp_path)
+
+	async def extract(query: str, extract_links: bool = False):
+		return await controller.registry.execute_action(
+			'extract_structured_data',
+			{'query': query, 'extract_links': extract_links},
+			browser_session=browser_session,  # type: ignore[arg-type]
+			page_extraction_llm=llm,  # type: ignore[arg-type]
+			file_system=file_system,
+		)
+
+	first = await extract('What is the price?')
+	again = await extract('  what is the price ')  # near-identical query
+	assert llm.calls == 1
+	assert again.extracted_content.endswith('{"price": "$10", "call": 1}') and first.extracted_content.endswith('"call": 1}')
+	assert controller.extraction_cache.stats['hits'] == 1 and controller.extraction_cache.stats['misses'] == 1
+	assert controller.extraction_cache.stats['markdown_hits'] == 1
+
+	await extract('What is the price?', extract_links=True)
+	page.html = page.html.replace('$10', '$12')
+	await extract('What is the price?')
+	assert llm.calls == 3
+
+
+async def test_disk_cache_is_shared_and_evicts_least_recently_used(tmp_path, monkeypatch):
+	key = get_extraction_key('# Item\n\nPrice: $10', 'price?', False, 'fake:extractor-1')
+	assert key == get_extraction_key('# Item   Price: $10\n', 'Price', False, 'fake:extractor-1')
+	assert key != get_extraction_key('# Item\n\nPrice: $10', 'price?', False, 'fake:extractor-2')
+
+	# the disk tier runs in worker threads, never on the event loop
+	disk_io_threads = set()
+	for method in ('_read_from_disk', '_write_to_disk', '_count_disk_entries', '_evict_from_disk'):
+		original = getattr(ExtractionCache, method)
+
+		def record_thread(self, *args, _original=original):
+			disk_io_threads.add(threading.get_ident())
+			return _original(self, *args)
+
+		monkeypatch.setattr(ExtractionCache, method, record_thread)
+
+	await ExtractionCache(cache_dir=tmp_path).put(key, 'answer')
+	other_process = ExtractionCache(cache_dir=tmp_path)
+	assert await other_process.get(key) == 'answer'
+	assert other_process.stats['disk_hits'] == 1
+
+	small = ExtractionCache(cache_dir=tmp_path / 'small', max_disk_entries=10)
+	for i in range(11):
+		await small.put(f'{i:064x}', f'answer {i}')
+	assert small.stats['disk_entries'] == 9
+	assert len(list((tmp_path / 'small').glob('*/*.json'))) == 9
+	assert disk_io_threads and threading.get_ident() not in disk_io_threads
+
+
+async def _resolved(value):
+	return value
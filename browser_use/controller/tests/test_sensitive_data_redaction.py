@@ -0,0 +1,57 @@
+"""
+Tests for the compiled sensitive data redactor shared by the message manager and the action registry.
+"""
+
+from browser_use.redaction import SensitiveDataRedactor, get_sensitive_data_redactor
+
+
+def test_overlapping_secrets_are_redacted_longest_first():
+	redactor = SensitiveDataRedactor({'pin': '1234', 'card': '4111123456', 'empty': ''})
+	assert redactor.values == {'pin': '1234', 'card': '4111123456'}
+	assert redactor.redact('card 4111123456, pin 1234') == 'card <secret>card</secret>, pin <secret>pin</secret>'
+
+
+def test_secrets_are_not_replaced_inside_placeholders():
+	redactor = SensitiveDataRedactor({'password': 'secret', 'user': 'alice'})
+	assert redactor.redact('alice / secret') == '<secret>user</secret> / <secret>password</secret>'
+
+	redactor = SensitiveDataRedactor({'password': 'user', 'user': 'alice'})
+	assert redactor.redact('alice user') == '<secret>user</secret> <secret>password</secret>'
+
+
+def test_icon_font_glyphs_in_the_text_are_left_alone():
+	# icon fonts use Private Use Area characters, the same range the redactor's temporary markers come from
+	redactor = SensitiveDataRedactor({'password': 'secret', 'user': 'alice', 'pin': '\ue000\uf8ff'})
+	icons = ''.join(chr(code_point) for code_point in range(0xE000, 0xE010))
+	assert (
+		redactor.redact(f'{icons} alice / secret {icons}') == f'{icons} <secret>user</secret> / <secret>password</secret> {icons}'
+	)
+	assert redactor.redact('pin \ue000\uf8ff') == 'pin <secret>pin</secret>'
+
+
+def test_placeholders_are_only_filled_for_matching_domains():
+	redactor = SensitiveDataRedactor({'https://*.example.com': {'password': 'hunter2'}, 'api_key': 'abc'})
+	text = 'type <secret>password</secret> then <secret>api_key</secret> and <secret>otp</secret>'
+
+	used, missing = set(), set()
+	assert redactor.fill_placeholders(text, 'https://login.example.com/', used, missing) == (
+		'type hunter2 then abc and <secret>otp</secret>'
+	)
+	assert (used, missing) == ({'password', 'api_key'}, {'otp'})
+
+	used, missing = set(), set()
+	assert redactor.fill_placeholders(text, 'https://evil.com/', used, missing) == (
+		'type <secret>password</secret> then abc and <secret>otp</secret>'
+	)
+	assert (used, missing) == ({'api_key'}, {'password', 'otp'})
+
+
+def test_cached_redactor_is_recompiled_when_the_dict_changes():
+	sensitive_data = {'password': 'hunter2'}
+	redactor = get_sensitive_data_redactor(sensitive_data)
+	assert get_sensitive_data_redactor(sensitive_data) is redactor
+
+	sensitive_data['password'] = 'correct horse'
+	recompiled = get_sensitive_data_redactor(sensitive_data)
+	assert recompiled is not redactor
+	assert recompiled.redact('correct horse hunter2') == '<secret>password</secret> hunter2'
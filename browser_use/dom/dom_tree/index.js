@@ -1112,6 +1112,7 @@
         isInteractive?: boolean;
         isInViewport?: boolean;
         highlightIndex?: number;
+        viewportCoordinates?: { x: number; y: number; width: number; height: number };
         shadowRoot?: boolean;
    }} nodeData - The node data object.
    * @param {HTMLElement} node - The node to highlight.
@@ -1145,6 +1146,18 @@
       if (nodeData.isInViewport || viewportExpansion === -1) {
         nodeData.highlightIndex = highlightIndex++;
 
+        // Element box in top-level viewport CSS pixels (e.g. to crop screenshots to the interactive region)
+        const rect = getCachedBoundingRect(node);
+        if (rect) {
+          const iframeRect = parentIframe ? parentIframe.getBoundingClientRect() : null;
+          nodeData.viewportCoordinates = {
+            x: Math.round(rect.left + (iframeRect ? iframeRect.left : 0)),
+            y: Math.round(rect.top + (iframeRect ? iframeRect.top : 0)),
+            width: Math.round(rect.width),
+            height: Math.round(rect.height),
+          };
+        }
+
         if (doHighlightElements) {
           if (focusHighlightIndex >= 0) {
             if (focusHighlightIndex === nodeData.highlightIndex) {
@@ -1189,6 +1202,7 @@
         attributes: {},
         xpath: '/body',
         children: [],
+        viewport: { width: window.innerWidth, height: window.innerHeight },
       };
 
       // Process children of body
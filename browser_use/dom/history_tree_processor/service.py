@@ -1,7 +1,7 @@
 import hashlib
 
 from browser_use.dom.history_tree_processor.view import DOMHistoryElement, HashedDomElement
-from browser_use.dom.views import DOMElementNode
+from browser_use.dom.views import DOMElementNode, SelectorMap
 
 
 class HistoryTreeProcessor:
@@ -48,6 +48,25 @@ class HistoryTreeProcessor:
 
 		return process_node(tree)
 
+	@staticmethod
+	def find_history_element_in_selector_map(
+		dom_history_element: DOMHistoryElement, selector_map: SelectorMap
+	) -> DOMElementNode | None:
+		"""
+		Same match as find_history_element_in_tree, but only looks at the highlighted elements (the only ones that can match),
+		starting with the element at the recorded index and only hashing candidates whose xpath is already identical.
+		"""
+		hashed_dom_history_element = HistoryTreeProcessor._hash_dom_history_element(dom_history_element)
+
+		def _matches(node: DOMElementNode | None) -> bool:
+			return node is not None and node.xpath == dom_history_element.xpath and node.hash == hashed_dom_history_element
+
+		if dom_history_element.highlight_index is not None:
+			recorded = selector_map.get(dom_history_element.highlight_index)
+			if _matches(recorded):
+				return recorded
+		return next((node for node in selector_map.values() if _matches(node)), None)
+
 	@staticmethod
 	def compare_history_element_and_dom_element(dom_history_element: DOMHistoryElement, dom_element: DOMElementNode) -> bool:
 		hashed_dom_history_element = HistoryTreeProcessor._hash_dom_history_element(dom_history_element)
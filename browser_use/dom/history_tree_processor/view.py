@@ -29,6 +29,18 @@ class CoordinateSet(BaseModel):
 	width: int
 	height: int
 
+	@classmethod
+	def from_rect(cls, x: int, y: int, width: int, height: int) -> 'CoordinateSet':
+		return cls(
+			top_left=Coordinates(x=x, y=y),
+			top_right=Coordinates(x=x + width, y=y),
+			bottom_left=Coordinates(x=x, y=y + height),
+			bottom_right=Coordinates(x=x + width, y=y + height),
+			center=Coordinates(x=x + width // 2, y=y + height // 2),
+			width=width,
+			height=height,
+		)
+
 
 class ViewportInfo(BaseModel):
 	scroll_x: int | None = None
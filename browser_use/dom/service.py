@@ -8,6 +8,7 @@ if TYPE_CHECKING:
 
 
 from browser_use.dom.views import (
+	CoordinateSet,
 	DOMBaseNode,
 	DOMElementNode,
 	DOMState,
@@ -15,6 +16,7 @@ from browser_use.dom.views import (
 	SelectorMap,
 	ViewportInfo,
 )
+from browser_use.tracing import trace_span
 from browser_use.utils import time_execution_async
 
 # @dataclass
@@ -98,7 +100,8 @@ class DomService:
 		}
 
 		try:
-			eval_page: dict = await self.page.evaluate(self.js_code, args)
+			with trace_span('dom_js', highlight_elements=highlight_elements):
+				eval_page: dict = await self.page.evaluate(self.js_code, args)
 		except Exception as e:
 			self.logger.error('Error evaluating JavaScript: %s', e)
 			raise
@@ -200,6 +203,10 @@ class DomService:
 				height=node_data['viewport']['height'],
 			)
 
+		viewport_coordinates = None
+		if rect := node_data.get('viewportCoordinates'):
+			viewport_coordinates = CoordinateSet.from_rect(rect['x'], rect['y'], rect['width'], rect['height'])
+
 		element_node = DOMElementNode(
 			tag_name=node_data['tagName'],
 			xpath=node_data['xpath'],
@@ -213,6 +220,7 @@ class DomService:
 			shadow_root=node_data.get('shadowRoot', False),
 			parent=None,
 			viewport_info=viewport_info,
+			viewport_coordinates=viewport_coordinates,
 		)
 
 		children_ids = node_data.get('children', [])
@@ -11,6 +11,7 @@ from browser_use.llm.azure.chat import ChatAzureOpenAI
 from browser_use.llm.base import BaseChatModel
 from browser_use.llm.google.chat import ChatGoogle
 from browser_use.llm.groq.chat import ChatGroq
+from browser_use.llm.hedged.chat import ChatHedged
 from browser_use.llm.messages import (
 	AssistantMessage,
 	BaseMessage,
@@ -53,4 +54,5 @@ __all__ = [
 	'ChatAzureOpenAI',
 	'ChatOllama',
 	'ChatOpenRouter',
+	'ChatHedged',
 ]
@@ -1,5 +1,5 @@
 import json
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Mapping
 from dataclasses import dataclass
 from typing import Any, TypeVar, overload
 
@@ -24,7 +24,7 @@ from browser_use.llm.base import BaseChatModel
 from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.schema import SchemaOptimizer
-from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamChunk, ChatInvokeUsage
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -145,6 +145,54 @@ class ChatAnthropic(BaseChatModel):
 			setattr(usage, 'thinking_tokens', thinking_tokens)
 		return usage
 
+	def _get_structured_output_params(
+		self, anthropic_messages: list, system_prompt: Any, output_format: type[BaseModel]
+	) -> dict[str, Any]:
+		"""Params for messages.create()/stream() that force the model to answer with a tool call matching output_format"""
+		# Create a tool that represents the output format
+		tool_name = output_format.__name__
+		# Remove title from schema if present (Anthropic doesn't like it in parameters)
+		schema = SchemaOptimizer.get_optimized_json_schema(
+			output_format,
+			provider='anthropic',
+			post_process=lambda schema: {key: value for key, value in schema.items() if key != 'title'},
+		)
+
+		tool = ToolParam(
+			name=tool_name,
+			description=f'Extract information in the format of {tool_name}',
+			input_schema=schema,
+			cache_control=CacheControlEphemeralParam(type='ephemeral'),
+		)
+
+		# Force the model to use this tool
+		tool_choice = ToolChoiceToolParam(type='tool', name=tool_name, disable_parallel_tool_use=self.disable_parallel_tool_use)
+
+		return {
+			'model': self.model,
+			'messages': anthropic_messages,
+			'tools': [tool],
+			'system': system_prompt or NOT_GIVEN,
+			'tool_choice': tool_choice,
+			**self._get_client_params_for_invoke(),
+		}
+
+	def _parse_structured_output(self, response: Message, output_format: type[T]) -> T:
+		"""Validate the tool use block of a response against output_format"""
+		for content_block in response.content:
+			if hasattr(content_block, 'type') and content_block.type == 'tool_use':
+				# Parse the tool input as the structured output
+				try:
+					return output_format.model_validate(content_block.input)
+				except Exception as e:
+					# If validation fails, try to parse it as JSON first
+					if isinstance(content_block.input, str):
+						return output_format.model_validate(json.loads(content_block.input))
+					raise e
+
+		# If no tool use block found, raise an error
+		raise ValueError('Expected tool use in response but none found')
+
 	@overload
 	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
 
@@ -210,57 +258,61 @@ class ChatAnthropic(BaseChatModel):
 
 			else:
 				# Use tool calling for structured output
-				# Create a tool that represents the output format
-				tool_name = output_format.__name__
-				schema = SchemaOptimizer.create_optimized_json_schema(output_format)
-
-				# Remove title from schema if present (Anthropic doesn't like it in parameters)
-				if 'title' in schema:
-					del schema['title']
-
-				tool = ToolParam(
-					name=tool_name,
-					description=f'Extract information in the format of {tool_name}',
-					input_schema=schema,
-					cache_control=CacheControlEphemeralParam(type='ephemeral'),
+				response = await self.get_client().messages.create(
+					**self._get_structured_output_params(anthropic_messages, system_prompt, output_format)
 				)
 
-				# Force the model to use this tool
-				tool_choice = ToolChoiceToolParam(type='tool', name=tool_name)
+				usage = self._get_usage(response)
+				return ChatInvokeCompletion(completion=self._parse_structured_output(response, output_format), usage=usage)
 
-				# Prepare create parameters
-				create_params = {
-					"model": self.model,
-					"messages": anthropic_messages,
-					"tools": [tool],
-					"system": system_prompt or NOT_GIVEN,
-					"tool_choice": tool_choice,
-					"disable_parallel_tool_use": self.disable_parallel_tool_use,
+		except APIConnectionError as e:
+			raise ModelProviderError(message=e.message, model=self.name) from e
+		except RateLimitError as e:
+			raise ModelRateLimitError(message=e.message, model=self.name) from e
+		except APIStatusError as e:
+			raise ModelProviderError(message=e.message, status_code=e.status_code, model=self.name) from e
+		except Exception as e:
+			raise ModelProviderError(message=str(e), model=self.name) from e
+
+	async def astream(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None
+	) -> AsyncIterator[ChatInvokeStreamChunk]:
+		"""Stream text deltas (or the tool input JSON for structured output) as they arrive, then the parsed completion"""
+		if output_format is None and (self.enable_thinking or self.use_interleaved_thinking):
+			# thinking responses go through the beta client in ainvoke(), not worth streaming
+			async for chunk in super().astream(messages, output_format):
+				yield chunk
+			return
+
+		anthropic_messages, system_prompt = AnthropicMessageSerializer.serialize_messages(messages)
+
+		try:
+			if output_format is None:
+				stream_params = {
+					'model': self.model,
+					'messages': anthropic_messages,
+					'system': system_prompt or NOT_GIVEN,
 					**self._get_client_params_for_invoke(),
 				}
-				
-				response = await self.get_client().messages.create(**create_params)
+			else:
+				stream_params = self._get_structured_output_params(anthropic_messages, system_prompt, output_format)
 
-				usage = self._get_usage(response)
+			async with self.get_client().messages.stream(**stream_params) as stream:
+				async for event in stream:
+					if event.type == 'text':
+						yield ChatInvokeStreamChunk(delta=event.text)
+					elif event.type == 'input_json':
+						yield ChatInvokeStreamChunk(delta=event.partial_json)
+				response = await stream.get_final_message()
 
-				# Extract the tool use block
-				for content_block in response.content:
-					if hasattr(content_block, 'type') and content_block.type == 'tool_use':
-						# Parse the tool input as the structured output
-						try:
-							return ChatInvokeCompletion(completion=output_format.model_validate(content_block.input), usage=usage)
-						except Exception as e:
-							# If validation fails, try to parse it as JSON first
-							if isinstance(content_block.input, str):
-								data = json.loads(content_block.input)
-								return ChatInvokeCompletion(
-									completion=output_format.model_validate(data),
-									usage=usage,
-								)
-							raise e
-
-				# If no tool use block found, raise an error
-				raise ValueError('Expected tool use in response but none found')
+			usage = self._get_usage(response)
+			if output_format is None:
+				first_content = response.content[0]
+				response_text = first_content.text if isinstance(first_content, TextBlock) else str(first_content)
+				yield ChatInvokeStreamChunk(completion=ChatInvokeCompletion(completion=response_text, usage=usage))
+			else:
+				completion = self._parse_structured_output(response, output_format)
+				yield ChatInvokeStreamChunk(completion=ChatInvokeCompletion(completion=completion, usage=usage))
 
 		except APIConnectionError as e:
 			raise ModelProviderError(message=e.message, model=self.name) from e
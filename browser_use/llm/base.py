@@ -4,12 +4,13 @@ We have switched all of our code from langchain to openai.types.chat.chat_comple
 For easier transition we have
 """
 
+from collections.abc import AsyncIterator
 from typing import Any, Protocol, TypeVar, overload
 
 from pydantic import BaseModel
 
 from browser_use.llm.messages import BaseMessage
-from browser_use.llm.views import ChatInvokeCompletion
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamChunk
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -40,6 +41,16 @@ class BaseChatModel(Protocol):
 		self, messages: list[BaseMessage], output_format: type[T] | None = None
 	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]: ...
 
+	async def astream(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None
+	) -> AsyncIterator[ChatInvokeStreamChunk]:
+		"""
+		Stream the response as it is generated: text (or raw JSON for structured output) deltas, then a last chunk
+		with the complete ChatInvokeCompletion. Providers without native streaming yield that last chunk only.
+		"""
+		completion = await self.ainvoke(messages, output_format)
+		yield ChatInvokeStreamChunk(completion=completion)
+
 	@classmethod
 	def __get_pydantic_core_schema__(
 		cls,
@@ -208,10 +208,9 @@ class ChatGoogle(BaseChatModel):
 				# Return structured response
 				config['response_mime_type'] = 'application/json'
 				# Convert Pydantic model to Gemini-compatible schema
-				optimized_schema = SchemaOptimizer.create_optimized_json_schema(output_format)
-
-				gemini_schema = self._fix_gemini_schema(optimized_schema)
-				config['response_schema'] = gemini_schema
+				config['response_schema'] = SchemaOptimizer.get_optimized_json_schema(
+					output_format, provider='google', post_process=self._fix_gemini_schema
+				)
 
 				response = await self.get_client().aio.models.generate_content(
 					model=self.model,
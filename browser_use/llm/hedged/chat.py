@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TypeVar, overload
+
+from pydantic import BaseModel
+
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.exceptions import ModelProviderError
+from browser_use.llm.messages import BaseMessage
+from browser_use.llm.views import ChatInvokeCompletion
+from browser_use.tracing import trace_span
+
+T = TypeVar('T', bound=BaseModel)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LatencyHistogram:
+	"""Response times of the most recent successful requests to one model"""
+
+	max_samples: int = 200
+	samples: deque[float] = field(default_factory=deque)
+
+	def record(self, seconds: float) -> None:
+		self.samples.append(seconds)
+		while len(self.samples) > self.max_samples:
+			self.samples.popleft()
+
+	def percentile(self, percentile: float) -> float | None:
+		"""Nearest-rank percentile (0-100) of the recorded response times, None if nothing was recorded yet"""
+		if not self.samples:
+			return None
+		ordered = sorted(self.samples)
+		rank = max(math.ceil(percentile / 100 * len(ordered)), 1)
+		return ordered[rank - 1]
+
+	def __len__(self) -> int:
+		return len(self.samples)
+
+
+# shared by all ChatHedged instances, so agents running side by side (e.g. in an AgentPool) learn from each other's requests
+_LATENCY_HISTOGRAMS: dict[str, LatencyHistogram] = {}
+
+
+def get_latency_histogram(llm: BaseChatModel) -> LatencyHistogram:
+	return _LATENCY_HISTOGRAMS.setdefault(f'{llm.provider}:{llm.model}', LatencyHistogram())
+
+
+@dataclass
+class ChatHedged(BaseChatModel):
+	"""
+	Routes each request to a primary model, with hedging and failover to fallback models.
+
+	- hedging: if the primary hasn't answered after its hedge_percentile response time (learned from recent requests),
+	  the same request is sent to the first fallback as well. Whichever answers first wins, the other request is cancelled.
+	- failover: a request that fails with a ModelProviderError (incl. ModelRateLimitError) moves on to the next fallback.
+
+	Usage:
+		llm = ChatHedged(primary=ChatOpenAI(model='gpt-4.1'), fallbacks=[ChatAnthropic(model='claude-sonnet-4-0')])
+
+	TokenCost.register_llm() registers the primary and the fallbacks individually, so every completed request is
+	tracked at its own model's price. Cancelled hedge requests never return their usage, their prompt is tracked from the
+	local token estimate (TokenUsageEntry.cancelled).
+	astream() doesn't hedge, it yields the hedged ainvoke() result as a single chunk.
+	"""
+
+	primary: BaseChatModel
+	fallbacks: list[BaseChatModel] = field(default_factory=list)
+
+	hedge_percentile: float = 95.0
+	max_hedges: int = 1  # fallbacks started because the primary is slow (failovers after errors are not limited)
+	min_samples: int = 20  # requests to a model before its own percentile is trusted, until then initial_hedge_delay is used
+	initial_hedge_delay: float = 10.0
+	min_hedge_delay: float = 1.0
+
+	stats: dict[str, int] = field(default_factory=lambda: {'requests': 0, 'hedges': 0, 'hedge_wins': 0, 'failovers': 0})
+
+	@property
+	def llms(self) -> list[BaseChatModel]:
+		return [self.primary, *self.fallbacks]
+
+	@property
+	def model(self) -> str:  # type: ignore[override]
+		return self.primary.model
+
+	@property
+	def provider(self) -> str:
+		return self.primary.provider
+
+	@property
+	def name(self) -> str:
+		return f'hedged({", ".join(llm.name for llm in self.llms)})'
+
+	def get_hedge_delay(self) -> float:
+		"""Seconds to wait for the primary before sending the request to a fallback too"""
+		histogram = get_latency_histogram(self.primary)
+		if len(histogram) < self.min_samples:
+			return self.initial_hedge_delay
+		return max(histogram.percentile(self.hedge_percentile) or 0.0, self.min_hedge_delay)
+
+	async def _timed_ainvoke(self, llm: BaseChatModel, messages: list[BaseMessage], output_format: type[T] | None):
+		with trace_span('llm_request', model=llm.model):
+			start_time = time.monotonic()
+			response = await llm.ainvoke(messages, output_format)  # type: ignore[arg-type]
+			get_latency_histogram(llm).record(time.monotonic() - start_time)
+			return response
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
+
+	@overload
+	async def ainvoke(self, messages: list[BaseMessage], output_format: type[T]) -> ChatInvokeCompletion[T]: ...
+
+	async def ainvoke(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None
+	) -> ChatInvokeCompletion[T] | ChatInvokeCompletion[str]:
+		self.stats['requests'] += 1
+		remaining = list(self.llms)
+		running: dict[asyncio.Task, BaseChatModel] = {}
+		hedge_tasks: set[asyncio.Task] = set()
+		hedge_at = time.monotonic() + self.get_hedge_delay()
+		last_error: ModelProviderError | None = None
+
+		def start_next() -> asyncio.Task:
+			llm = remaining.pop(0)
+			task = asyncio.create_task(self._timed_ainvoke(llm, messages, output_format))
+			task.add_done_callback(
+				lambda t: t.cancelled() or t.exception()
+			)  # losers' errors are expected, don't log them as unretrieved
+			running[task] = llm
+			return task
+
+		start_next()
+		try:
+			while running:
+				can_hedge = remaining and len(hedge_tasks) < self.max_hedges
+				timeout = max(hedge_at - time.monotonic(), 0) if can_hedge else None
+				done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+				if not done:
+					logger.debug(
+						f'{self.primary.name} is slower than its p{self.hedge_percentile:g}, hedging with {remaining[0].name}'
+					)
+					self.stats['hedges'] += 1
+					hedge_tasks.add(start_next())
+					continue
+
+				for task in done:
+					llm = running.pop(task)
+					try:
+						response = task.result()
+					except ModelProviderError as e:
+						last_error = e
+						if remaining and not running:
+							logger.warning(f'⚠️ {llm.name} failed ({type(e).__name__}: {e}), failing over to {remaining[0].name}')
+							self.stats['failovers'] += 1
+							start_next()
+						continue
+					if task in hedge_tasks:
+						self.stats['hedge_wins'] += 1
+					return response
+		finally:
+			for task in running:
+				task.cancel()
+
+		assert last_error is not None
+		raise last_error
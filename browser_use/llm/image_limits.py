@@ -0,0 +1,41 @@
+"""
+The image sizes LLM providers downscale images to before the model looks at them.
+
+Shared by the screenshot preprocessing (browser_use.agent.image_preprocessing), which resizes screenshots to these limits,
+and the token estimator (browser_use.tokens.estimator), which counts image tokens at the size the provider bills.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import NamedTuple
+
+
+class ImageSizeLimit(NamedTuple):
+	max_long_edge: int | None = None
+	max_short_edge: int | None = None
+	max_pixels: int | None = None
+
+
+# the sizes providers downscale images to before the model looks at them, anything bigger is only wasted upload
+PROVIDER_IMAGE_SIZE_LIMITS: dict[str, ImageSizeLimit] = {
+	'anthropic': ImageSizeLimit(max_long_edge=1568, max_pixels=1_150_000),
+	'anthropic_bedrock': ImageSizeLimit(max_long_edge=1568, max_pixels=1_150_000),
+	'openai': ImageSizeLimit(max_long_edge=2048, max_short_edge=768),
+	'azure': ImageSizeLimit(max_long_edge=2048, max_short_edge=768),
+	'google': ImageSizeLimit(max_short_edge=768),  # tiled into 768x768 tiles
+}
+
+
+def resize_to_limit(width: int, height: int, size_limit: ImageSizeLimit) -> tuple[int, int]:
+	"""The size an image of width x height is scaled down to (keeping its aspect ratio) to fit in size_limit"""
+	scale = 1.0
+	if size_limit.max_long_edge:
+		scale = min(scale, size_limit.max_long_edge / max(width, height))
+	if size_limit.max_short_edge:
+		scale = min(scale, size_limit.max_short_edge / min(width, height))
+	if size_limit.max_pixels:
+		scale = min(scale, math.sqrt(size_limit.max_pixels / (width * height)))
+	if scale >= 1:
+		return width, height
+	return max(1, int(width * scale)), max(1, int(height * scale))
@@ -6,6 +6,7 @@ This implementation is based on the OpenAI types, while removing all the parts t
 from typing import Literal, Union
 
 from openai import BaseModel
+from pydantic import PrivateAttr
 
 
 def _truncate(text: str, max_length: int = 50) -> str:
@@ -131,6 +132,17 @@ class _MessageBase(BaseModel):
 	"""Whether to cache this message. This is only applicable when using Anthropic models.
 	"""
 
+	_estimated_tokens: int | None = PrivateAttr(default=None)
+
+	@property
+	def estimated_tokens(self) -> int | None:
+		"""Locally estimated tokens of this message, set by MessageManager.get_messages() (see browser_use.tokens.estimator)"""
+		return self._estimated_tokens
+
+	@estimated_tokens.setter
+	def estimated_tokens(self, value: int | None) -> None:
+		self._estimated_tokens = value
+
 
 class UserMessage(_MessageBase):
 	role: Literal['user'] = 'user'
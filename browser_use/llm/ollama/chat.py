@@ -9,6 +9,7 @@ from browser_use.llm.base import BaseChatModel
 from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.ollama.serializer import OllamaMessageSerializer
+from browser_use.llm.schema import SchemaOptimizer
 from browser_use.llm.views import ChatInvokeCompletion
 
 T = TypeVar('T', bound=BaseModel)
@@ -73,7 +74,7 @@ class ChatOllama(BaseChatModel):
 
 				return ChatInvokeCompletion(completion=response.message.content or '', usage=None)
 			else:
-				schema = output_format.model_json_schema()
+				schema = SchemaOptimizer.get_json_schema(output_format)
 
 				response = await self.get_client().chat(
 					model=self.model,
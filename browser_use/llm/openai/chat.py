@@ -1,10 +1,11 @@
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Mapping
 from dataclasses import dataclass
 from typing import Any, TypeVar, overload
 
 import httpx
-from openai import APIConnectionError, APIStatusError, AsyncOpenAI, RateLimitError
+from openai import NOT_GIVEN, APIConnectionError, APIStatusError, AsyncOpenAI, RateLimitError
 from openai.types.chat.chat_completion import ChatCompletion
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
 from openai.types.shared.chat_model import ChatModel
 from openai.types.shared_params.reasoning_effort import ReasoningEffort
 from openai.types.shared_params.response_format_json_schema import JSONSchema, ResponseFormatJSONSchema
@@ -15,7 +16,7 @@ from browser_use.llm.exceptions import ModelProviderError
 from browser_use.llm.messages import BaseMessage
 from browser_use.llm.openai.serializer import OpenAIMessageSerializer
 from browser_use.llm.schema import SchemaOptimizer
-from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeStreamChunk, ChatInvokeUsage
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -95,7 +96,7 @@ class ChatOpenAI(BaseChatModel):
 	def name(self) -> str:
 		return str(self.model)
 
-	def _get_usage(self, response: ChatCompletion) -> ChatInvokeUsage | None:
+	def _get_usage(self, response: ChatCompletion | ChatCompletionChunk) -> ChatInvokeUsage | None:
 		if response.usage is not None:
 			completion_tokens = response.usage.completion_tokens
 			completion_token_details = response.usage.completion_tokens_details
@@ -120,6 +121,19 @@ class ChatOpenAI(BaseChatModel):
 
 		return usage
 
+	def _get_reasoning_effort_params(self) -> dict[str, Any]:
+		if self.model in ReasoningModels:
+			return {'reasoning_effort': self.reasoning_effort}
+		return {}
+
+	def _get_response_format(self, output_format: type[BaseModel]) -> ResponseFormatJSONSchema:
+		response_format: JSONSchema = {
+			'name': 'agent_output',
+			'strict': True,
+			'schema': SchemaOptimizer.get_optimized_json_schema(output_format),
+		}
+		return ResponseFormatJSONSchema(json_schema=response_format, type='json_schema')
+
 	@overload
 	async def ainvoke(self, messages: list[BaseMessage], output_format: None = None) -> ChatInvokeCompletion[str]: ...
 
@@ -143,11 +157,7 @@ class ChatOpenAI(BaseChatModel):
 		openai_messages = OpenAIMessageSerializer.serialize_messages(messages)
 
 		try:
-			reasoning_effort_dict: dict = {}
-			if self.model in ReasoningModels:
-				reasoning_effort_dict = {
-					'reasoning_effort': self.reasoning_effort,
-				}
+			reasoning_effort_dict = self._get_reasoning_effort_params()
 
 			if output_format is None:
 				# Return string response
@@ -165,18 +175,12 @@ class ChatOpenAI(BaseChatModel):
 				)
 
 			else:
-				response_format: JSONSchema = {
-					'name': 'agent_output',
-					'strict': True,
-					'schema': SchemaOptimizer.create_optimized_json_schema(output_format),
-				}
-
 				# Return structured response
 				response = await self.get_client().chat.completions.create(
 					model=self.model,
 					messages=openai_messages,
 					temperature=self.temperature,
-					response_format=ResponseFormatJSONSchema(json_schema=response_format, type='json_schema'),
+					response_format=self._get_response_format(output_format),
 					**reasoning_effort_dict,
 				)
 
@@ -196,21 +200,67 @@ class ChatOpenAI(BaseChatModel):
 					usage=usage,
 				)
 
-		except RateLimitError as e:
+		except Exception as e:
+			raise self._to_model_provider_error(e) from e
+
+	async def astream(
+		self, messages: list[BaseMessage], output_format: type[T] | None = None
+	) -> AsyncIterator[ChatInvokeStreamChunk]:
+		"""Stream content deltas (the raw JSON for structured output) as they arrive, then the parsed completion"""
+		openai_messages = OpenAIMessageSerializer.serialize_messages(messages)
+
+		try:
+			stream = await self.get_client().chat.completions.create(
+				model=self.model,
+				messages=openai_messages,
+				temperature=self.temperature,
+				response_format=self._get_response_format(output_format) if output_format is not None else NOT_GIVEN,
+				stream=True,
+				stream_options={'include_usage': True},
+				**self._get_reasoning_effort_params(),
+			)
+
+			content_parts: list[str] = []
+			usage = None
+			async for chunk in stream:
+				if chunk.usage is not None:
+					# sent as an extra last chunk with no choices because of include_usage=True
+					usage = self._get_usage(chunk)
+				if chunk.choices and chunk.choices[0].delta.content:
+					content_parts.append(chunk.choices[0].delta.content)
+					yield ChatInvokeStreamChunk(delta=chunk.choices[0].delta.content)
+
+			content = ''.join(content_parts)
+			if output_format is None:
+				yield ChatInvokeStreamChunk(completion=ChatInvokeCompletion(completion=content, usage=usage))
+			else:
+				if not content:
+					raise ModelProviderError(
+						message='Failed to parse structured output from model response',
+						status_code=500,
+						model=self.name,
+					)
+				parsed = output_format.model_validate_json(content)
+				yield ChatInvokeStreamChunk(completion=ChatInvokeCompletion(completion=parsed, usage=usage))
+
+		except ModelProviderError:
+			raise
+		except Exception as e:
+			raise self._to_model_provider_error(e) from e
+
+	def _to_model_provider_error(self, e: Exception) -> ModelProviderError:
+		"""Convert an openai client error into a ModelProviderError"""
+		if isinstance(e, RateLimitError):
 			error_message = e.response.json().get('error', {})
 			error_message = (
 				error_message.get('message', 'Unknown model error') if isinstance(error_message, dict) else error_message
 			)
-			raise ModelProviderError(
-				message=error_message,
-				status_code=e.response.status_code,
-				model=self.name,
-			) from e
+			return ModelProviderError(message=error_message, status_code=e.response.status_code, model=self.name)
 
-		except APIConnectionError as e:
-			raise ModelProviderError(message=str(e), model=self.name) from e
+		if isinstance(e, APIConnectionError):
+			return ModelProviderError(message=str(e), model=self.name)
 
-		except APIStatusError as e:
+		if isinstance(e, APIStatusError):
 			try:
 				error_message = e.response.json().get('error', {})
 			except Exception:
@@ -218,11 +268,6 @@ class ChatOpenAI(BaseChatModel):
 			error_message = (
 				error_message.get('message', 'Unknown model error') if isinstance(error_message, dict) else error_message
 			)
-			raise ModelProviderError(
-				message=error_message,
-				status_code=e.response.status_code,
-				model=self.name,
-			) from e
+			return ModelProviderError(message=error_message, status_code=e.response.status_code, model=self.name)
 
-		except Exception as e:
-			raise ModelProviderError(message=str(e), model=self.name) from e
+		return ModelProviderError(message=str(e), model=self.name)
@@ -152,7 +152,7 @@ class ChatOpenRouter(BaseChatModel):
 
 			else:
 				# Create a JSON schema for structured output
-				schema = SchemaOptimizer.create_optimized_json_schema(output_format)
+				schema = SchemaOptimizer.get_optimized_json_schema(output_format)
 
 				response_format_schema: JSONSchema = {
 					'name': 'agent_output',
@@ -2,12 +2,61 @@
 Utilities for creating optimized Pydantic schemas for LLM usage.
 """
 
+import copy
+import weakref
+from collections.abc import Callable
 from typing import Any
 
 from pydantic import BaseModel
 
+# process-wide cache of generated schemas: {model type: {variant: schema}}, entries go away with their model type
+_SCHEMA_CACHE: weakref.WeakKeyDictionary[type[BaseModel], dict[str, dict[str, Any]]] = weakref.WeakKeyDictionary()
+
 
 class SchemaOptimizer:
+	@staticmethod
+	def get_optimized_json_schema(
+		model: type[BaseModel],
+		provider: str | None = None,
+		post_process: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+	) -> dict[str, Any]:
+		"""
+		Cached create_optimized_json_schema(model), the same output model is sent with every step so it's only built once.
+
+		Args:
+			model: The Pydantic model to optimize
+			provider: Cache key for a provider-specific variant of the schema, e.g. 'anthropic' or 'google'
+			post_process: Provider-specific transformation applied once (to a copy of the optimized schema) when the
+				variant is first built. Only the first post_process passed for a given provider is used.
+
+		Returns:
+			The optimized schema, shared between callers: treat it as read-only
+		"""
+		if not provider:
+			return SchemaOptimizer._get_cached_schema(
+				model, 'optimized', lambda: SchemaOptimizer.create_optimized_json_schema(model)
+			)
+
+		def build_variant() -> dict[str, Any]:
+			optimized_schema = SchemaOptimizer.get_optimized_json_schema(model)
+			return post_process(copy.deepcopy(optimized_schema)) if post_process else optimized_schema
+
+		return SchemaOptimizer._get_cached_schema(model, f'optimized:{provider}', build_variant)
+
+	@staticmethod
+	def get_json_schema(model: type[BaseModel]) -> dict[str, Any]:
+		"""Cached model.model_json_schema() for providers that take the plain pydantic schema, treat it as read-only"""
+		return SchemaOptimizer._get_cached_schema(model, 'json_schema', model.model_json_schema)
+
+	@staticmethod
+	def _get_cached_schema(model: type[BaseModel], variant: str, build: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+		schemas = _SCHEMA_CACHE.get(model)
+		if schemas is None:
+			schemas = _SCHEMA_CACHE[model] = {}
+		if variant not in schemas:
+			schemas[variant] = build()
+		return schemas[variant]
+
 	@staticmethod
 	def create_optimized_json_schema(model: type[BaseModel]) -> dict[str, Any]:
 		"""
@@ -0,0 +1,115 @@
+"""
+Tests for ChatHedged: latency-driven hedging and failover between chat models.
+"""
+
+import asyncio
+
+import pytest
+
+from browser_use.llm.exceptions import ModelProviderError, ModelRateLimitError
+from browser_use.llm.hedged.chat import ChatHedged, LatencyHistogram, get_latency_histogram
+from browser_use.llm.messages import UserMessage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from browser_use.tokens.service import TokenCost
+
+
+class FakeLLM:
+	provider = 'fake'
+	_verified_api_keys = True
+
+	def __init__(self, model: str, delays: list[float], error: Exception | None = None):
+		self.model = model
+		self.delays = delays
+		self.error = error
+		self.calls = 0
+		self.cancelled = 0
+
+	@property
+	def name(self) -> str:
+		return self.model
+
+	async def ainvoke(self, messages, output_format=None):
+		delay = self.delays[min(self.calls, len(self.delays) - 1)]
+		self.calls += 1
+		try:
+			await asyncio.sleep(delay)
+		except asyncio.CancelledError:
+			self.cancelled += 1
+			raise
+		if self.error:
+			raise self.error
+		usage = ChatInvokeUsage(
+			prompt_tokens=100,
+			prompt_cached_tokens=None,
+			prompt_cache_creation_tokens=None,
+			prompt_image_tokens=None,
+			completion_tokens=10,
+			total_tokens=110,
+		)
+		return ChatInvokeCompletion(completion=self.model, usage=usage)
+
+
+def test_latency_histogram_percentiles():
+	histogram = LatencyHistogram(max_samples=100)
+	for seconds in range(1, 201):
+		histogram.record(seconds / 100)
+	assert len(histogram) == 100  # only the most recent samples are kept
+	assert histogram.percentile(50) == 1.5
+	assert histogram.percentile(95) == 1.95
+
+
+async def test_slow_primary_is_hedged_after_its_learned_percentile_and_the_loser_is_cancelled():
+	primary = FakeLLM('hedge-test-primary', delays=[0.01] * 20 + [5.0])
+	secondary = FakeLLM('hedge-test-secondary', delays=[0.05])
+	llm = ChatHedged(primary=primary, fallbacks=[secondary], min_samples=20, initial_hedge_delay=5.0, min_hedge_delay=0.02)
+	messages = [UserMessage(content='hi')]
+
+	for _ in range(20):
+		assert (await llm.ainvoke(messages)).completion == 'hedge-test-primary'
+	assert secondary.calls == 0
+	assert len(get_latency_histogram(primary)) == 20
+	assert llm.get_hedge_delay() < 0.1
+
+	started = asyncio.get_running_loop().time()
+	response = await llm.ainvoke(messages)
+	assert response.completion == 'hedge-test-secondary'
+	assert asyncio.get_running_loop().time() - started < 1.0
+	await asyncio.sleep(0)
+	assert primary.cancelled == 1
+	assert llm.stats == {'requests': 21, 'hedges': 1, 'hedge_wins': 1, 'failovers': 0}
+
+
+async def test_the_cancelled_hedge_request_is_tracked_from_the_prompt_estimate():
+	primary = FakeLLM('cancel-test-primary', delays=[5.0])
+	secondary = FakeLLM('cancel-test-secondary', delays=[0.01])
+	llm = ChatHedged(primary=primary, fallbacks=[secondary], initial_hedge_delay=0.02)
+	token_cost = TokenCost()
+	token_cost.register_llm(llm)
+
+	response = await llm.ainvoke([UserMessage(content='a' * 400)])
+	assert response.completion == 'cancel-test-secondary'
+	await asyncio.sleep(0)
+	assert primary.cancelled == 1
+
+	billed, cancelled = token_cost.usage_history
+	assert (billed.model, billed.cancelled, billed.usage.prompt_tokens) == ('cancel-test-secondary', False, 100)
+	assert (cancelled.model, cancelled.cancelled) == ('cancel-test-primary', True)
+	assert (cancelled.usage.prompt_tokens, cancelled.usage.completion_tokens) == (4 + 100, 0)  # the local estimate
+	assert token_cost.get_usage_tokens_for_model('cancel-test-primary').prompt_tokens == 104
+
+
+async def test_provider_errors_fail_over_and_both_models_costs_are_tracked():
+	primary = FakeLLM('failover-test-primary', delays=[0.01], error=ModelRateLimitError('slow down'))
+	secondary = FakeLLM('failover-test-secondary', delays=[0.01])
+	llm = ChatHedged(primary=primary, fallbacks=[secondary])
+	token_cost = TokenCost()
+	token_cost.register_llm(llm)
+
+	response = await llm.ainvoke([UserMessage(content='hi')])
+	assert response.completion == 'failover-test-secondary'
+	assert llm.stats['failovers'] == 1
+	assert [usage.model for usage in token_cost.usage_history] == ['failover-test-secondary']
+
+	everything_down = ChatHedged(primary=FakeLLM('down-1', [0.0], error=ModelProviderError('500')), fallbacks=[])
+	with pytest.raises(ModelProviderError):
+		await everything_down.ainvoke([UserMessage(content='hi')])
@@ -0,0 +1,41 @@
+"""
+Tests for the process-wide cache of optimized output schemas in SchemaOptimizer.
+"""
+
+from pydantic import BaseModel
+
+from browser_use.agent.views import AgentOutput
+from browser_use.controller.service import Controller
+from browser_use.llm.schema import SchemaOptimizer
+
+
+def test_optimized_schema_is_built_once_per_model_and_provider():
+	output_format = AgentOutput.type_with_custom_actions(Controller().registry.create_action_model())
+
+	optimized = SchemaOptimizer.get_optimized_json_schema(output_format)
+	assert optimized == SchemaOptimizer.create_optimized_json_schema(output_format)
+	assert SchemaOptimizer.get_optimized_json_schema(output_format) is optimized
+
+	post_process_calls = []
+
+	def drop_required(schema: dict) -> dict:
+		post_process_calls.append(schema)
+		schema.pop('required')  # post-processors get their own copy, this must not leak into the shared schema
+		return schema
+
+	anthropic = SchemaOptimizer.get_optimized_json_schema(output_format, provider='anthropic', post_process=drop_required)
+	assert SchemaOptimizer.get_optimized_json_schema(output_format, provider='anthropic', post_process=drop_required) is anthropic
+	assert len(post_process_calls) == 1
+	assert 'required' not in anthropic and 'required' in optimized
+
+
+def test_schema_cache_is_keyed_by_model_type():
+	class First(BaseModel):
+		a: int
+
+	class Second(BaseModel):
+		b: str
+
+	assert set(SchemaOptimizer.get_json_schema(First)['properties']) == {'a'}
+	assert set(SchemaOptimizer.get_json_schema(Second)['properties']) == {'b'}
+	assert SchemaOptimizer.get_json_schema(First) is SchemaOptimizer.get_json_schema(First)
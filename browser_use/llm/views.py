@@ -43,3 +43,15 @@ class ChatInvokeCompletion(BaseModel, Generic[T]):
 
 	usage: ChatInvokeUsage | None
 	"""The usage of the response."""
+
+
+class ChatInvokeStreamChunk(BaseModel, Generic[T]):
+	"""
+	A piece of a streamed chat model response, see BaseChatModel.astream().
+	"""
+
+	delta: str = ''
+	"""Newly generated text. For structured output this is the next fragment of the raw JSON output."""
+
+	completion: ChatInvokeCompletion[T] | None = None
+	"""Only set on the last chunk: the complete response, exactly what ainvoke() would have returned."""
@@ -0,0 +1,4 @@
+from browser_use.pool.service import AgentPool, FairPriorityQueue
+from browser_use.pool.views import PoolStats, PoolTask, PoolTaskResult
+
+__all__ = ['AgentPool', 'FairPriorityQueue', 'PoolStats', 'PoolTask', 'PoolTaskResult']
@@ -0,0 +1,372 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
+from typing import Any
+
+from browser_use.agent.service import Agent
+from browser_use.agent.views import AgentHistoryList
+from browser_use.browser import BrowserProfile, BrowserSession
+from browser_use.browser.types import Browser
+from browser_use.llm.base import BaseChatModel
+from browser_use.pool.views import PoolStats, PoolTask, PoolTaskResult, PoolTaskStatus
+
+logger = logging.getLogger(__name__)
+
+AgentFactory = Callable[[PoolTask, BrowserSession | None], Agent]
+
+
+class FairPriorityQueue:
+	"""
+	Queue of PoolTasks that is strict about priority and fair between tenants:
+	the lowest priority value always goes first, tenants waiting at that priority take turns (the tenant served
+	least recently goes next), and each tenant's own tasks come out in submission order.
+	"""
+
+	def __init__(self):
+		self._queues: dict[str, list[tuple[int, int, PoolTask]]] = {}  # tenant -> heap of (priority, seq, task)
+		self._seq = itertools.count()
+		self._turn = itertools.count()
+		self._last_served: dict[str, int] = {}
+
+	def __len__(self) -> int:
+		return sum(len(queue) for queue in self._queues.values())
+
+	def push(self, task: PoolTask) -> None:
+		heapq.heappush(self._queues.setdefault(task.tenant, []), (task.priority, next(self._seq), task))
+
+	def pop(self) -> PoolTask:
+		if not self._queues:
+			raise IndexError('pop from an empty FairPriorityQueue')
+
+		def _rank(tenant: str) -> tuple[int, int, int]:
+			priority, seq, _ = self._queues[tenant][0]
+			return priority, self._last_served.get(tenant, -1), seq
+
+		tenant = min(self._queues, key=_rank)
+		_, _, task = heapq.heappop(self._queues[tenant])
+		if not self._queues[tenant]:
+			del self._queues[tenant]
+		self._last_served[tenant] = next(self._turn)
+		return task
+
+
+class AgentPool:
+	"""
+	Runs a stream of tasks with a bounded number of concurrent Agents.
+
+	Each agent slot launches its own browser once and gives every task a fresh incognito browser context in it, closed
+	when the task is done, so the browser launch cost is paid once per slot instead of once per task while cookies,
+	storage, cache and service workers never carry over from one task (or tenant) to the next. Slots never use a
+	persistent user_data_dir, concurrent browsers on the same profile directory would corrupt it. Tasks are scheduled by priority with round-robin fairness between tenants (see FairPriorityQueue)
+	and can carry a deadline that covers both their queue wait and their run time.
+
+	Usage:
+		async with AgentPool(llm=llm, max_concurrent_agents=4) as pool:
+			async for result in pool.map(['task 1', PoolTask(task='task 2', priority=-1, timeout=300)]):
+				print(result.status, result.queue_wait_seconds, result.cost)
+			print(pool.stats)
+	"""
+
+	def __init__(
+		self,
+		llm: BaseChatModel | None = None,
+		max_concurrent_agents: int = 4,
+		browser_profile: BrowserProfile | None = None,
+		reuse_browser_sessions: bool = True,
+		agent_factory: AgentFactory | None = None,
+		stop_grace_period: float = 30.0,
+		**agent_kwargs: Any,
+	):
+		assert max_concurrent_agents >= 1, 'max_concurrent_agents must be at least 1'
+		assert llm is not None or agent_factory is not None, 'AgentPool needs either an llm or an agent_factory'
+
+		self.llm = llm
+		self.max_concurrent_agents = max_concurrent_agents
+		browser_profile = browser_profile or BrowserProfile()
+		if browser_profile.user_data_dir and 'user_data_dir' in browser_profile.model_fields_set:
+			logger.warning(
+				f'⚠️ AgentPool ignores user_data_dir={browser_profile.user_data_dir}, every agent gets a temporary profile '
+				'(pass storage_state=... to start the agents logged in)'
+			)
+		self.browser_profile = browser_profile.model_copy(update={'user_data_dir': None})
+		self.reuse_browser_sessions = reuse_browser_sessions
+		self.agent_factory = agent_factory or self._default_agent_factory
+		self.stop_grace_period = stop_grace_period  # how long a task past its deadline gets to stop cleanly before it's cancelled
+		self.agent_kwargs = {'calculate_cost': True, **agent_kwargs}  # per-task cost needs the token cost service
+
+		self._queue = FairPriorityQueue()
+		self._queued_ids: set[str] = set()
+		self._futures: dict[str, asyncio.Future[PoolTaskResult]] = {}
+		self._running: dict[str, Agent] = {}
+		self._results: list[PoolTaskResult] = []
+		self._wakeup = asyncio.Event()  # set whenever a task is queued or the pool starts closing
+		self._workers: list[asyncio.Task] = []
+		self._closing = False
+		self._started_at: float | None = None
+
+	async def __aenter__(self) -> 'AgentPool':
+		return self
+
+	async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+		await self.close(cancel_pending=exc_type is not None)
+
+	# --- Submitting tasks ---
+
+	def submit(self, task: str | PoolTask, **task_fields: Any) -> asyncio.Future[PoolTaskResult]:
+		"""Queue a task, returns a future that resolves to its PoolTaskResult (it never raises for task failures)"""
+		if self._closing:
+			raise RuntimeError('Cannot submit tasks to an AgentPool that is closing')
+		if isinstance(task, str):
+			task = PoolTask(task=task, **task_fields)
+		assert task.id not in self._futures, f'Task {task.id} was already submitted'
+
+		loop = asyncio.get_running_loop()
+		self._ensure_workers_started()
+
+		future: asyncio.Future[PoolTaskResult] = loop.create_future()
+		self._futures[task.id] = future
+		self._queued_ids.add(task.id)
+		self._queue.push(task)
+		if task.deadline is not None:
+			# expire the task on time even if no slot frees up before its deadline, the worker skips it later
+			loop.call_later(max(task.deadline - time.time(), 0), self._expire_if_queued, task)
+		self._wakeup.set()
+		return future
+
+	async def map(self, tasks: Iterable[str | PoolTask] | AsyncIterable[str | PoolTask]) -> AsyncIterator[PoolTaskResult]:
+		"""Submit every task from a (possibly async, possibly endless) stream, yielding results in completion order"""
+		results: asyncio.Queue[PoolTaskResult] = asyncio.Queue()
+		submitted = 0
+
+		def _submit(task: str | PoolTask) -> None:
+			nonlocal submitted
+			self.submit(task).add_done_callback(lambda future: future.cancelled() or results.put_nowait(future.result()))
+			submitted += 1
+
+		async def _feed() -> None:
+			if isinstance(tasks, AsyncIterable):
+				async for task in tasks:
+					_submit(task)
+			else:
+				for task in tasks:
+					_submit(task)
+
+		feeder = asyncio.create_task(_feed())
+		yielded = 0
+		try:
+			while not (feeder.done() and yielded == submitted):
+				next_result = asyncio.create_task(results.get())
+				await asyncio.wait({next_result, feeder}, return_when=asyncio.FIRST_COMPLETED)
+				if not next_result.done():
+					next_result.cancel()
+					feeder.result()  # re-raise errors from the task stream
+					continue
+				yielded += 1
+				yield next_result.result()
+		finally:
+			feeder.cancel()
+
+	async def join(self) -> None:
+		"""Wait until every submitted task has finished"""
+		while pending := [future for future in self._futures.values() if not future.done()]:
+			await asyncio.wait(pending)
+
+	async def close(self, cancel_pending: bool = False) -> None:
+		"""
+		Finish the submitted tasks (or with cancel_pending=True, drop the queued ones and stop the running agents),
+		then shut down the pool's browsers.
+		"""
+		self._closing = True
+		if cancel_pending:
+			while self._queue:
+				task = self._queue.pop()
+				if task.id in self._queued_ids:
+					self._queued_ids.discard(task.id)
+					self._finish(task, 'cancelled', error='AgentPool was closed before the task started')
+			for agent in self._running.values():
+				agent.stop()
+		self._wakeup.set()
+		await asyncio.gather(*self._workers, return_exceptions=True)
+		self._workers.clear()
+
+	# --- Metrics ---
+
+	@property
+	def stats(self) -> PoolStats:
+		now = time.time()
+		elapsed = now - self._started_at if self._started_at else 0.0
+		waits = sorted(result.queue_wait_seconds for result in self._results)
+		by_status: dict[str, int] = {}
+		for result in self._results:
+			by_status[result.status] = by_status.get(result.status, 0) + 1
+		total_cost = sum(result.cost for result in self._results)
+		ran = [result for result in self._results if result.started_at is not None]
+
+		def _percentile(p: float) -> float:
+			return waits[min(int(p * len(waits)), len(waits) - 1)] if waits else 0.0
+
+		return PoolStats(
+			queued=len(self._queued_ids),
+			running=len(self._running),
+			finished=len(self._results),
+			by_status=by_status,
+			elapsed_seconds=elapsed,
+			throughput_per_minute=len(self._results) / elapsed * 60 if elapsed else 0.0,
+			queue_wait_p50_seconds=_percentile(0.50),
+			queue_wait_p95_seconds=_percentile(0.95),
+			queue_wait_max_seconds=waits[-1] if waits else 0.0,
+			total_cost=total_cost,
+			cost_per_task=total_cost / len(ran) if ran else 0.0,
+			total_tokens=sum(result.usage.total_tokens for result in self._results if result.usage),
+		)
+
+	@property
+	def results(self) -> list[PoolTaskResult]:
+		"""Results of all finished tasks, in completion order"""
+		return list(self._results)
+
+	# --- Workers ---
+
+	def _ensure_workers_started(self) -> None:
+		if self._workers:
+			return
+		self._started_at = self._started_at or time.time()
+		self._workers = [
+			asyncio.create_task(self._worker(slot), name=f'AgentPool.worker-{slot}') for slot in range(self.max_concurrent_agents)
+		]
+
+	async def _next_task(self) -> PoolTask | None:
+		"""Wait for the next task that is still queued, None once the pool is closing and the queue is drained"""
+		while True:
+			while self._queue:
+				task = self._queue.pop()
+				if task.id in self._queued_ids:  # skip tasks that expired or were cancelled while queued
+					self._queued_ids.discard(task.id)
+					return task
+			if self._closing:
+				return None
+			self._wakeup.clear()
+			await self._wakeup.wait()
+
+	async def _worker(self, slot: int) -> None:
+		slot_browser: Browser | None = None
+		try:
+			while (task := await self._next_task()) is not None:
+				browser_session: BrowserSession | None = None
+				if self.reuse_browser_sessions:
+					try:
+						if slot_browser is None or not slot_browser.is_connected():
+							slot_browser = await self._launch_slot_browser()
+						# a new BrowserSession on the slot's browser opens its own incognito context on start()
+						browser_session = BrowserSession(
+							browser_profile=self.browser_profile, browser=slot_browser, keep_alive=True
+						)
+					except Exception as e:
+						self._finish(
+							task, 'failed', error=f'Failed to launch browser: {type(e).__name__}: {e}', started_at=time.time()
+						)
+						continue
+				try:
+					await self._run_task(task, browser_session)
+				finally:
+					if browser_session is not None:
+						await self._close_task_browser_context(browser_session)
+		finally:
+			if slot_browser is not None:
+				try:
+					await slot_browser.close()
+				except Exception as e:
+					logger.debug(f'Failed to close pooled browser: {type(e).__name__}: {e}')
+
+	async def _run_task(self, task: PoolTask, browser_session: BrowserSession | None) -> None:
+		started_at = time.time()
+		try:
+			agent = self.agent_factory(task, browser_session)
+		except Exception as e:
+			self._finish(task, 'failed', error=f'Failed to create agent: {type(e).__name__}: {e}', started_at=started_at)
+			return
+
+		self._running[task.id] = agent
+		run = asyncio.create_task(agent.run(max_steps=task.max_steps))
+		timed_out = False
+		try:
+			remaining = None if task.deadline is None else max(task.deadline - started_at, 0)
+			done, _ = await asyncio.wait({run}, timeout=remaining)
+			if not done:
+				# past the deadline: ask the agent to stop after its current step, then cancel it if it doesn't
+				timed_out = True
+				agent.stop()
+				done, _ = await asyncio.wait({run}, timeout=self.stop_grace_period)
+				if not done:
+					run.cancel()
+					await asyncio.gather(run, return_exceptions=True)
+		finally:
+			del self._running[task.id]
+
+		history = agent.state.history
+		if timed_out:
+			self._finish(task, 'timed_out', history, f'Task did not finish within {task.timeout}s', started_at)
+		elif run.exception() is not None:
+			error = run.exception()
+			self._finish(task, 'failed', history, f'{type(error).__name__}: {error}', started_at)
+		elif agent.state.stopped:
+			self._finish(task, 'cancelled', history, 'Agent was stopped', started_at)
+		elif history.is_successful():
+			self._finish(task, 'succeeded', history, started_at=started_at)
+		else:
+			errors = [error for error in history.errors() if error]
+			self._finish(task, 'failed', history, errors[-1] if errors else None, started_at)
+
+	def _default_agent_factory(self, task: PoolTask, browser_session: BrowserSession | None) -> Agent:
+		assert self.llm is not None, 'AgentPool needs an llm to create agents'
+		return Agent(
+			task=task.task,
+			llm=self.llm,
+			browser_session=browser_session,
+			browser_profile=self.browser_profile,
+			**{**self.agent_kwargs, **task.agent_kwargs},
+		)
+
+	async def _launch_slot_browser(self) -> Browser:
+		"""Launch a browser without a persistent profile for one slot, its tasks each get their own context in it"""
+		launcher = BrowserSession(browser_profile=self.browser_profile)
+		await launcher.setup_playwright()
+		assert launcher.playwright is not None
+		return await launcher.playwright.chromium.launch(**launcher.browser_profile.kwargs_for_launch().model_dump(mode='json'))
+
+	async def _close_task_browser_context(self, browser_session: BrowserSession) -> None:
+		"""Close the task's incognito context (cookies, storage, cache and service workers go with it), not the slot's browser"""
+		browser_session.browser = None
+		browser_session.browser_pid = None
+		try:
+			await browser_session.kill()
+		except Exception as e:
+			logger.warning(f'⚠️ Failed to close pooled browser context: {type(e).__name__}: {e}')
+
+	def _expire_if_queued(self, task: PoolTask) -> None:
+		if task.id in self._queued_ids:
+			self._queued_ids.discard(task.id)
+			self._finish(task, 'expired', error=f'Task did not start within its {task.timeout}s deadline')
+
+	def _finish(
+		self,
+		task: PoolTask,
+		status: PoolTaskStatus,
+		history: AgentHistoryList | None = None,
+		error: str | None = None,
+		started_at: float | None = None,
+	) -> None:
+		result = PoolTaskResult(
+			task=task, status=status, history=history, error=error, started_at=started_at, finished_at=time.time()
+		)
+		self._results.append(result)
+		future = self._futures.pop(task.id, None)
+		if future is not None and not future.done():
+			future.set_result(result)
+		logger.info(
+			f'🏁 Pool task {task.id[-4:]} {status} (tenant={task.tenant} priority={task.priority}) '
+			f'waited {result.queue_wait_seconds:.1f}s, ran {result.run_seconds:.1f}s, cost ${result.cost:.4f}'
+		)
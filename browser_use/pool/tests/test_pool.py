@@ -0,0 +1,132 @@
+"""
+Tests for AgentPool scheduling, deadlines and metrics, using stand-in agents so no browser or LLM is needed.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from playwright.async_api import Browser as PlaywrightBrowser
+
+from browser_use.agent.views import ActionResult, AgentHistory, AgentHistoryList
+from browser_use.browser.views import BrowserStateHistory
+from browser_use.pool import AgentPool, FairPriorityQueue, PoolTask
+
+
+class FakeAgent:
+	def __init__(self, task: PoolTask, log: list[str], duration: float):
+		self.task = task
+		self.log = log
+		self.duration = duration
+		self.state = SimpleNamespace(stopped=False, history=AgentHistoryList(history=[], usage=None))
+
+	async def run(self, max_steps: int = 100) -> AgentHistoryList:
+		self.log.append(self.task.task)
+		while self.duration > 0 and not self.state.stopped:
+			await asyncio.sleep(0.01)
+			self.duration -= 0.01
+		if not self.state.stopped:
+			self.state.history.history.append(
+				AgentHistory(
+					model_output=None,
+					result=[ActionResult(is_done=True, success=True, extracted_content='ok')],
+					state=BrowserStateHistory(url='', title='', tabs=[], interacted_element=[]),
+				)
+			)
+		return self.state.history
+
+	def stop(self) -> None:
+		self.state.stopped = True
+
+
+def test_queue_orders_by_priority_then_round_robin_between_tenants():
+	queue = FairPriorityQueue()
+	for task in [
+		PoolTask(task='a1', tenant='a'),
+		PoolTask(task='a2', tenant='a'),
+		PoolTask(task='a3', tenant='a'),
+		PoolTask(task='b1', tenant='b'),
+		PoolTask(task='b2', tenant='b'),
+		PoolTask(task='urgent', tenant='c', priority=-1),
+	]:
+		queue.push(task)
+
+	assert [queue.pop().task for _ in range(len(queue))] == ['urgent', 'a1', 'b1', 'a2', 'b2', 'a3']
+
+
+async def test_pool_runs_tasks_concurrently_with_deadlines_and_metrics():
+	started: list[str] = []
+	durations = {'slow': 5.0}
+
+	pool = AgentPool(
+		max_concurrent_agents=2,
+		reuse_browser_sessions=False,
+		stop_grace_period=1.0,
+		agent_factory=lambda task, browser_session: FakeAgent(task, started, durations.get(task.task, 0.05)),
+	)
+	async with pool:
+		slow = pool.submit('slow', timeout=0.2)
+		results = [result async for result in pool.map(['t1', 't2', 't3', PoolTask(task='never', timeout=0)])]
+
+	statuses = {result.task.task: result.status for result in results}
+	assert statuses == {'t1': 'succeeded', 't2': 'succeeded', 't3': 'succeeded', 'never': 'expired'}
+	assert (await slow).status == 'timed_out'
+	assert 'never' not in started
+
+	stats = pool.stats
+	assert stats.finished == 5 and stats.queued == 0 and stats.running == 0
+	assert stats.by_status == {'succeeded': 3, 'timed_out': 1, 'expired': 1}
+	assert stats.throughput_per_minute > 0
+	assert stats.queue_wait_max_seconds >= stats.queue_wait_p50_seconds >= 0
+
+
+class FakeBrowserContext:
+	def __init__(self):
+		self.closed = False
+
+	async def close(self):
+		self.closed = True
+
+
+class FakeBrowser(PlaywrightBrowser):
+	def __init__(self):  # no playwright connection behind it
+		self.closed = False
+
+	def is_connected(self) -> bool:
+		return not self.closed
+
+	async def close(self):
+		self.closed = True
+
+
+async def test_slots_get_their_own_browser_and_every_task_a_fresh_context(monkeypatch):
+	from browser_use.browser import BrowserProfile
+
+	launched: list[FakeBrowser] = []
+
+	async def launch_slot_browser(self):
+		launched.append(FakeBrowser())
+		return launched[-1]
+
+	monkeypatch.setattr(AgentPool, '_launch_slot_browser', launch_slot_browser)
+	sessions = []
+
+	def agent_factory(task, browser_session):
+		# what BrowserSession.start() does with a browser passed to it: a new context for this session only
+		object.__setattr__(browser_session, 'browser_context', FakeBrowserContext())
+		sessions.append((browser_session, browser_session.browser_context))
+		return FakeAgent(task, [], duration=0.05)
+
+	# a persistent profile dir shared by the concurrent slots would get corrupted, it's replaced by temporary ones
+	pool = AgentPool(
+		max_concurrent_agents=2, browser_profile=BrowserProfile(user_data_dir='~/shared-profile'), agent_factory=agent_factory
+	)
+	assert pool.browser_profile.user_data_dir is None
+	async with pool:
+		results = [result async for result in pool.map(['t1', 't2', 't3', 't4'])]
+	assert {result.status for result in results} == {'succeeded'}
+
+	assert len(launched) == 2  # launched once per slot, not once per task
+	assert all(session.browser_profile.user_data_dir is None for session, _ in sessions)
+	assert len({id(session) for session, _ in sessions}) == 4
+	assert all(context.closed for _, context in sessions)  # nothing carries over to the next task
+	assert all(browser.closed for browser in launched)
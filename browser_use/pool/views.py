@@ -0,0 +1,85 @@
+import time
+from typing import Any, Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+from uuid_extensions import uuid7str
+
+from browser_use.agent.views import AgentHistoryList
+from browser_use.tokens.views import UsageSummary
+
+PoolTaskStatus = Literal['succeeded', 'failed', 'timed_out', 'expired', 'cancelled']
+
+
+class PoolTask(BaseModel):
+	"""A single task submitted to an AgentPool"""
+
+	model_config = ConfigDict(arbitrary_types_allowed=True)
+
+	task: str
+	priority: int = 0
+	"""Lower values run first, tasks with the same priority run in submission order (per tenant)"""
+	tenant: str = 'default'
+	"""Fairness group, tenants with queued tasks of the same priority take turns getting a free agent slot"""
+	timeout: float | None = None
+	"""Seconds from submission until the task's deadline, queue wait counts towards it. None = no deadline"""
+	max_steps: int = 100
+	agent_kwargs: dict[str, Any] = Field(default_factory=dict)
+	"""Extra Agent(...) kwargs for this task only, merged over the pool's agent_kwargs"""
+
+	id: str = Field(default_factory=uuid7str)
+	submitted_at: float = Field(default_factory=time.time)
+
+	@property
+	def deadline(self) -> float | None:
+		return None if self.timeout is None else self.submitted_at + self.timeout
+
+
+class PoolTaskResult(BaseModel):
+	"""Outcome of one PoolTask, with its timings and cost"""
+
+	model_config = ConfigDict(arbitrary_types_allowed=True)
+
+	task: PoolTask
+	status: PoolTaskStatus
+	history: AgentHistoryList | None = None
+	error: str | None = None
+
+	started_at: float | None = None
+	finished_at: float
+
+	@property
+	def queue_wait_seconds(self) -> float:
+		return (self.started_at or self.finished_at) - self.task.submitted_at
+
+	@property
+	def run_seconds(self) -> float:
+		return 0.0 if self.started_at is None else self.finished_at - self.started_at
+
+	@property
+	def usage(self) -> UsageSummary | None:
+		return self.history.usage if self.history else None
+
+	@property
+	def cost(self) -> float:
+		"""Total LLM cost of the task in USD (0 unless the agents run with calculate_cost=True)"""
+		return self.usage.total_cost if self.usage else 0.0
+
+
+class PoolStats(BaseModel):
+	"""Aggregate metrics of an AgentPool since it was started"""
+
+	queued: int
+	running: int
+	finished: int
+	by_status: dict[str, int]
+
+	elapsed_seconds: float
+	throughput_per_minute: float
+
+	queue_wait_p50_seconds: float
+	queue_wait_p95_seconds: float
+	queue_wait_max_seconds: float
+
+	total_cost: float
+	cost_per_task: float
+	total_tokens: int
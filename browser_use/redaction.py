@@ -0,0 +1,138 @@
+"""
+Sensitive data redaction, shared by the message manager (secret values -> <secret>key</secret> placeholders, before
+anything is sent to the LLM) and the action registry (placeholders -> secret values, before an action runs).
+
+A SensitiveDataRedactor is compiled once per sensitive_data dict, get_sensitive_data_redactor() hands out the cached one:
+	- redact(): one C-level str.replace pass per secret, longest first so a secret containing another one is redacted whole.
+	  CPython's re has no literal multi-pattern (Aho-Corasick) search: a regex alternation of the secrets is several times
+	  slower than the replace passes (see eval/benchmarks/sensitive_data_redaction.py).
+	- fill_placeholders(): one regex pass over the text, with the secrets that apply to the current url cached per url.
+"""
+
+from __future__ import annotations
+
+import copy
+import itertools
+import logging
+import re
+from typing import Any
+
+from browser_use.utils import match_url_with_domain_pattern
+
+logger = logging.getLogger(__name__)
+
+SECRET_PLACEHOLDER = re.compile(r'<secret>(.*?)</secret>')
+
+# one Private Use Area character per secret as a temporary marker, see SensitiveDataRedactor.redact(). Icon fonts (Font
+# Awesome, Material Icons, ...) put their glyphs in the PUA, so page text can contain them: the markers are picked among
+# the PUA characters that appear neither in the text nor in the secrets
+_PRIVATE_USE_AREA = re.compile('[\ue000-\uf8ff\U000f0000-\U000ffffd]')
+_PRIVATE_USE_RANGES = (range(0xE000, 0xF900), range(0xF0000, 0xFFFFE))
+
+SensitiveData = dict[str, str | dict[str, str]]
+
+
+class SensitiveDataRedactor:
+	"""
+	Compiled form of a sensitive_data dict, in either format:
+		old: {key: value}                     every secret applies to every domain
+		new: {domain_pattern: {key: value}}   secrets only apply on urls matching the domain pattern
+	"""
+
+	def __init__(self, sensitive_data: SensitiveData):
+		self.sensitive_data = copy.deepcopy(sensitive_data)  # snapshot to detect later changes to the caller's dict
+
+		# key -> value over all domains, placeholders are only ever filled in for the matching domains
+		self.values: dict[str, str] = {}
+		for key_or_domain, content in sensitive_data.items():
+			if isinstance(content, dict):
+				self.values.update({key: value for key, value in content.items() if value})
+			elif content:
+				self.values[key_or_domain] = content
+		if sensitive_data and not self.values:
+			logger.warning('No valid entries found in sensitive_data dictionary')
+
+		# longest first, so a secret containing another secret is redacted as a whole
+		self._replacements = sorted(
+			((value, f'<secret>{key}</secret>') for key, value in self.values.items()),
+			key=lambda item: len(item[0]),
+			reverse=True,
+		)
+		# a secret that is part of a placeholder (e.g. a password 'secret') would be replaced inside the placeholders
+		# inserted for the other secrets, those go through markers first (which widen the string, so only when needed)
+		self._use_markers = any(value in placeholder for value, _ in self._replacements for _, placeholder in self._replacements)
+		self._private_use_in_secrets = set(_PRIVATE_USE_AREA.findall(''.join(self.values.values())))
+		self._applicable_secrets: dict[str | None, dict[str, str]] = {}
+
+	def redact(self, text: str) -> str:
+		"""Replace every secret value in text with its <secret>key</secret> placeholder"""
+		if not self._use_markers:
+			for value, placeholder in self._replacements:
+				text = text.replace(value, placeholder)
+			return text
+
+		taken = self._private_use_in_secrets | set(_PRIVATE_USE_AREA.findall(text))
+		markers = (chr(code_point) for code_point in itertools.chain(*_PRIVATE_USE_RANGES) if chr(code_point) not in taken)
+		found: list[tuple[str, str]] = []
+		for value, placeholder in self._replacements:
+			marker = next(markers)
+			redacted = text.replace(value, marker)
+			if redacted is not text:  # str.replace() returns the same object if there was nothing to replace
+				text = redacted
+				found.append((marker, placeholder))
+		for marker, placeholder in found:
+			text = text.replace(marker, placeholder)
+		return text
+
+	def applicable_secrets(self, current_url: str | None) -> dict[str, str]:
+		"""The secrets that may be filled in on current_url: all old format ones + new format ones whose domain pattern matches"""
+		secrets = self._applicable_secrets.get(current_url)
+		if secrets is None:
+			secrets = {}
+			for domain_or_key, content in self.sensitive_data.items():
+				if isinstance(content, dict):
+					# it's a real url, check it using our custom allowed_domains scheme://*.example.com glob matching
+					if current_url and current_url != 'about:blank' and match_url_with_domain_pattern(current_url, domain_or_key):
+						secrets.update(content)
+				else:
+					# Old format: {key: value}, expose to all domains (only allowed for legacy reasons)
+					secrets[domain_or_key] = content
+			secrets = {key: value for key, value in secrets.items() if value}
+			if len(self._applicable_secrets) > 256:
+				self._applicable_secrets.clear()
+			self._applicable_secrets[current_url] = secrets
+		return secrets
+
+	def fill_placeholders(
+		self, text: str, current_url: str | None, used: set[str] | None = None, missing: set[str] | None = None
+	) -> str:
+		"""Replace <secret>key</secret> placeholders with the secret values for current_url, collecting used/missing keys"""
+		if '<secret>' not in text:
+			return text
+		secrets = self.applicable_secrets(current_url)
+
+		def _fill(match: re.Match[str]) -> str:
+			key = match.group(1)
+			if key in secrets:
+				if used is not None:
+					used.add(key)
+				return secrets[key]
+			if missing is not None:
+				missing.add(key)
+			return match.group(0)  # Don't replace the tag, keep it as is
+
+		return SECRET_PLACEHOLDER.sub(_fill, text)
+
+
+_REDACTORS: dict[int, SensitiveDataRedactor] = {}
+
+
+def get_sensitive_data_redactor(sensitive_data: SensitiveData | dict[str, Any]) -> SensitiveDataRedactor:
+	"""The compiled redactor for a sensitive_data dict, recompiled if the dict was changed since"""
+	redactor = _REDACTORS.get(id(sensitive_data))
+	if redactor is None or redactor.sensitive_data != sensitive_data:
+		redactor = SensitiveDataRedactor(sensitive_data)
+		if len(_REDACTORS) > 64:
+			_REDACTORS.clear()
+		_REDACTORS[id(sensitive_data)] = redactor
+	return redactor
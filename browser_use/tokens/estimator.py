@@ -0,0 +1,152 @@
+"""
+Local token estimation, so the size of a request is known before the provider bills it.
+
+A TokenEstimator counts text with the provider family's tokenizer when one is installed (tiktoken for OpenAI-style models),
+otherwise with a bytes-per-token ratio. Images are counted with the provider's published image token formula. The estimate
+is scaled by a correction factor learned from the billed prompt tokens (calibrate()), so the byte-ratio fallback converges to
+the provider's real counts after a few requests.
+
+MessageManager.get_messages() annotates each message with its estimate (BaseMessage.estimated_tokens), and TokenCost stores
+the estimate of a request next to its billed usage (TokenUsageEntry.estimated_prompt_tokens).
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import io
+import logging
+import math
+import struct
+from collections.abc import Callable
+from typing import Any
+
+from browser_use.llm.image_limits import PROVIDER_IMAGE_SIZE_LIMITS, resize_to_limit
+from browser_use.llm.messages import BaseMessage, ContentPartImageParam
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMAGE_SIZE = (1280, 1100)  # the default viewport, for images whose size can't be read
+IMAGE_HEADER_BASE64_CHARS = 64 * 1024  # decoded to read the size of a JPEG/WebP image, its header comes first
+
+
+def openai_image_tokens(width: int, height: int) -> int:
+	"""High detail: 85 base tokens + 170 per 512x512 tile, after scaling into 2048x2048 and the short side to 768"""
+	width, height = resize_to_limit(width, height, PROVIDER_IMAGE_SIZE_LIMITS['openai'])
+	return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
+
+
+def anthropic_image_tokens(width: int, height: int) -> int:
+	"""width * height / 750, after scaling to a 1568px long edge and ~1.15 megapixels"""
+	width, height = resize_to_limit(width, height, PROVIDER_IMAGE_SIZE_LIMITS['anthropic'])
+	return math.ceil(width * height / 750)
+
+
+def google_image_tokens(width: int, height: int) -> int:
+	"""258 tokens for images up to 384x384, otherwise 258 per 768x768 tile"""
+	if width <= 384 and height <= 384:
+		return 258
+	width, height = resize_to_limit(width, height, PROVIDER_IMAGE_SIZE_LIMITS['google'])
+	return 258 * math.ceil(width / 768) * math.ceil(height / 768)
+
+
+class TokenEstimator:
+	"""Estimates the prompt tokens of messages for one provider family"""
+
+	def __init__(
+		self,
+		bytes_per_token: float = 4.0,
+		image_tokens: Callable[[int, int], int] = openai_image_tokens,
+		tiktoken_encoding: str | None = None,
+		message_overhead: int = 4,
+	):
+		self.bytes_per_token = bytes_per_token  # fallback when no tokenizer is installed
+		self.image_tokens = image_tokens
+		self.message_overhead = message_overhead  # role + separators around each message
+		self.correction = 1.0  # billed / estimated prompt tokens, see calibrate()
+		self._encoding: Any = None
+		if tiktoken_encoding:
+			try:
+				import tiktoken
+
+				self._encoding = tiktoken.get_encoding(tiktoken_encoding)
+			except Exception as e:  # not installed, or the encoding can't be downloaded
+				logger.debug(f'Using the {bytes_per_token} bytes/token estimate, tiktoken unavailable: {type(e).__name__}: {e}')
+
+	def count_text(self, text: str) -> int:
+		if self._encoding is not None:
+			return len(self._encoding.encode(text, disallowed_special=()))
+		return math.ceil(len(text.encode('utf-8')) / self.bytes_per_token)
+
+	def count_message(self, message: BaseMessage) -> int:
+		"""Estimated tokens of one message (before correction), cached on the message"""
+		if message.estimated_tokens is not None:
+			return message.estimated_tokens
+
+		tokens = self.message_overhead
+		if isinstance(message.content, str):
+			tokens += self.count_text(message.content)
+		elif isinstance(message.content, list):
+			for part in message.content:
+				if isinstance(part, ContentPartImageParam):
+					tokens += self.image_tokens(*(_image_size(part.image_url.url) or DEFAULT_IMAGE_SIZE))
+				elif part.type == 'text':
+					tokens += self.count_text(part.text)
+				elif part.type == 'refusal':
+					tokens += self.count_text(part.refusal)
+		for tool_call in getattr(message, 'tool_calls', None) or []:
+			tokens += self.count_text(tool_call.function.name) + self.count_text(tool_call.function.arguments)
+
+		message.estimated_tokens = tokens
+		return tokens
+
+	def estimate(self, messages: list[BaseMessage]) -> int:
+		"""Estimated prompt tokens of a request with these messages, corrected by what the provider billed so far"""
+		return round(sum(self.count_message(message) for message in messages) * self.correction)
+
+	def calibrate(self, estimated_tokens: int, billed_tokens: int) -> None:
+		"""
+		Move the correction factor towards billed / estimated tokens of a request, estimated_tokens being the uncorrected
+		sum of the messages' estimated_tokens (as stored in TokenUsageEntry.estimated_prompt_tokens)
+		"""
+		if estimated_tokens <= 0 or billed_tokens <= 0:
+			return
+		ratio = billed_tokens / estimated_tokens
+		self.correction = min(max(0.7 * self.correction + 0.3 * ratio, 0.5), 2.0)
+
+
+# provider -> estimator factory, add entries to plug in estimators for other providers
+TOKEN_ESTIMATORS: dict[str, Callable[[], TokenEstimator]] = {
+	'openai': lambda: TokenEstimator(tiktoken_encoding='o200k_base'),
+	'azure': lambda: TokenEstimator(tiktoken_encoding='o200k_base'),
+	'openrouter': lambda: TokenEstimator(tiktoken_encoding='o200k_base'),
+	'anthropic': lambda: TokenEstimator(bytes_per_token=3.5, image_tokens=anthropic_image_tokens),
+	'anthropic_bedrock': lambda: TokenEstimator(bytes_per_token=3.5, image_tokens=anthropic_image_tokens),
+	'google': lambda: TokenEstimator(image_tokens=google_image_tokens),
+}
+
+
+def get_token_estimator(provider: str) -> TokenEstimator:
+	"""A new estimator for the provider's family (byte-ratio estimate with OpenAI image pricing for unknown providers)"""
+	factory = TOKEN_ESTIMATORS.get(provider)
+	return factory() if factory else TokenEstimator()
+
+
+def _image_size(url: str) -> tuple[int, int] | None:
+	"""
+	(width, height) of a base64 data URL image, read from its header without decoding the whole image
+	(from the PNG IHDR chunk, or with pillow for other formats)
+	"""
+	if not url.startswith('data:'):
+		return None
+	header, _, data = url.partition(',')
+	try:
+		if 'image/png' in header:
+			png_header = base64.b64decode(data[:32])  # signature + IHDR chunk header + width + height
+			return struct.unpack('>II', png_header[16:24])
+		from PIL import Image
+
+		with Image.open(io.BytesIO(base64.b64decode(data[:IMAGE_HEADER_BASE64_CHARS]))) as image:
+			return image.size
+	except (ImportError, binascii.Error, struct.error, OSError, ValueError):
+		return None
@@ -17,7 +17,9 @@ import httpx
 from dotenv import load_dotenv
 
 from browser_use.llm.base import BaseChatModel
-from browser_use.llm.views import ChatInvokeUsage
+from browser_use.llm.messages import BaseMessage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from browser_use.tokens.estimator import get_token_estimator
 from browser_use.tokens.views import (
 	CachedPricingData,
 	ModelPricing,
@@ -210,18 +212,55 @@ class TokenCost:
 			completion_cost=usage.completion_tokens * float(data.output_cost_per_token or 0),
 		)
 
-	def add_usage(self, model: str, usage: ChatInvokeUsage) -> TokenUsageEntry:
+	def add_usage(self, model: str, usage: ChatInvokeUsage, estimated_prompt_tokens: int | None = None) -> TokenUsageEntry:
 		"""Add token usage entry to history (without calculating cost)"""
 		entry = TokenUsageEntry(
 			model=model,
 			timestamp=datetime.now(),
 			usage=usage,
+			estimated_prompt_tokens=estimated_prompt_tokens,
 		)
 
 		self.usage_history.append(entry)
 
 		return entry
 
+	def _track_completion(self, llm: BaseChatModel, messages: list[BaseMessage], result: ChatInvokeCompletion) -> None:
+		"""Add the usage of a completed request to the history, with the local estimate of its prompt"""
+		# Track usage if available (no await needed since add_usage is now sync)
+		if not result.usage:
+			return
+		# the local estimate, if MessageManager.get_messages() annotated every message of the request
+		estimates = [message.estimated_tokens for message in messages]
+		estimated_prompt_tokens = sum(estimates) if None not in estimates else None  # type: ignore[arg-type]
+		usage = self.add_usage(llm.model, result.usage, estimated_prompt_tokens)
+
+		logger.debug(f'Token cost service: {usage}')
+
+		asyncio.create_task(self._log_usage(llm.model, usage))
+
+	def add_cancelled_usage(self, llm: BaseChatModel, messages: list[BaseMessage]) -> TokenUsageEntry:
+		"""Add a usage entry for a request cancelled before it returned its usage: the estimated prompt, no completion"""
+		prompt_tokens = get_token_estimator(llm.provider).estimate(messages)
+		usage = ChatInvokeUsage(
+			prompt_tokens=prompt_tokens,
+			prompt_cached_tokens=None,
+			prompt_cache_creation_tokens=None,
+			prompt_image_tokens=None,
+			completion_tokens=0,
+			total_tokens=prompt_tokens,
+		)
+		entry = TokenUsageEntry(
+			model=llm.model,
+			timestamp=datetime.now(),
+			usage=usage,
+			estimated_prompt_tokens=sum(message.estimated_tokens or 0 for message in messages),
+			cancelled=True,
+		)
+		self.usage_history.append(entry)
+		logger.debug(f'Token cost service: {entry}')
+		return entry
+
 	# async def _log_non_usage_llm(self, llm: BaseChatModel) -> None:
 	# 	"""Log non-usage to the logger"""
 	# 	C_CYAN = '\033[96m'
@@ -316,32 +355,51 @@ class TokenCost:
 
 		self.registered_llms[instance_id] = llm
 
-		# Store the original method
+		# wrappers that send requests to several models (e.g. ChatHedged) are tracked through each underlying model at its own price
+		if wrapped_llms := getattr(llm, 'llms', None):
+			for wrapped_llm in wrapped_llms:
+				self.register_llm(wrapped_llm)
+			return llm
+
+		# Store the original methods
 		original_ainvoke = llm.ainvoke
+		original_astream = getattr(llm, 'astream', None)
 		# Store reference to self for use in the closure
 		token_cost_service = self
 
 		# Create a wrapped version that tracks usage
 		async def tracked_ainvoke(messages, output_format=None):
 			# Call the original method
-			result = await original_ainvoke(messages, output_format)
-
-			# Track usage if available (no await needed since add_usage is now sync)
-			if result.usage:
-				usage = token_cost_service.add_usage(llm.model, result.usage)
-
-				logger.debug(f'Token cost service: {usage}')
-
-				asyncio.create_task(token_cost_service._log_usage(llm.model, usage))
-
-			# else:
-			# 	await token_cost_service._log_non_usage_llm(llm)
-
+			try:
+				result = await original_ainvoke(messages, output_format)
+			except asyncio.CancelledError:
+				# e.g. the losing request of ChatHedged, the provider still bills its prompt, so track the local estimate of it
+				token_cost_service.add_cancelled_usage(llm, messages)
+				raise
+
+			token_cost_service._track_completion(llm, messages, result)
 			return result
 
-		# Replace the method with our tracked version
+		# the usage of a streamed response comes with the completion on its last chunk
+		async def tracked_astream(messages, output_format=None):
+			completed = False
+			try:
+				async for chunk in original_astream(messages, output_format):
+					if chunk.completion is not None:
+						completed = True
+						token_cost_service._track_completion(llm, messages, chunk.completion)
+					yield chunk
+			except asyncio.CancelledError:
+				if not completed:
+					token_cost_service.add_cancelled_usage(llm, messages)
+				raise
+
+		# Replace the methods with our tracked versions
 		# Using setattr to avoid type checking issues with overloaded methods
 		setattr(llm, 'ainvoke', tracked_ainvoke)
+		# the default BaseChatModel.astream() goes through the tracked ainvoke() already
+		if original_astream and getattr(type(llm), 'astream', BaseChatModel.astream) is not BaseChatModel.astream:
+			setattr(llm, 'astream', tracked_astream)
 
 		return llm
 
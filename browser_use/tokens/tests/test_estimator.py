@@ -0,0 +1,214 @@
+"""
+Tests for local prompt token estimation and trimming requests to max_input_tokens.
+"""
+
+import asyncio
+import io
+
+from PIL import Image, ImageDraw
+
+from browser_use.agent.message_manager.service import MIN_ELEMENTS_TEXT_LENGTH, MessageManager
+from browser_use.agent.message_manager.views import HistoryItem, MessageManagerState
+from browser_use.agent.views import AgentHistory, AgentHistoryList
+from browser_use.browser.views import BrowserStateHistory, BrowserStateSummary, Screenshot, TabInfo
+from browser_use.dom.views import DOMElementNode, DOMTextNode
+from browser_use.filesystem.file_system import FileSystem
+from browser_use.llm.base import BaseChatModel
+from browser_use.llm.messages import ContentPartImageParam, ContentPartTextParam, ImageURL, SystemMessage, UserMessage
+from browser_use.llm.views import ChatInvokeCompletion, ChatInvokeUsage
+from browser_use.tokens.estimator import (
+	TokenEstimator,
+	_image_size,
+	anthropic_image_tokens,
+	get_token_estimator,
+	google_image_tokens,
+	openai_image_tokens,
+)
+from browser_use.tokens.service import TokenCost
+
+
+def _screenshot(width: int = 1280, height: int = 1100, offset: int = 0) -> Screenshot:
+	image = Image.new('RGB', (width, height), 'white')
+	ImageDraw.Draw(image).rectangle((offset + width // 4, height // 4, offset + width // 2, height // 2), fill='black')
+	buffer = io.BytesIO()
+	image.save(buffer, format='PNG')
+	return Screenshot(data=buffer.getvalue())
+
+
+def _browser_state(n_buttons: int, screenshot: Screenshot) -> BrowserStateSummary:
+	body = DOMElementNode(tag_name='body', xpath='/body', attributes={}, children=[], is_visible=True, parent=None)
+	selector_map = {}
+	for index in range(1, n_buttons + 1):
+		button = DOMElementNode(
+			tag_name='button',
+			xpath=f'/body/button[{index}]',
+			attributes={},
+			children=[],
+			is_visible=True,
+			is_interactive=True,
+			is_in_viewport=True,
+			highlight_index=index,
+			parent=body,
+		)
+		button.children.append(
+			DOMTextNode(text=f'Add product number {index} to the shopping cart', is_visible=True, parent=button)
+		)
+		body.children.append(button)
+		selector_map[index] = button
+	return BrowserStateSummary(
+		element_tree=body,
+		selector_map=selector_map,
+		url='https://shop.example.com',
+		title='Shop',
+		tabs=[TabInfo(page_id=1, url='https://shop.example.com', title='Shop')],
+		screenshot=screenshot,
+	)
+
+
+def _history_with_screenshots(screenshots: list[Screenshot]) -> AgentHistoryList:
+	return AgentHistoryList(
+		history=[
+			AgentHistory(
+				model_output=None,
+				result=[],
+				state=BrowserStateHistory(
+					url='https://shop.example.com', title='Shop', tabs=[], interacted_element=[], screenshot=s
+				),
+			)
+			for s in screenshots
+		]
+	)
+
+
+def test_estimates_count_text_and_images_and_are_cached_on_the_messages():
+	estimator = TokenEstimator()
+	assert estimator.count_text('a' * 400) == 100
+
+	screenshot = _screenshot()
+	assert _image_size(screenshot.data_url) == (1280, 1100)  # read from the PNG header
+	noisy = Image.effect_noise((2000, 1500), 64).convert('RGB')  # a JPEG much bigger than the header that is decoded
+	buffer = io.BytesIO()
+	noisy.save(buffer, format='JPEG', quality=95)
+	assert len(buffer.getvalue()) > 1_000_000
+	assert _image_size(Screenshot(data=buffer.getvalue(), media_type='image/jpeg').data_url) == (2000, 1500)
+	assert openai_image_tokens(1280, 1100) == 85 + 170 * 2 * 2  # scaled to 893x768
+	assert anthropic_image_tokens(1280, 1100) == 1533  # scaled to ~1.15 megapixels
+	assert google_image_tokens(300, 200) == 258
+
+	text_message = UserMessage(content='a' * 400)
+	image_message = UserMessage(
+		content=[
+			ContentPartTextParam(text='a' * 40),
+			ContentPartImageParam(image_url=ImageURL(url=screenshot.data_url, media_type='image/png')),
+		]
+	)
+	assert estimator.estimate([text_message, image_message]) == (4 + 100) + (4 + 10 + 765)
+	assert text_message.estimated_tokens == 104 and image_message.estimated_tokens == 779
+
+	# the correction factor learned from billed tokens scales the estimates
+	estimator.calibrate(estimated_tokens=1000, billed_tokens=1500)
+	assert estimator.correction == 0.7 + 0.3 * 1.5
+	assert estimator.estimate([text_message]) == round(104 * 1.15)
+	for _ in range(20):
+		estimator.calibrate(estimated_tokens=1000, billed_tokens=1500)
+	assert abs(estimator.correction - 1.5) < 0.01
+
+	assert get_token_estimator('anthropic').image_tokens is anthropic_image_tokens
+	assert get_token_estimator('some-new-provider').image_tokens is openai_image_tokens
+
+
+def test_token_cost_stores_the_estimate_next_to_the_billed_usage():
+	class FakeLLM:
+		model = 'fake-model'
+		provider = 'fake'
+
+		async def ainvoke(self, messages, output_format=None):
+			return ChatInvokeCompletion(
+				completion='ok',
+				usage=ChatInvokeUsage(
+					prompt_tokens=150,
+					prompt_cached_tokens=None,
+					prompt_cache_creation_tokens=None,
+					prompt_image_tokens=None,
+					completion_tokens=1,
+					total_tokens=151,
+				),
+			)
+
+	token_cost = TokenCost()
+	llm = token_cost.register_llm(FakeLLM())  # type: ignore[arg-type]
+	messages = [SystemMessage(content='a' * 400)]
+	TokenEstimator().estimate(messages)  # annotated like MessageManager.get_messages() does
+	asyncio.run(llm.ainvoke(messages))
+	asyncio.run(llm.ainvoke([*messages, UserMessage(content='not estimated')]))
+
+	assert token_cost.usage_history[0].estimated_prompt_tokens == 104
+	assert token_cost.usage_history[1].estimated_prompt_tokens is None
+
+	# the default astream() of providers without native streaming goes through the tracked ainvoke(), counted once
+	class FakeNonStreamingLLM(FakeLLM, BaseChatModel):
+		pass
+
+	token_cost = TokenCost()
+	llm = token_cost.register_llm(FakeNonStreamingLLM())  # type: ignore[arg-type]
+
+	async def stream():
+		return [chunk async for chunk in llm.astream(messages)]
+
+	chunks = asyncio.run(stream())
+	assert chunks[-1].completion is not None
+	assert [entry.usage.prompt_tokens for entry in token_cost.usage_history] == [150]
+
+
+def test_requests_over_max_input_tokens_are_trimmed_in_priority_order(tmp_path):
+	def message_manager(max_input_tokens: int | None) -> MessageManager:
+		message_manager = MessageManager(
+			task='add everything to the cart',
+			system_message=SystemMessage(content='system'),
+			file_system=FileSystem(tmp_path),
+			state=MessageManagerState(),
+			images_per_step=3,
+			max_input_tokens=max_input_tokens,
+		)
+		for step in range(1, 21):
+			message_manager.state.agent_history_items.append(
+				HistoryItem(step_number=step, evaluation_previous_goal='ok', memory=f'memory {step} ' * 20, next_goal='next')
+			)
+		message_manager.add_state_message(
+			_browser_state(n_buttons=600, screenshot=_screenshot()),
+			agent_history_list=_history_with_screenshots([_screenshot(offset=100), _screenshot(offset=200)]),
+		)
+		return message_manager
+
+	def images(messages) -> int:
+		return sum(isinstance(part, ContentPartImageParam) for part in messages[-1].content)
+
+	untrimmed = message_manager(max_input_tokens=None)
+	messages = untrimmed.get_messages()
+	total = untrimmed.token_estimator.estimate(messages)
+	assert images(messages) == 3
+
+	# dropping the previous screenshots is enough
+	budget = total - 1000
+	trimmed = message_manager(max_input_tokens=budget)
+	messages = trimmed.get_messages()
+	assert images(messages) == 1
+	assert 'memory 1 ' in messages[-1].text and 'shopping cart' in messages[-1].text
+	assert trimmed.token_estimator.estimate(messages) <= budget
+
+	# then the interactive elements are cut, then the history
+	budget = trimmed.token_estimator.estimate(messages) - 3000
+	trimmed = message_manager(max_input_tokens=budget)
+	messages = trimmed.get_messages()
+	prompt = trimmed._state_prompt[0]  # type: ignore[index]
+	assert images(messages) == 1
+	assert prompt.max_clickable_elements_length >= MIN_ELEMENTS_TEXT_LENGTH
+	assert 'previous steps omitted' not in messages[-1].text
+	assert trimmed.token_estimator.estimate(messages) <= budget
+
+	trimmed = message_manager(max_input_tokens=3000)
+	messages = trimmed.get_messages()
+	prompt = trimmed._state_prompt[0]  # type: ignore[index]
+	assert prompt.max_clickable_elements_length == MIN_ELEMENTS_TEXT_LENGTH
+	assert 'previous steps omitted' in messages[-1].text
+	assert trimmed.last_input_messages[-1] is trimmed.state.history.messages[-1]
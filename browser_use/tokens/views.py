@@ -14,6 +14,10 @@ class TokenUsageEntry(BaseModel):
 	model: str
 	timestamp: datetime
 	usage: ChatInvokeUsage
+	estimated_prompt_tokens: int | None = None
+	"""Local estimate of usage.prompt_tokens made before the request, if all its messages were annotated (see tokens.estimator)"""
+	cancelled: bool = False
+	"""The request was cancelled before it returned, usage.prompt_tokens is the local estimate and no completion is counted"""
 
 
 class TokenCostCalculated(BaseModel):
@@ -0,0 +1,202 @@
+"""
+Nested timing spans for agent steps, with exporters for chrome://tracing and OpenTelemetry JSON.
+
+Spans are only recorded inside a record_spans() root (the agent opens one per step and attaches it to
+StepMetadata.spans). Everywhere else trace_span() is a no-op, so instrumenting a function costs next to nothing
+when nobody is recording. The current span is tracked in a ContextVar, so spans opened in tasks spawned during a
+step (asyncio.gather, create_task) nest under the span that spawned them and show up as overlapping siblings.
+
+Usage:
+	with record_spans('step', step=1) as root:
+		with trace_span('llm_call', model='gpt-4o'):
+			...
+	save_trace([root], 'trace.json', format='chrome')   # open in chrome://tracing or https://ui.perfetto.dev
+	save_trace([root], 'trace.otel.json', format='otel')  # OTLP/JSON, e.g. for `otel-cli` or the collector's file receiver
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Literal
+
+from pydantic import BaseModel, Field
+
+TraceFormat = Literal['chrome', 'otel']
+
+
+class TimingSpan(BaseModel):
+	"""A named, timed section of work, with the sections that ran inside it"""
+
+	name: str
+	start_time: float
+	end_time: float | None = None
+	attributes: dict[str, Any] = Field(default_factory=dict)
+	children: list[TimingSpan] = Field(default_factory=list)
+
+	@property
+	def duration_seconds(self) -> float:
+		return (self.end_time or time.time()) - self.start_time
+
+	def walk(self, depth: int = 0) -> Iterator[tuple[TimingSpan, int]]:
+		"""Yield (span, depth) for this span and all its descendants, depth first"""
+		yield self, depth
+		for child in self.children:
+			yield from child.walk(depth + 1)
+
+	def summary(self) -> dict[str, float]:
+		"""Total seconds per span name among the descendants (nested spans of the same name counted once)"""
+		totals: dict[str, float] = {}
+
+		def _add(span: TimingSpan, open_names: frozenset[str]) -> None:
+			for child in span.children:
+				if child.name not in open_names:
+					totals[child.name] = totals.get(child.name, 0.0) + child.duration_seconds
+				_add(child, open_names | {child.name})
+
+		_add(self, frozenset())
+		return totals
+
+
+_current_span: ContextVar[TimingSpan | None] = ContextVar('browser_use_current_span', default=None)
+
+
+@contextmanager
+def record_spans(name: str, **attributes: Any) -> Iterator[TimingSpan]:
+	"""Start recording: opens a root span (nested under the current one, if any) that trace_span() calls attach to"""
+	span = TimingSpan(name=name, start_time=time.time(), attributes=attributes)
+	parent = _current_span.get()
+	if parent is not None:
+		parent.children.append(span)
+	token = _current_span.set(span)
+	try:
+		yield span
+	finally:
+		span.end_time = time.time()
+		_current_span.reset(token)
+
+
+@contextmanager
+def trace_span(name: str, **attributes: Any) -> Iterator[TimingSpan | None]:
+	"""Record a span under the current one, does nothing (and yields None) outside of record_spans()"""
+	parent = _current_span.get()
+	if parent is None:
+		yield None
+		return
+	span = TimingSpan(name=name, start_time=time.time(), attributes=attributes)
+	parent.children.append(span)
+	token = _current_span.set(span)
+	try:
+		yield span
+	finally:
+		span.end_time = time.time()
+		_current_span.reset(token)
+
+
+def detach_spans() -> None:
+	"""Stop attaching spans to the current recording in this context, e.g. before spawning long-lived background tasks"""
+	_current_span.set(None)
+
+
+# --- Exporters ---
+
+
+def to_chrome_trace(spans: Iterable[TimingSpan], process_name: str = 'browser-use') -> dict[str, Any]:
+	"""
+	Trace Event Format (chrome://tracing, Perfetto): one complete ("X") event per span.
+	Spans that overlap an earlier sibling (concurrent work) are moved to their own thread row so nesting stays valid.
+	"""
+	events: list[dict[str, Any]] = [{'name': 'process_name', 'ph': 'M', 'pid': 1, 'tid': 0, 'args': {'name': process_name}}]
+	next_tid = 1
+
+	def _add(span: TimingSpan, tid: int) -> None:
+		nonlocal next_tid
+		end_time = span.end_time or span.start_time
+		events.append(
+			{
+				'name': span.name,
+				'ph': 'X',
+				'ts': round(span.start_time * 1e6),
+				'dur': round((end_time - span.start_time) * 1e6),
+				'pid': 1,
+				'tid': tid,
+				'args': span.attributes,
+			}
+		)
+		lanes: list[tuple[int, float]] = []  # (tid, end_time of the last child on that row)
+		for child in sorted(span.children, key=lambda child: child.start_time):
+			for i, (lane_tid, lane_end) in enumerate(lanes):
+				if child.start_time >= lane_end:
+					lanes[i] = (lane_tid, child.end_time or child.start_time)
+					break
+			else:
+				lane_tid = tid if not lanes else next_tid
+				if lanes:
+					next_tid += 1
+				lanes.append((lane_tid, child.end_time or child.start_time))
+			_add(child, lane_tid)
+
+	for span in spans:
+		_add(span, 0)
+	return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def to_otel_json(spans: Iterable[TimingSpan], service_name: str = 'browser-use') -> dict[str, Any]:
+	"""OTLP/JSON (the body of an ExportTraceServiceRequest), each root span becomes its own trace"""
+	otel_spans: list[dict[str, Any]] = []
+
+	def _id(*parts: Any, length: int) -> str:
+		return hashlib.sha256('/'.join(map(str, parts)).encode()).hexdigest()[:length]
+
+	def _attribute(key: str, value: Any) -> dict[str, Any]:
+		if isinstance(value, bool):
+			return {'key': key, 'value': {'boolValue': value}}
+		if isinstance(value, int):
+			return {'key': key, 'value': {'intValue': str(value)}}
+		if isinstance(value, float):
+			return {'key': key, 'value': {'doubleValue': value}}
+		return {'key': key, 'value': {'stringValue': str(value)}}
+
+	def _add(span: TimingSpan, trace_id: str, parent_span_id: str | None, path: str) -> None:
+		span_id = _id(trace_id, path, length=16)
+		otel_spans.append(
+			{
+				'traceId': trace_id,
+				'spanId': span_id,
+				**({'parentSpanId': parent_span_id} if parent_span_id else {}),
+				'name': span.name,
+				'kind': 1,  # SPAN_KIND_INTERNAL
+				'startTimeUnixNano': str(round(span.start_time * 1e9)),
+				'endTimeUnixNano': str(round((span.end_time or span.start_time) * 1e9)),
+				'attributes': [_attribute(key, value) for key, value in span.attributes.items()],
+			}
+		)
+		for i, child in enumerate(span.children):
+			_add(child, trace_id, span_id, f'{path}/{i}')
+
+	for i, span in enumerate(spans):
+		_add(span, _id(os.getpid(), span.start_time, span.name, i, length=32), None, '0')
+
+	return {
+		'resourceSpans': [
+			{
+				'resource': {'attributes': [_attribute('service.name', service_name)]},
+				'scopeSpans': [{'scope': {'name': 'browser_use'}, 'spans': otel_spans}],
+			}
+		]
+	}
+
+
+def save_trace(spans: Iterable[TimingSpan], filepath: str | Path, format: TraceFormat = 'chrome') -> Path:
+	"""Write spans to a Chrome trace (format='chrome') or OpenTelemetry JSON (format='otel') file"""
+	data = to_chrome_trace(spans) if format == 'chrome' else to_otel_json(spans)
+	filepath = Path(filepath)
+	filepath.parent.mkdir(parents=True, exist_ok=True)
+	filepath.write_text(json.dumps(data), encoding='utf-8')
+	return filepath
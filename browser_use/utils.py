@@ -17,6 +17,8 @@ from urllib.parse import urlparse
 import portalocker
 from dotenv import load_dotenv
 
+from browser_use.tracing import trace_span
+
 try:
 	import psutil
 
@@ -337,7 +339,8 @@ def time_execution_sync(additional_text: str = '') -> Callable[[Callable[P, R]],
 		@wraps(func)
 		def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
 			start_time = time.time()
-			result = func(*args, **kwargs)
+			with trace_span(additional_text.strip('-') or func.__name__):
+				result = func(*args, **kwargs)
 			execution_time = time.time() - start_time
 			# Only log if execution takes more than 0.25 seconds
 			if execution_time > 0.25:
@@ -365,7 +368,8 @@ def time_execution_async(
 		@wraps(func)
 		async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
 			start_time = time.time()
-			result = await func(*args, **kwargs)
+			with trace_span(additional_text.strip('-') or func.__name__):
+				result = await func(*args, **kwargs)
 			execution_time = time.time() - start_time
 			# Only log if execution takes more than 0.25 seconds to avoid spamming the logs
 			# you can lower this threshold locally when you're doing dev work to performance optimize stuff
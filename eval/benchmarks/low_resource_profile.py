@@ -0,0 +1,89 @@
+"""
+Benchmark BrowserProfile(low_resource=True) against the default profile.
+
+For each profile it launches N concurrent headless sessions and reports:
+	- startup time: how long BrowserSession.start() takes
+	- RSS per session: memory of each browser process tree after the workload
+	- step latency: navigate + get_state_summary() (what one agent step costs the browser)
+
+Usage:
+	python eval/benchmarks/low_resource_profile.py
+	python eval/benchmarks/low_resource_profile.py --sessions 8 --steps 5 --url https://news.ycombinator.com
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from browser_use.browser import BrowserProfile, BrowserSession
+
+PROFILES = {
+	'default': lambda: BrowserProfile(headless=True, user_data_dir=None, keep_alive=False),
+	'low_resource': lambda: BrowserProfile(low_resource=True, user_data_dir=None, keep_alive=False),
+}
+
+
+async def run_session(profile: BrowserProfile, urls: list[str], steps: int) -> dict:
+	browser_session = BrowserSession(browser_profile=profile)
+
+	start_time = time.perf_counter()
+	await browser_session.start()
+	startup_seconds = time.perf_counter() - start_time
+
+	step_seconds = []
+	try:
+		for step in range(steps):
+			step_start = time.perf_counter()
+			await browser_session.navigate_to(urls[step % len(urls)])
+			await browser_session.get_state_summary(cache_clickable_elements_hashes=True)
+			step_seconds.append(time.perf_counter() - step_start)
+
+		rss_mb = browser_session._get_browser_memory_usage_mb()
+	finally:
+		await browser_session.kill()
+
+	return {'startup_seconds': startup_seconds, 'step_seconds': step_seconds, 'rss_mb': rss_mb}
+
+
+async def benchmark_profile(name: str, sessions: int, urls: list[str], steps: int) -> dict:
+	results = await asyncio.gather(*(run_session(PROFILES[name](), urls, steps) for _ in range(sessions)))
+
+	startup = [r['startup_seconds'] for r in results]
+	steps_all = [s for r in results for s in r['step_seconds']]
+	rss = [r['rss_mb'] for r in results if r['rss_mb'] is not None]
+	return {
+		'profile': name,
+		'startup_mean_s': statistics.mean(startup),
+		'startup_max_s': max(startup),
+		'step_p50_s': statistics.median(steps_all) if steps_all else float('nan'),
+		'step_max_s': max(steps_all) if steps_all else float('nan'),
+		'rss_mean_mb': statistics.mean(rss) if rss else float('nan'),
+		'rss_total_mb': sum(rss) if rss else float('nan'),
+	}
+
+
+async def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--sessions', type=int, default=4, help='number of concurrent browser sessions per profile')
+	parser.add_argument('--steps', type=int, default=3, help='navigate + get_state_summary() steps per session')
+	parser.add_argument('--url', action='append', dest='urls', help='url(s) to visit, can be passed multiple times')
+	parser.add_argument('--profiles', nargs='+', default=list(PROFILES), choices=list(PROFILES))
+	args = parser.parse_args()
+	urls = args.urls or ['https://example.com', 'https://en.wikipedia.org/wiki/Web_browser']
+
+	rows = []
+	for name in args.profiles:
+		print(f'⏱️ Benchmarking {name} profile with {args.sessions} sessions x {args.steps} steps...')
+		rows.append(await benchmark_profile(name, args.sessions, urls, args.steps))
+
+	columns = ['profile', 'startup_mean_s', 'startup_max_s', 'step_p50_s', 'step_max_s', 'rss_mean_mb', 'rss_total_mb']
+	print()
+	print(' | '.join(f'{c:>14}' for c in columns))
+	print('-' * (17 * len(columns)))
+	for row in rows:
+		print(' | '.join(f'{row[c]:>14.2f}' if isinstance(row[c], float) else f'{row[c]:>14}' for c in columns))
+
+
+if __name__ == '__main__':
+	asyncio.run(main())
@@ -0,0 +1,76 @@
+"""
+Benchmark the per-call cost of building the structured output schema for the real agent output model.
+
+Compares what every ainvoke(output_format=...) used to pay (SchemaOptimizer.create_optimized_json_schema, plus the
+provider post-processing) with the cached SchemaOptimizer.get_optimized_json_schema lookup.
+
+Usage:
+	python eval/benchmarks/schema_cache.py
+	python eval/benchmarks/schema_cache.py --iterations 500
+"""
+
+import argparse
+import statistics
+import time
+from collections.abc import Callable
+
+from browser_use.agent.views import AgentOutput
+from browser_use.controller.service import Controller
+from browser_use.llm.google.chat import ChatGoogle
+from browser_use.llm.schema import SchemaOptimizer
+
+
+def time_per_call_ms(func: Callable[[], object], iterations: int) -> tuple[float, float]:
+	timings = []
+	for _ in range(iterations):
+		start = time.perf_counter()
+		func()
+		timings.append((time.perf_counter() - start) * 1000)
+	return statistics.median(timings), max(timings)
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--iterations', type=int, default=100, help='calls to time per variant')
+	args = parser.parse_args()
+
+	action_model = Controller().registry.create_action_model()
+	output_format = AgentOutput.type_with_custom_actions(action_model)
+	fix_gemini_schema = ChatGoogle(model='gemini-2.0-flash')._fix_gemini_schema
+
+	def remove_title(schema: dict) -> dict:
+		return {key: value for key, value in schema.items() if key != 'title'}
+
+	variants: dict[str, tuple[Callable[[], object], Callable[[], object]]] = {
+		'openai': (
+			lambda: SchemaOptimizer.create_optimized_json_schema(output_format),
+			lambda: SchemaOptimizer.get_optimized_json_schema(output_format),
+		),
+		'anthropic': (
+			lambda: remove_title(SchemaOptimizer.create_optimized_json_schema(output_format)),
+			lambda: SchemaOptimizer.get_optimized_json_schema(output_format, provider='anthropic', post_process=remove_title),
+		),
+		'google': (
+			lambda: fix_gemini_schema(SchemaOptimizer.create_optimized_json_schema(output_format)),
+			lambda: SchemaOptimizer.get_optimized_json_schema(output_format, provider='google', post_process=fix_gemini_schema),
+		),
+		'groq': (
+			lambda: output_format.model_json_schema(),
+			lambda: SchemaOptimizer.get_json_schema(output_format),
+		),
+	}
+
+	schema_size = len(str(SchemaOptimizer.create_optimized_json_schema(output_format)))
+	print(f'AgentOutput with {len(Controller().registry.registry.actions)} actions, optimized schema ~{schema_size:,} chars')
+	print(f'{"provider":>10} | {"uncached p50 ms":>16} | {"uncached max ms":>16} | {"cached p50 ms":>14} | {"speedup":>8}')
+	print('-' * 76)
+	for provider, (uncached, cached) in variants.items():
+		uncached_p50, uncached_max = time_per_call_ms(uncached, args.iterations)
+		cached()  # first call builds the cache entry
+		cached_p50, _ = time_per_call_ms(cached, args.iterations)
+		speedup = uncached_p50 / cached_p50 if cached_p50 else float('inf')
+		print(f'{provider:>10} | {uncached_p50:>16.3f} | {uncached_max:>16.3f} | {cached_p50:>14.4f} | {speedup:>7.0f}x')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,101 @@
+"""
+Benchmark sensitive data redaction on a large state message.
+
+Compares what MessageManager._filter_sensitive_data used to do per message (rebuild the key -> value dict, one
+str.replace per secret), a single regex alternation over all secrets, and the compiled SensitiveDataRedactor.
+Also times filling placeholders into action params, the old per-action findall + replace vs fill_placeholders().
+
+Usage:
+	python eval/benchmarks/sensitive_data_redaction.py
+	python eval/benchmarks/sensitive_data_redaction.py --secrets 200 --chars 100000
+"""
+
+import argparse
+import random
+import re
+import statistics
+import string
+import time
+from collections.abc import Callable
+
+from browser_use.redaction import SensitiveDataRedactor
+
+
+def time_per_call_ms(func: Callable[[], object], iterations: int) -> float:
+	timings = []
+	for _ in range(iterations):
+		start = time.perf_counter()
+		func()
+		timings.append((time.perf_counter() - start) * 1000)
+	return statistics.median(timings)
+
+
+def previous_redact(sensitive_data: dict, text: str) -> str:
+	sensitive_values: dict[str, str] = {}
+	for key_or_domain, content in sensitive_data.items():
+		if isinstance(content, dict):
+			for key, val in content.items():
+				if val:
+					sensitive_values[key] = val
+		elif content:
+			sensitive_values[key_or_domain] = content
+	for key, val in sensitive_values.items():
+		text = text.replace(val, f'<secret>{key}</secret>')
+	return text
+
+
+def previous_fill(sensitive_data: dict, text: str) -> str:
+	applicable_secrets = {key: value for content in sensitive_data.values() for key, value in content.items() if value}
+	for placeholder in re.findall(r'<secret>(.*?)</secret>', text):
+		if placeholder in applicable_secrets:
+			text = text.replace(f'<secret>{placeholder}</secret>', applicable_secrets[placeholder])
+	return text
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument('--secrets', type=int, default=50, help='number of secrets')
+	parser.add_argument('--chars', type=int, default=40_000, help='size of the state message')
+	parser.add_argument('--iterations', type=int, default=200, help='calls to time per variant')
+	args = parser.parse_args()
+
+	rng = random.Random(0)
+	secrets = {
+		f'secret_{i}': ''.join(rng.choices(string.ascii_letters + string.digits, k=rng.randint(8, 32)))
+		for i in range(args.secrets)
+	}
+	sensitive_data = {'https://*.example.com': secrets}
+	words = [''.join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(5_000)]
+	text = ' '.join(rng.choices(words, k=args.chars // 3))[: args.chars]
+	for value in rng.sample(list(secrets.values()), k=min(5, len(secrets))):  # a few secrets show up on the page
+		position = rng.randrange(len(text))
+		text = f'{text[:position]} {value} {text[position:]}'
+
+	redactor = SensitiveDataRedactor(sensitive_data)
+	placeholders = {value: f'<secret>{key}</secret>' for key, value in secrets.items()}
+	alternation = re.compile('|'.join(re.escape(value) for value in sorted(secrets.values(), key=len, reverse=True)))
+	assert redactor.redact(text) == previous_redact(sensitive_data, text)
+
+	print(f'{args.secrets} secrets, state message of {len(text):,} chars')
+	print(f'{"redaction":>24} | {"p50 ms":>8}')
+	print('-' * 36)
+	for name, func in {
+		'previous (per message)': lambda: previous_redact(sensitive_data, text),
+		'regex alternation': lambda: alternation.sub(lambda match: placeholders[match.group(0)], text),
+		'SensitiveDataRedactor': lambda: redactor.redact(text),
+	}.items():
+		print(f'{name:>24} | {time_per_call_ms(func, args.iterations):>8.3f}')
+
+	params = f'Log in with <secret>secret_1</secret> and <secret>secret_2</secret>, then search for {words[0]}'
+	assert redactor.fill_placeholders(params, 'https://www.example.com/login') == previous_fill(sensitive_data, params)
+	print(f'\n{"fill placeholders":>24} | {"p50 ms":>8}')
+	print('-' * 36)
+	for name, func in {
+		'previous (per action)': lambda: previous_fill(sensitive_data, params),
+		'SensitiveDataRedactor': lambda: redactor.fill_placeholders(params, 'https://www.example.com/login'),
+	}.items():
+		print(f'{name:>24} | {time_per_call_ms(func, args.iterations * 10):>8.4f}')
+
+
+if __name__ == '__main__':
+	main()
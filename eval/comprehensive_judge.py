@@ -14,6 +14,7 @@ from typing import Any
 from PIL import Image
 from pydantic import BaseModel
 
+from browser_use.browser.views import Screenshot
 from browser_use.llm.base import BaseChatModel
 from browser_use.llm.messages import (
 	BaseMessage,
@@ -179,23 +180,11 @@ def prepare_agent_steps(complete_history: list[dict]) -> list[str]:
 	return last_part[::-1]
 
 
-def are_images_identical(img_path1: str, img_path2: str) -> bool:
-	"""Check if two images are identical by comparing their content."""
+def _are_near_duplicates(screenshot1: Screenshot, screenshot2: Screenshot) -> bool:
 	try:
-		with Image.open(img_path1) as img1, Image.open(img_path2) as img2:
-			# Convert to same format for comparison
-			if img1.mode != img2.mode:
-				img1 = img1.convert('RGB')
-				img2 = img2.convert('RGB')
-
-			# Compare sizes first (quick check)
-			if img1.size != img2.size:
-				return False
-
-			# Compare pixel data
-			return list(img1.getdata()) == list(img2.getdata())
+		return screenshot1.is_near_duplicate(screenshot2)
 	except Exception as e:
-		logger.warning(f'Failed to compare images {img_path1} and {img_path2}: {e}')
+		logger.warning(f'Failed to compare images {screenshot1.path} and {screenshot2.path}: {e}')
 		return False
 
 
@@ -203,7 +192,7 @@ def filter_images(screenshot_paths: list[str], max_images: int) -> list[str]:
 	"""
 	Filter screenshot paths to:
 	1. Never include the first image (always white)
-	2. Remove consecutive duplicate images
+	2. Collapse consecutive near-duplicate images (same look give or take rendering noise) into the most recent one
 	3. Return up to max_images from the end
 	"""
 	if not screenshot_paths:
@@ -215,16 +204,17 @@ def filter_images(screenshot_paths: list[str], max_images: int) -> list[str]:
 	if not filtered_paths:
 		return []
 
-	# Remove consecutive duplicates
-	deduplicated_paths = [filtered_paths[0]]  # Always include the first non-skipped image
-
-	for i in range(1, len(filtered_paths)):
-		current_path = filtered_paths[i]
-		previous_path = filtered_paths[i - 1]
-
-		# Only add if not identical to previous image
-		if not are_images_identical(current_path, previous_path):
-			deduplicated_paths.append(current_path)
+	# Each image is compared with the last one kept and replaces it if it's a near-duplicate,
+	# so the judge always sees the final state of the page
+	deduplicated_paths: list[str] = []
+	last_kept: Screenshot | None = None
+	for path in filtered_paths:
+		screenshot = Screenshot(path=path)
+		if last_kept is not None and _are_near_duplicates(screenshot, last_kept):
+			deduplicated_paths[-1] = path
+		else:
+			deduplicated_paths.append(path)
+		last_kept = screenshot
 
 	# Return last max_images images
 	return deduplicated_paths[-max_images:] if len(deduplicated_paths) > max_images else deduplicated_paths
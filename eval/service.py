@@ -4,7 +4,6 @@
 
 import argparse
 import asyncio
-import base64
 import http.client
 import json
 import logging
@@ -232,7 +231,7 @@ async def reformat_agent_history(
 			screenshot_path = trajectory_with_highlights_dir / f'step_{step_num}.png'
 			screenshot_paths.append(str(screenshot_path))
 			# Save the actual screenshot
-			screenshot_data = base64.b64decode(history_item.state.screenshot)
+			screenshot_data = history_item.state.screenshot.data
 			async with await anyio.open_file(screenshot_path, 'wb') as f:
 				await f.write(screenshot_data)
 
@@ -0,0 +1,39 @@
+"""
+Tests for the screenshot selection of the comprehensive judge.
+"""
+
+from PIL import Image, ImageDraw, ImageFont
+
+from eval.comprehensive_judge import filter_images
+
+
+def _save_form(path, filled: bool = False, error: bool = False, jpeg: bool = False) -> str:
+	font = ImageFont.load_default(size=16)
+	image = Image.new('RGB', (1280, 1100), 'white')
+	draw = ImageDraw.Draw(image)
+	for i, (label, value) in enumerate({'Name': 'John Doe', 'Email': 'john.doe@example', 'Phone': '555-0100'}.items()):
+		y = 120 + i * 80
+		draw.text((100, y), label, fill=(60, 60, 60), font=font)
+		draw.rectangle((100, y + 22, 500, y + 56), outline=(180, 180, 180))
+		if filled:
+			draw.text((108, y + 30), value, fill='black', font=font)
+	if error:
+		draw.text((100, 400), 'INVALID EMAIL', fill=(200, 0, 0), font=font)
+	image.save(path, format='JPEG' if jpeg else 'PNG', quality=90)
+	return str(path)
+
+
+def test_judge_sees_the_final_state_of_a_form_fill(tmp_path):
+	blank = tmp_path / '0_blank.png'
+	Image.new('RGB', (1280, 1100), 'white').save(blank)
+	paths = [
+		str(blank),
+		_save_form(tmp_path / '1_empty_form.png'),
+		_save_form(tmp_path / '2_empty_form_again.jpg', jpeg=True),  # nothing changed on the page
+		_save_form(tmp_path / '3_filled_form.png', filled=True),
+		_save_form(tmp_path / '4_invalid_email.png', filled=True, error=True),
+	]
+
+	assert filter_images(paths, max_images=10) == paths[2:]
+	assert filter_images(paths, max_images=2) == paths[3:]
+	assert filter_images(paths[:3], max_images=10) == [paths[2]]  # the most recent of a near-duplicate run is kept
@@ -860,7 +860,7 @@ class PerformanceOptimizer:
         self.screenshot_cache = {}
         self.last_screenshot_time = 0
         self.screenshot_interval = 0.2  # 200ms for smoother streaming (5 FPS)
-        self.last_screenshot_hash = None
+        self.last_screenshot = None  # browser_use Screenshot, compared by its fingerprint
         self.screenshot_quality = 70  # Lower quality for faster streaming
         
     def should_take_screenshot(self) -> bool:
@@ -920,14 +920,14 @@ class PerformanceOptimizer:
         try:
             from PIL import Image
             import io
-            import hashlib
+            from browser_use.browser.views import Screenshot
             
-            # Check if screenshot has changed using hash
-            current_hash = hashlib.md5(screenshot_bytes).hexdigest()
-            if current_hash == self.last_screenshot_hash:
+            # Check if screenshot has changed, ignoring frames that only differ by rendering/encoding noise
+            current_screenshot = Screenshot(data=screenshot_bytes)
+            if self.last_screenshot is not None and current_screenshot.is_near_duplicate(self.last_screenshot):
                 # Return None to indicate no change
                 return None
-            self.last_screenshot_hash = current_hash
+            self.last_screenshot = current_screenshot
             
             # Convert to PIL Image
             img = Image.open(io.BytesIO(screenshot_bytes))